@@ -0,0 +1,180 @@
+"""Test de charge de l'API JSON (src/api.py).
+
+Lance le serveur dans un sous-processus sur des données synthétiques, puis
+des clients HTTP (connexions keep-alive, un thread par client) enchaînent
+les requêtes de trois scénarios :
+    cold        : chaque requête est unique (filtres différents), donc calculée
+    warm        : un petit ensemble de requêtes répétées, servies par le cache de réponses
+    conditional : les mêmes avec If-None-Match, donc des 304 sans corps
+
+Usage : python benchmarks/api_load_test.py --games 2000 --clients 8 --requests 200
+"""
+import argparse
+import http.client
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from synthetic_data import OPPONENTS, generate  # noqa: E402
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+PLAYERS = ["Claquette", "Spectros", "Futeyy", "Tixty", "Dert"]
+GAME_TYPES = ["Global", "Scrim", "Tournoi"]
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(data_dir: str, port: int, cache_size: int) -> subprocess.Popen:
+    """Démarre l'API et attend qu'elle réponde (le premier appel charge les données)."""
+    server = subprocess.Popen(
+        [sys.executable, str(ROOT_DIR / "run.py"), "api", "--data", data_dir,
+         "--port", str(port), "--cache-size", str(cache_size)],
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+    )
+    deadline = time.monotonic() + 300
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"API server exited: {server.stderr.read().decode('utf-8', 'replace')}")
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=300)
+            conn.request("GET", "/api/health")
+            conn.getresponse().read()
+            conn.close()
+            return server
+        except OSError:
+            time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError("API server did not start in time")
+
+
+def all_paths() -> List[str]:
+    """Toutes les combinaisons endpoint x type de partie x adversaire (requêtes distinctes)."""
+    paths = []
+    for opponent in [None] + OPPONENTS:
+        for game_type in GAME_TYPES:
+            query = f"game_type={game_type}" + (f"&opponent={opponent.replace(' ', '%20')}" if opponent else "")
+            paths.append(f"/api/global?{query}")
+            for player_name in PLAYERS:
+                paths.append(f"/api/players/{player_name}?{query}")
+                paths.append(f"/api/players/{player_name}/champions?{query}")
+    return paths
+
+
+def client(port: int, paths: List[str], conditional: bool, etags: Dict[str, str],
+           latencies: List[float], statuses: Dict[int, int], lock: threading.Lock):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=300)
+    local_latencies = []
+    local_statuses: Dict[int, int] = {}
+    for path in paths:
+        headers = {"If-None-Match": etags[path]} if conditional and path in etags else {}
+        start = time.perf_counter()
+        conn.request("GET", path, headers=headers)
+        response = conn.getresponse()
+        response.read()
+        local_latencies.append(time.perf_counter() - start)
+        local_statuses[response.status] = local_statuses.get(response.status, 0) + 1
+        etag = response.getheader("ETag")
+        if etag:
+            etags[path] = etag
+    conn.close()
+    with lock:
+        latencies.extend(local_latencies)
+        for status, count in local_statuses.items():
+            statuses[status] = statuses.get(status, 0) + count
+
+
+def run_scenario(port: int, per_client: List[List[str]], conditional: bool = False,
+                 etags: Optional[Dict[str, str]] = None) -> Dict:
+    latencies: List[float] = []
+    statuses: Dict[int, int] = {}
+    lock = threading.Lock()
+    etags = etags if etags is not None else {}
+    threads = [
+        threading.Thread(target=client, args=(port, paths, conditional, etags, latencies, statuses, lock))
+        for paths in per_client
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'rps': len(latencies) / elapsed if elapsed else 0.0,
+        'p50_ms': percentile(latencies, 0.50) * 1000,
+        'p99_ms': percentile(latencies, 0.99) * 1000,
+        'statuses': {str(status): count for status, count in sorted(statuses.items())},
+    }
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def split(paths: List[str], clients: int, requests: int) -> List[List[str]]:
+    """Répartit `requests` requêtes par client en parcourant paths circulairement."""
+    return [
+        [paths[(c * requests + i) % len(paths)] for i in range(requests)]
+        for c in range(clients)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--games", type=int, default=2000)
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=200, help="Requêtes par client et par scénario")
+    parser.add_argument("--hot", type=int, default=20, help="Nombre de requêtes distinctes des scénarios warm/conditional")
+    parser.add_argument("--output", help="Fichier JSON des résultats")
+    args = parser.parse_args()
+
+    paths = all_paths()
+    hot = paths[:args.hot]
+    # cold : chaque requête distincte n'est envoyée qu'une fois (au plus len(paths) requêtes)
+    cold_total = min(len(paths), args.clients * args.requests)
+    cold = [paths[c:cold_total:args.clients] for c in range(args.clients)]
+    warm = split(hot, args.clients, args.requests)
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        data_dir = os.path.join(work_dir, "data")
+        generate(data_dir, args.games)
+        port = free_port()
+        server = start_server(data_dir, port, cache_size=max(256, len(paths)))
+        try:
+            results = {'cold': run_scenario(port, cold)}
+            etags: Dict[str, str] = {}
+            results['warm'] = run_scenario(port, warm, etags=etags)
+            results['conditional'] = run_scenario(port, warm, conditional=True, etags=etags)
+        finally:
+            server.terminate()
+            server.wait()
+
+    print(f"games: {args.games}  clients: {args.clients}")
+    print(f"{'scenario':<12}{'requests':>9}{'req/s':>10}{'p50 (ms)':>10}{'p99 (ms)':>10}  statuses")
+    for name, result in results.items():
+        print(f"{name:<12}{result['requests']:>9}{result['rps']:>10.1f}{result['p50_ms']:>10.2f}"
+              f"{result['p99_ms']:>10.2f}  {result['statuses']}")
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'games': args.games, 'clients': args.clients, 'results': results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
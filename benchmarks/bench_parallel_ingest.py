@@ -0,0 +1,55 @@
+"""Mesure le gain de l'ingestion parallèle selon le nombre de workers.
+
+Usage : python benchmarks/bench_parallel_ingest.py --games 3000 --workers 1 2 4 8
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from data_processing.stats_analyzer import StatsAnalyzer  # noqa: E402
+from synthetic_data import generate  # noqa: E402
+
+
+def load_time(data_dir: str, workers: int, executor: str, repeat: int) -> float:
+    """Meilleur temps de chargement complet depuis les JSON (snapshot désactivé)."""
+    best = float('inf')
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            start = time.perf_counter()
+            StatsAnalyzer(data_dir, cache_dir=cache_dir, use_snapshot=False,
+                          ingest_workers=workers, ingest_executor=executor)
+            best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    cpu_count = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--games", type=int, default=3000)
+    parser.add_argument("--repeat", type=int, default=2)
+    parser.add_argument("--workers", type=int, nargs="+",
+                        default=sorted({1, 2, 4, cpu_count}))
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        generate(data_dir, args.games)
+        serial = load_time(data_dir, 1, 'process', args.repeat)
+        print(f"games: {args.games}  cores: {cpu_count}")
+        print(f"{'executor':<9}{'workers':>8}{'time (ms)':>12}{'speedup':>9}")
+        print(f"{'serial':<9}{1:>8}{serial * 1000:>12.1f}{1:>9.2f}")
+        for executor in ('process', 'thread'):
+            for workers in args.workers:
+                if workers <= 1:
+                    continue
+                elapsed = load_time(data_dir, workers, executor, args.repeat)
+                print(f"{executor:<9}{workers:>8}{elapsed * 1000:>12.1f}{serial / elapsed:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Compare le démarrage de StatsAnalyzer depuis les JSON et depuis le snapshot Parquet.
+
+Usage : python benchmarks/bench_snapshot.py --games 3000
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from data_processing.stats_analyzer import StatsAnalyzer  # noqa: E402
+from synthetic_data import generate  # noqa: E402
+
+
+def timed(func, repeat: int) -> float:
+    """Meilleur temps sur `repeat` exécutions, en secondes."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--games", type=int, default=3000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as data_dir, tempfile.TemporaryDirectory() as cache_dir:
+        generate(data_dir, args.games)
+
+        json_time = timed(lambda: StatsAnalyzer(data_dir, cache_dir=cache_dir, use_snapshot=False), args.repeat)
+        # Premier démarrage : écrit le snapshot
+        StatsAnalyzer(data_dir, cache_dir=cache_dir)
+        snapshot_time = timed(lambda: StatsAnalyzer(data_dir, cache_dir=cache_dir), args.repeat)
+
+        # Snapshot + quelques fichiers plus récents que lui (relus en JSON, puis snapshot réécrit)
+        generate(data_dir, 10, seed=1, start_index=args.games)
+        start = time.perf_counter()
+        newer = StatsAnalyzer(data_dir, cache_dir=cache_dir)
+        refreshed_time = time.perf_counter() - start
+
+        print(f"games: {len(newer.matches)}")
+        print(f"json startup:     {json_time * 1000:9.1f} ms")
+        print(f"snapshot startup: {snapshot_time * 1000:9.1f} ms  (x{json_time / snapshot_time:.1f})")
+        print(f"snapshot + 10 new files: {refreshed_time * 1000:9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
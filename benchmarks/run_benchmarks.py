@@ -0,0 +1,231 @@
+"""Suite de benchmarks de StatsAnalyzer et des composants d'affichage.
+
+Pour chaque taille d'archive, mesure load_data (démarrage depuis les JSON),
+le démarrage depuis le snapshot, get_global_stats, get_player_stats, les
+séries de forme (construction, ajout d'une partie, get_player_trends), les
+stats par patch (get_patch_stats et comparaison de deux patchs) et la
+construction des DataFrames de display_player_stats, puis l'ingestion, le
+démarrage et les mêmes requêtes avec le stockage SQLite. Les résultats sont
+écrits en JSON ; --compare signale les régressions par rapport à un run
+précédent.
+
+Usage :
+    python benchmarks/run_benchmarks.py --sizes 100 1000 --output results.json
+    python benchmarks/run_benchmarks.py --sizes 100 1000 --compare results.json
+"""
+import argparse
+import datetime
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR / "src"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import pandas as pd  # noqa: E402
+
+from components import player_stats_display  # noqa: E402
+from data_processing.patches import compare_patches  # noqa: E402
+from data_processing.stats_analyzer import StatsAnalyzer  # noqa: E402
+from data_processing.trends import TrendEngine, player_game_rows  # noqa: E402
+from synthetic_data import generate  # noqa: E402
+
+DEFAULT_SIZES = [100, 1000, 10000, 100000]
+GAME_TYPES = ["Global", "Scrim", "Tournoi"]
+
+
+def measure(func: Callable, repeat: int) -> Dict[str, float]:
+    """Temps min/moyen/max sur `repeat` exécutions, en secondes."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return {
+        'min': min(timings),
+        'mean': sum(timings) / len(timings),
+        'max': max(timings),
+        'repeat': repeat,
+    }
+
+
+def dataset(work_dir: str, n_games: int) -> str:
+    """Dossier de n_games parties synthétiques, généré une seule fois par work_dir."""
+    data_dir = os.path.join(work_dir, f"games-{n_games}")
+    marker = os.path.join(data_dir, ".complete")
+    if not os.path.exists(marker):
+        generate(data_dir, n_games)
+        with open(marker, 'w') as f:
+            f.write(str(n_games))
+    return data_dir
+
+
+def build_display_frames(analyzer: StatsAnalyzer, player: str, game_type: str):
+    """Partie DataFrame de display_player_stats (graphe, tableau champions, première page d'historique)."""
+    stats = analyzer.get_player_stats(player, game_type)
+    if not stats['match_history']:
+        return
+    df = pd.DataFrame(stats['match_history'])
+    df['cs_per_min'] = df['Missions_CreepScore'] / (df['gameDuration'] / 60000)
+    champion_stats = analyzer.get_player_champions(player, game_type)
+    analyzer.get_player_trends(player, game_type)
+    player_stats_display.display_champion_graph(champion_stats)
+    player_stats_display.display_champion_stats(champion_stats)
+    history = player_stats_display.prepare_match_history(df)
+    player_stats_display.render_match_history(history.iloc[:player_stats_display.HISTORY_PAGE_SIZES[1]])
+
+
+def run_size(work_dir: str, n_games: int, repeat: int) -> List[Dict]:
+    data_dir = dataset(work_dir, n_games)
+    results = []
+
+    def record(name: str, timing: Dict[str, float]):
+        results.append({'benchmark': name, 'games': n_games, **timing})
+        print(f"{n_games:>8} {name:<28}{timing['min'] * 1000:>12.2f} ms")
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        record('load_data', measure(
+            lambda: StatsAnalyzer(data_dir, cache_dir=cache_dir, use_snapshot=False, result_cache_size=0),
+            repeat))
+        # Premier démarrage avec snapshot : l'écrit pour les suivants
+        StatsAnalyzer(data_dir, cache_dir=cache_dir)
+        record('snapshot_startup', measure(lambda: StatsAnalyzer(data_dir, cache_dir=cache_dir), repeat))
+
+        # Requêtes sans cache de résultats, pour mesurer le calcul lui-même
+        analyzer = StatsAnalyzer(data_dir, cache_dir=cache_dir, result_cache_size=0)
+        players = list(analyzer.players)
+        record('get_global_stats', measure(
+            lambda: [analyzer.get_global_stats(game_type) for game_type in GAME_TYPES], repeat))
+        record('get_player_stats', measure(
+            lambda: [analyzer.get_player_stats(player, game_type)
+                     for player in players for game_type in GAME_TYPES], repeat))
+        record('get_player_champions', measure(
+            lambda: [analyzer.get_player_champions(player, game_type)
+                     for player in players for game_type in GAME_TYPES], repeat))
+        record('get_patch_stats', measure(
+            lambda: [analyzer.get_patch_stats(by, None, game_type)
+                     for by in ("champion", "player") for game_type in GAME_TYPES], repeat))
+        # Changement de patchs comparés : sélection dans le tableau déjà calculé
+        patch_stats = analyzer.get_patch_stats()
+        patches = analyzer.get_filter_options()['patches']
+        record('compare_patches', measure(
+            lambda: [compare_patches(patch_stats, base, target) for base, target in zip(patches, patches[1:])],
+            repeat))
+        participants = analyzer.participants
+        record('build_trends', measure(lambda: TrendEngine(player_game_rows(participants)), repeat))
+        # Ajout d'une partie jouée après toutes les autres : mise à jour en O(1) des séries concernées
+        engine = TrendEngine(player_game_rows(participants))
+        latest = participants['game_date'].to_numpy().argmax()
+        next_day = (participants['game_date'].iloc[latest] + datetime.timedelta(days=1)).strftime('%d%m%Y')
+        latest_game = player_game_rows(participants[(participants['game_key'] == participants['game_key'].iloc[latest])
+                                                    .to_numpy()]).assign(date=next_day)
+        record('trends_append_game', measure(lambda: engine.extend(latest_game), repeat))
+        record('get_player_trends', measure(
+            lambda: [analyzer.get_player_trends(player, game_type)
+                     for player in players for game_type in GAME_TYPES], repeat))
+        record('display_player_frames', measure(
+            lambda: [build_display_frames(analyzer, player, "Global") for player in players], repeat))
+
+        cached = StatsAnalyzer(data_dir, cache_dir=cache_dir)
+        cached.get_global_stats()
+        record('get_global_stats_cached', measure(lambda: cached.get_global_stats(), repeat))
+
+        # Stockage SQLite : ingestion dans une base neuve, puis réouverture de la base remplie
+        store_paths = iter(os.path.join(cache_dir, f"ingest-{i}.sqlite") for i in range(repeat))
+        record('sqlite_ingest', measure(
+            lambda: StatsAnalyzer(data_dir, cache_dir=cache_dir, storage='sqlite', store_path=next(store_paths),
+                                  result_cache_size=0), repeat))
+        record('sqlite_startup', measure(
+            lambda: StatsAnalyzer(data_dir, cache_dir=cache_dir, storage='sqlite',
+                                  store_path=os.path.join(cache_dir, "ingest-0.sqlite"), result_cache_size=0),
+            repeat))
+        sql_analyzer = StatsAnalyzer(data_dir, cache_dir=cache_dir, storage='sqlite',
+                                     store_path=os.path.join(cache_dir, "ingest-0.sqlite"), result_cache_size=0)
+        record('sqlite_get_global_stats', measure(
+            lambda: [sql_analyzer.get_global_stats(game_type) for game_type in GAME_TYPES], repeat))
+        record('sqlite_get_player_stats', measure(
+            lambda: [sql_analyzer.get_player_stats(player, game_type)
+                     for player in players for game_type in GAME_TYPES], repeat))
+        record('sqlite_get_player_champions', measure(
+            lambda: [sql_analyzer.get_player_champions(player, game_type)
+                     for player in players for game_type in GAME_TYPES], repeat))
+        record('sqlite_get_patch_stats', measure(
+            lambda: [sql_analyzer.get_patch_stats(by, None, game_type)
+                     for by in ("champion", "player") for game_type in GAME_TYPES], repeat))
+    return results
+
+
+def environment() -> Dict[str, str]:
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=ROOT_DIR, capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = 'unknown'
+    return {
+        'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def compare(results: List[Dict], baseline_path: str, threshold: float) -> int:
+    """Affiche le ratio par rapport au run de référence ; retourne le nombre de régressions."""
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = {(r['benchmark'], r['games']): r for r in json.load(f)['results']}
+    regressions = 0
+    print(f"\n{'games':>8} {'benchmark':<28}{'baseline':>12}{'current':>12}{'ratio':>8}")
+    for result in results:
+        reference = baseline.get((result['benchmark'], result['games']))
+        if reference is None:
+            continue
+        ratio = result['min'] / reference['min'] if reference['min'] > 0 else float('inf')
+        flag = ''
+        if ratio > 1 + threshold:
+            regressions += 1
+            flag = '  REGRESSION'
+        print(f"{result['games']:>8} {result['benchmark']:<28}{reference['min'] * 1000:>10.2f}ms"
+              f"{result['min'] * 1000:>10.2f}ms{ratio:>8.2f}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--work-dir", help="Dossier où garder les jeux générés entre deux runs")
+    parser.add_argument("--output", help="Fichier JSON des résultats")
+    parser.add_argument("--compare", help="Fichier JSON d'un run précédent")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="Ralentissement relatif signalé comme régression (défaut 20 %%)")
+    args = parser.parse_args()
+
+    # Les composants Streamlit tournent ici sans serveur : couper leurs avertissements par appel
+    logging.disable(logging.WARNING)
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        work_dir = args.work_dir or tmp_dir
+        for n_games in args.sizes:
+            results.extend(run_size(work_dir, n_games, args.repeat))
+
+    report = {'environment': environment(), 'results': results}
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        sys.exit(1 if compare(results, args.compare, args.threshold) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""Génère des fichiers de parties synthétiques au format de data/ pour les benchmarks.
+
+Le schéma (tous les champs des participants) est copié d'une partie réelle de
+data/ ; chaque partie a deux équipes de cinq (nos joueurs et cinq adversaires,
+côtés opposés, une seule équipe gagnante). Les noms de fichiers couvrent les
+variantes lues par load_data : Scrim avec ou sans suffixe _MatchN, et Tournoi.
+
+Usage : python benchmarks/synthetic_data.py /tmp/synth --games 10000
+"""
+import argparse
+import copy
+import datetime
+import glob
+import json
+import os
+import random
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+TEMPLATE_GLOB = str(ROOT_DIR / "data" / "*.json")
+
+TOURNAMENTS = ["Synth Cup", "NT Etape 4", "Open Series"]
+OPPONENTS = ["Pishot", "PVB", "PCS Red", "Bulldog Academy", "Andromeda Gaming", "Ciel", "Hoshi", "HADE"]
+CHAMPIONS = ["Ambessa", "Shen", "Sion", "Ornn", "Nocturne", "Vi", "XinZhao", "Azir", "Orianna",
+             "Syndra", "Kaisa", "Ezreal", "Senna", "Jhin", "Rell", "Alistar", "Braum", "Rakan"]
+GAME_VERSIONS = ["15.10.680.4378", "15.11.684.1658", "15.11.685.5259", "15.12.690.1234"]
+# Comptes de l'équipe adverse : aucun ne contient un tag du roster
+RIVAL_PREFIX = "Rival"
+
+
+def load_template() -> dict:
+    """Première partie réelle de data/, utilisée comme modèle de schéma (241 champs par participant)."""
+    files = sorted(glob.glob(TEMPLATE_GLOB))
+    if not files:
+        raise FileNotFoundError(f"No match file found in {TEMPLATE_GLOB}")
+    with open(files[0], 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def make_game(template: dict, rng: random.Random) -> dict:
+    """Copie le modèle (nos cinq joueurs) et ajoute cinq adversaires, en tirant des valeurs
+    plausibles pour les champs lus par l'application."""
+    game = copy.deepcopy(template)
+    duration_ms = rng.randint(20, 45) * 60000 + rng.randint(0, 59999)
+    minutes = duration_ms / 60000
+    game['gameDuration'] = duration_ms
+    game['gameVersion'] = rng.choice(GAME_VERSIONS)
+    game['matchId'] = f"EUW1_{rng.randint(7000000000, 7999999999)}"
+    win = rng.random() < 0.55
+    team = rng.choice(['100', '200'])
+    rival_team = '200' if team == '100' else '100'
+
+    rivals = []
+    for position, participant in enumerate(game['participants'], start=1):
+        rival = copy.deepcopy(participant)
+        rival_name = f"{RIVAL_PREFIX} {participant.get('TEAM_POSITION') or position}"
+        for name_field in ('NAME', 'RIOT_ID_GAME_NAME'):
+            rival[name_field] = rival_name
+        for id_field in ('ID', 'PUUID', 'SUMMONER_ID'):
+            if id_field in rival:
+                rival[id_field] = f"{rival_team}-{position}"
+        rival['TEAM'] = rival_team
+        rival['WIN'] = 'Fail' if win else 'Win'
+        rivals.append(rival)
+
+        # Le jungler joue aussi sous son second tag
+        if participant['RIOT_ID_GAME_NAME'].endswith('Spectros'):
+            participant['RIOT_ID_GAME_NAME'] = rng.choice(["TSC Spectros", "THODA Spectros"])
+        participant['TEAM'] = team
+        participant['WIN'] = 'Win' if win else 'Fail'
+    game['participants'] = game['participants'] + rivals
+
+    for participant in game['participants']:
+        participant['SKIN'] = rng.choice(CHAMPIONS)
+        participant['CHAMPIONS_KILLED'] = str(rng.randint(0, 12))
+        participant['NUM_DEATHS'] = str(rng.randint(0, 10))
+        participant['ASSISTS'] = str(rng.randint(0, 20))
+        participant['Missions_CreepScore'] = str(int(minutes * rng.uniform(1, 10)))
+        participant['VISION_SCORE'] = str(int(minutes * rng.uniform(0.5, 3)))
+        participant['Missions_PlaceUsefulControlWards'] = str(rng.randint(0, 8))
+        participant['VISION_WARDS_BOUGHT_IN_GAME'] = str(rng.randint(0, 10))
+        participant['GOLD_EARNED'] = str(int(minutes * rng.uniform(300, 500)))
+        participant['TOTAL_DAMAGE_DEALT_TO_CHAMPIONS'] = str(int(minutes * rng.uniform(300, 1200)))
+    return game
+
+
+def match_filename(index: int, date: datetime.date, rng: random.Random, tournament_ratio: float) -> str:
+    """Nom de fichier au format attendu par load_data (Scrim ou Tournoi)."""
+    game_id = f"EUW1-{8000000000 + index}"
+    date_str = date.strftime('%d%m%Y')
+    opponent = rng.choice(OPPONENTS)
+    game_number = index % 3 + 1
+    if rng.random() < tournament_ratio:
+        tournament = rng.choice(TOURNAMENTS)
+        return f"{game_id}_{date_str}_Tournoi_{tournament}_{opponent}_GameTournoi{game_number}_Game1.json"
+    if rng.random() < 0.5:
+        return f"{game_id}_{date_str}_Scrim_{opponent}_Game{game_number}.json"
+    return f"{game_id}_{date_str}_Scrim_{opponent}_Game{game_number}_Match1.json"
+
+
+def generate(output_dir: str, n_games: int, seed: int = 0, tournament_ratio: float = 0.2,
+             start_index: int = 0) -> list:
+    """Écrit n_games fichiers dans output_dir ; retourne la liste des chemins.
+
+    start_index permet d'ajouter des parties à un dossier déjà généré.
+    """
+    rng = random.Random(seed)
+    template = load_template()
+    os.makedirs(output_dir, exist_ok=True)
+    start = datetime.date(2024, 1, 1)
+    paths = []
+    for index in range(start_index, start_index + n_games):
+        date = start + datetime.timedelta(days=index // 4)
+        path = os.path.join(output_dir, match_filename(index, date, rng, tournament_ratio))
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(make_game(template, rng), f)
+        paths.append(path)
+    return paths
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("output_dir")
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--tournament-ratio", type=float, default=0.2)
+    parser.add_argument("--start-index", type=int, default=0)
+    args = parser.parse_args()
+    generate(args.output_dir, args.games, args.seed, args.tournament_ratio, args.start_index)
@@ -4,4 +4,14 @@ from pathlib import Path
 
 if __name__ == "__main__":
     src_path = str(Path(__file__).parent / "src")
+    # python run.py report [...] : rapports en lot sans lancer Streamlit
+    if len(sys.argv) > 1 and sys.argv[1] == "report":
+        sys.path.insert(0, src_path)
+        from reports.batch_report import main
+        sys.exit(main(sys.argv[2:]))
+    # python run.py api [...] : API JSON locale (voir src/api.py)
+    if len(sys.argv) > 1 and sys.argv[1] == "api":
+        sys.path.insert(0, src_path)
+        from api import main
+        sys.exit(main(sys.argv[2:]))
     subprocess.run(["streamlit", "run", f"{src_path}/app.py"])
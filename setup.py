@@ -8,5 +8,11 @@ setup(
         'streamlit',
         'pandas',
         'plotly',
+        'numpy',
+        'pyarrow',
+        'starlette',
+        'uvicorn',
+        'Pillow',
+        'jinja2',
     ]
 )
@@ -0,0 +1,342 @@
+"""Local JSON API over StatsAnalyzer (Starlette app, served by uvicorn).
+
+Endpoints (all accept the dashboard filters as query params: game_type,
+opponent, tournament, patch, squad, date_from, date_to as YYYY-MM-DD):
+
+    GET /api/health
+    GET /api/players
+    GET /api/global
+    GET /api/champions
+    GET /api/players/{player}
+    GET /api/players/{player}/champions
+    GET /api/players/{player}/history?offset=0&limit=50
+    GET /api/patches?by=champion|player[&player=...]
+    GET /api/patches/compare?base=15.10&target=15.11[&by=...&player=...]
+
+The /api/patches routes ignore the patch filter: they cover every patch.
+
+Every response carries an ETag built from the data version and the
+request, so a client polling with If-None-Match gets a 304 until the data
+changes; query params are validated first, so a bad request always gets its
+400 or 404. Response bodies are kept in an in-process LRU; cache misses are
+computed in a worker thread so the event loop keeps answering hits and 304s.
+
+Run: python run.py api [--data data/] [--port 8502]
+"""
+import argparse
+import datetime
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from typing import Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+import uvicorn
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+from data_processing.analyzer_provider import get_analyzer
+from data_processing.filters import GAME_TYPES
+from data_processing.patches import PATCH_GROUPS, compare_patches, sort_patches
+from data_processing.result_cache import ResultCache
+from data_processing.stats_analyzer import StatsAnalyzer
+from utils.helpers import json_default
+
+API_CACHE_SIZE_ENV = 'SC_ESPORT_API_CACHE_SIZE'
+API_REFRESH_ENV = 'SC_ESPORT_API_REFRESH'
+DEFAULT_PORT = 8502
+HISTORY_DEFAULT_LIMIT = 50
+HISTORY_MAX_LIMIT = 1000
+FILTER_PARAMS = ('opponent', 'tournament', 'patch', 'squad')
+DATE_PARAMS = ('date_from', 'date_to')
+
+# data_version restarts at 0 with each process: the boot id keeps ETags from
+# a previous run (possibly over other data) from matching
+_BOOT_ID = uuid.uuid4().hex[:8]
+
+
+class BadRequest(Exception):
+    pass
+
+
+class NotFound(Exception):
+    pass
+
+
+class StatsApi:
+    """Shared analyzer, data token and response cache behind the routes."""
+
+    def __init__(self, data_path: str, cache_size: int = 256, refresh_interval: float = 2.0):
+        self.data_path = data_path
+        self.refresh_interval = refresh_interval
+        self.responses = ResultCache(cache_size)
+        self._analyzer: Optional[StatsAnalyzer] = None
+        self._checked = 0.0
+        self._lock = threading.Lock()
+
+    def analyzer(self) -> StatsAnalyzer:
+        """Analyzer of data_path, re-checked for new files at most every refresh_interval seconds."""
+        now = time.monotonic()
+        if self._analyzer is None or now - self._checked >= self.refresh_interval:
+            with self._lock:
+                if self._analyzer is None or now - self._checked >= self.refresh_interval:
+                    self._analyzer = get_analyzer(self.data_path)
+                    self._checked = time.monotonic()
+        return self._analyzer
+
+    def data_token(self, analyzer: StatsAnalyzer) -> str:
+        return f"{_BOOT_ID}.{analyzer.data_version}"
+
+    async def respond(self, request: Request, build: Callable[[StatsAnalyzer, Dict], Dict],
+                      parse: Optional[Callable[[StatsAnalyzer], Dict]] = None) -> Response:
+        """Parameters, then ETag / If-None-Match handling, then the cached body or build(analyzer, params).
+
+        parse(analyzer) validates the request into the params given to build; an
+        invalid request gets its 400/404 even when it carries a matching ETag.
+        """
+        if self._analyzer is None or time.monotonic() - self._checked >= self.refresh_interval:
+            analyzer = await run_in_threadpool(self.analyzer)
+        else:
+            analyzer = self._analyzer
+        try:
+            params = parse(analyzer) if parse is not None else {}
+        except (BadRequest, NotFound) as e:
+            return JSONResponse({'error': str(e)}, status_code=400 if isinstance(e, BadRequest) else 404)
+
+        token = self.data_token(analyzer)
+        canonical = request.url.path + '?' + '&'.join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+        etag = f'"{token}-{hashlib.sha1(canonical.encode("utf-8")).hexdigest()[:16]}"'
+        headers = {'ETag': etag, 'Cache-Control': 'no-cache'}
+        if _etag_matches(request.headers.get('if-none-match'), etag):
+            return Response(status_code=304, headers=headers)
+
+        key = (token, canonical)
+        body = self.responses.get(key)
+        if body is None:
+            # Computed off the event loop
+            body = await run_in_threadpool(self.responses.get_or_compute, key,
+                                           lambda: _encode(build(analyzer, params)))
+        return Response(body, media_type='application/json', headers=headers)
+
+
+def _encode(payload: Dict) -> bytes:
+    return json.dumps(payload, default=json_default, ensure_ascii=False).encode('utf-8')
+
+
+def parse_filters(request: Request) -> Dict:
+    """Dashboard filters from the query string (same names as get_global_stats arguments)."""
+    params = request.query_params
+    game_type = params.get('game_type', 'Global')
+    if game_type not in GAME_TYPES:
+        raise BadRequest(f"game_type must be one of {', '.join(GAME_TYPES)}")
+    filters = {'game_type': game_type}
+    for name in FILTER_PARAMS:
+        filters[name] = params.get(name) or None
+    for name in DATE_PARAMS:
+        value = params.get(name)
+        try:
+            filters[name] = datetime.date.fromisoformat(value) if value else None
+        except ValueError:
+            raise BadRequest(f"{name} must be a YYYY-MM-DD date")
+    return filters
+
+
+def _int_param(request: Request, name: str, default: int, maximum: Optional[int] = None) -> int:
+    value = request.query_params.get(name)
+    if value is None:
+        return default
+    try:
+        number = int(value)
+    except ValueError:
+        raise BadRequest(f"{name} must be an integer")
+    if number < 0:
+        raise BadRequest(f"{name} must be positive")
+    return min(number, maximum) if maximum is not None else number
+
+
+def _player(analyzer: StatsAnalyzer, request: Request) -> str:
+    player_name = request.path_params['player']
+    if player_name not in analyzer.players:
+        raise NotFound(f"unknown player: {player_name}")
+    return player_name
+
+
+def _patch_params(analyzer: StatsAnalyzer, request: Request) -> Dict:
+    """by, player and filters of a /api/patches request; the patch filter does not apply."""
+    by = request.query_params.get('by', 'champion')
+    if by not in PATCH_GROUPS:
+        raise BadRequest(f"by must be one of {', '.join(PATCH_GROUPS)}")
+    player_name = request.query_params.get('player') or None
+    if player_name is not None and player_name not in analyzer.players:
+        raise NotFound(f"unknown player: {player_name}")
+    filters = parse_filters(request)
+    filters.pop('patch')
+    return {'by': by, 'player': player_name, 'filters': filters}
+
+
+def _patch_stats(analyzer: StatsAnalyzer, params: Dict) -> pd.DataFrame:
+    filters = dict(params['filters'])
+    return analyzer.get_patch_stats(params['by'], params['player'], filters.pop('game_type'), **filters)
+
+
+def _records(frame: pd.DataFrame) -> List[Dict]:
+    """Rows of a stats table, NaN (e.g. a champion missing from one patch) as null."""
+    frame = frame.reset_index()
+    return frame.astype(object).where(frame.notna(), None).to_dict('records')
+
+
+def _etag_matches(header: Optional[str], etag: str) -> bool:
+    if not header:
+        return False
+    candidates = [tag.strip() for tag in header.split(',')]
+    return '*' in candidates or any(tag.removeprefix('W/') == etag for tag in candidates)
+
+
+def create_app(data_path: str = "data/", cache_size: Optional[int] = None,
+               refresh_interval: Optional[float] = None) -> Starlette:
+    if cache_size is None:
+        cache_size = int(os.environ.get(API_CACHE_SIZE_ENV, '256'))
+    if refresh_interval is None:
+        refresh_interval = float(os.environ.get(API_REFRESH_ENV, '2'))
+    api = StatsApi(data_path, cache_size, refresh_interval)
+
+    async def health(request: Request) -> Response:
+        return await api.respond(request, lambda analyzer, params: {
+            'status': 'ok',
+            'data_version': analyzer.data_version,
+            'games': analyzer.game_count(),
+        })
+
+    async def players(request: Request) -> Response:
+        def build(analyzer: StatsAnalyzer, params: Dict) -> Dict:
+            return {
+                'squads': analyzer.roster.squads,
+                'players': [
+                    {'name': player_name, 'role': role, 'squad': squad}
+                    for squad in analyzer.roster.squads
+                    for player_name, role in analyzer.roster.squad_players(squad)
+                ],
+            }
+        return await api.respond(request, build)
+
+    def player_params(analyzer: StatsAnalyzer, request: Request) -> Dict:
+        return {'player': _player(analyzer, request), 'filters': parse_filters(request)}
+
+    async def global_stats(request: Request) -> Response:
+        def build(analyzer: StatsAnalyzer, filters: Dict) -> Dict:
+            filters = dict(filters)
+            return analyzer.get_global_stats(filters.pop('game_type'), **filters)
+        return await api.respond(request, build, lambda analyzer: parse_filters(request))
+
+    async def champions(request: Request) -> Response:
+        def build(analyzer: StatsAnalyzer, filters: Dict) -> Dict:
+            filters = dict(filters)
+            stats = analyzer.get_global_stats(filters.pop('game_type'), **filters)
+            rows = [
+                {'champion': champion, 'games': data['games'], 'wins': data['wins'],
+                 'winrate': data['wins'] / data['games'] * 100 if data['games'] else 0}
+                for champion, data in stats['champion_stats'].items()
+            ]
+            rows.sort(key=lambda row: row['games'], reverse=True)
+            return {'champions': rows}
+        return await api.respond(request, build, lambda analyzer: parse_filters(request))
+
+    async def player_stats(request: Request) -> Response:
+        def build(analyzer: StatsAnalyzer, params: Dict) -> Dict:
+            player_name, filters = params['player'], dict(params['filters'])
+            stats = analyzer.get_player_stats(player_name, filters.pop('game_type'), **filters)
+            summary = {key: value for key, value in stats.items() if key != 'match_history'}
+            return {'player': player_name, 'role': analyzer.players[player_name]['role'], **summary}
+        return await api.respond(request, build, lambda analyzer: player_params(analyzer, request))
+
+    async def player_champions(request: Request) -> Response:
+        def build(analyzer: StatsAnalyzer, params: Dict) -> Dict:
+            player_name, filters = params['player'], dict(params['filters'])
+            champions = analyzer.get_player_champions(player_name, filters.pop('game_type'), **filters)
+            rows = champions.rename_axis('champion').reset_index().to_dict('records')
+            return {'player': player_name, 'champions': rows}
+        return await api.respond(request, build, lambda analyzer: player_params(analyzer, request))
+
+    async def player_history(request: Request) -> Response:
+        def parse(analyzer: StatsAnalyzer) -> Dict:
+            params = player_params(analyzer, request)
+            params['offset'] = _int_param(request, 'offset', 0)
+            params['limit'] = _int_param(request, 'limit', HISTORY_DEFAULT_LIMIT, HISTORY_MAX_LIMIT)
+            return params
+
+        def build(analyzer: StatsAnalyzer, params: Dict) -> Dict:
+            player_name, filters = params['player'], dict(params['filters'])
+            offset, limit = params['offset'], params['limit']
+            history = analyzer.get_player_stats(player_name, filters.pop('game_type'), **filters)['match_history']
+            return {
+                'player': player_name,
+                'total': len(history),
+                'offset': offset,
+                'limit': limit,
+                'games': history[offset:offset + limit],
+            }
+        return await api.respond(request, build, parse)
+
+    async def patches(request: Request) -> Response:
+        def build(analyzer: StatsAnalyzer, params: Dict) -> Dict:
+            stats = _patch_stats(analyzer, params)
+            return {
+                'by': params['by'],
+                'player': params['player'],
+                'patches': sort_patches(stats.index.get_level_values('patch').unique()),
+                'stats': _records(stats),
+            }
+        return await api.respond(request, build, lambda analyzer: _patch_params(analyzer, request))
+
+    async def patch_comparison(request: Request) -> Response:
+        def parse(analyzer: StatsAnalyzer) -> Dict:
+            base = request.query_params.get('base')
+            target = request.query_params.get('target')
+            if not base or not target:
+                raise BadRequest("base and target patches are required")
+            return {'base': base, 'target': target, **_patch_params(analyzer, request)}
+
+        def build(analyzer: StatsAnalyzer, params: Dict) -> Dict:
+            stats = _patch_stats(analyzer, params)
+            return {
+                'by': params['by'],
+                'player': params['player'],
+                'base': params['base'],
+                'target': params['target'],
+                'comparison': _records(compare_patches(stats, params['base'], params['target'])),
+            }
+        return await api.respond(request, build, parse)
+
+    app = Starlette(routes=[
+        Route('/api/health', health),
+        Route('/api/players', players),
+        Route('/api/global', global_stats),
+        Route('/api/champions', champions),
+        Route('/api/players/{player}', player_stats),
+        Route('/api/players/{player}/champions', player_champions),
+        Route('/api/players/{player}/history', player_history),
+        Route('/api/patches', patches),
+        Route('/api/patches/compare', patch_comparison),
+    ])
+    app.state.api = api
+    return app
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="SC Esport Stats JSON API")
+    parser.add_argument("--data", default="data/", help="Match files directory")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--cache-size", type=int, help=f"Cached responses (default {API_CACHE_SIZE_ENV} or 256)")
+    parser.add_argument("--refresh-interval", type=float,
+                        help=f"Seconds between checks for new match files (default {API_REFRESH_ENV} or 2)")
+    args = parser.parse_args(argv)
+    app = create_app(args.data, args.cache_size, args.refresh_interval)
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+    return 0
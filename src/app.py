@@ -1,24 +1,18 @@
 import os
+from collections import Counter
 import streamlit as st
 from components.player_stats_display import display_player_stats
+from components.debug_panel import display_profile_panel, display_timing_panel
 from components.stats_display import display_global_stats
-from data_processing.stats_analyzer import StatsAnalyzer
-from utils.image_utils import get_image_as_base64
+from data_processing.analyzer_provider import get_analyzer
+from utils.champion_assets import prefetch_assets, set_game_patch
+from utils.html_cache import emit_css
+from utils.image_utils import image_data_uri
+from utils import profiling, timing
 
 st.set_page_config(page_title="SC-Esport-Stats", layout="wide")
 
-# Initialize the analyzer
-analyzer = StatsAnalyzer("data/")
-
-# Initialize session state for navigation
-if 'current_page' not in st.session_state:
-    st.session_state.current_page = 'global'
-if 'selected_role' not in st.session_state:
-    st.session_state.selected_role = 'TOP'  # Default selection
-
-# CSS to customize the navbar
-st.markdown("""
-    <style>
+NAVBAR_CSS = """
     .navbar {
         padding: 1rem;
         background-color: #1E1E1E;
@@ -48,92 +42,189 @@ st.markdown("""
     th.blank.level0 {
         display: none;
     }
-    </style>
-""", unsafe_allow_html=True)
-
-# Navbar with logo and title
-logo_path = os.path.join(os.path.dirname(__file__), "..", "img", "logoequipe.jpg")
-st.markdown(f"""
-    <div class="navbar">
-        <div class="logo-title">
-            <img src="data:image/png;base64,{get_image_as_base64(logo_path)}" class="logo">
-            <span class="title">SC Esport Stats</span>
-        </div>
-    </div>
-""", unsafe_allow_html=True)
-
-# Navigation buttons
-col1, col2, space = st.columns([2, 2, 8])
-
-with col1:
-    if st.button(
-        "📊 Statistiques Globales", 
-        key="btn_global",
-        use_container_width=True,
-        type="primary" if st.session_state.current_page == 'global' else "secondary"
-    ):
+"""
+
+COMPACT_BUTTONS_CSS = """
+    div.stButton > button {
+        padding: 0.2rem 1rem;
+        font-size: 0.8rem;
+        height: auto;
+    }
+"""
+
+# The logo is displayed at 50px: a 100px thumbnail is enough for high-DPI screens
+LOGO_SIZE = 100
+
+def render_page():
+    """Navbar, filters and the selected page; may end early through st.stop() or st.rerun()."""
+    # Get the shared analyzer (built once per server process, rebuilt only when data/ changes)
+    analyzer = get_analyzer("data/")
+
+    # Initialize session state for navigation
+    if 'current_page' not in st.session_state:
         st.session_state.current_page = 'global'
-        st.rerun()  # Force the page to reload
-
-with col2:
-    if st.button(
-        "👤 Statistiques par Joueur", 
-        key="btn_player",
-        use_container_width=True,
-        type="primary" if st.session_state.current_page == 'player' else "secondary"
-    ):
-        st.session_state.current_page = 'player'
-        st.rerun()  # Force the page to reload
-
-st.divider()
-
-# Game type selector
-game_types = ["Global", "Scrim", "Tournoi"]
-selected_game_type = st.selectbox(
-    "Type de parties",
-    game_types,
-    key="game_type_selector"
-)
-
-# Navigation handling
-if st.session_state.current_page == 'player':
-    st.header("Statistiques par joueur")
-    
-    # Custom CSS for more compact buttons
-    st.markdown(""" 
-        <style> 
-        div.stButton > button { 
-            padding: 0.2rem 1rem; 
-            font-size: 0.8rem; 
-            height: auto; 
-        } 
-        </style> 
+    if 'selected_player' not in st.session_state:
+        st.session_state.selected_player = None  # First player of the squad by default
+
+    # CSS to customize the navbar (minified once per process)
+    emit_css("navbar", lambda: NAVBAR_CSS)
+
+    # Navbar with logo and title
+    logo_path = os.path.join(os.path.dirname(__file__), "..", "img", "logoequipe.jpg")
+    st.markdown(f"""
+        <div class="navbar">
+            <div class="logo-title">
+                <img src="{image_data_uri(logo_path, LOGO_SIZE)}" class="logo">
+                <span class="title">SC Esport Stats</span>
+            </div>
+        </div>
     """, unsafe_allow_html=True)
-    
-    # Role buttons
-    roles = ["TOP", "JUNGLE", "MID", "ADC", "SUPPORT"]
-    cols = st.columns(len(roles))
-    
-    for i, role in enumerate(roles):
-        with cols[i]:
-            if st.button(
-                role,
-                key=f"btn_{role}",
-                type="primary" if st.session_state.selected_role == role else "secondary",
-                use_container_width=True
-            ):
-                st.session_state.selected_role = role
-                st.rerun()  # Force the page to reload
-    
-    # Update player stats display with selected game type
-    role_to_player = {
-        "TOP": "Claquette",
-        "JUNGLE": "Spectros",
-        "MID": "Futeyy",
-        "ADC": "Tixty",
-        "SUPPORT": "Dert"
+
+    # Navigation buttons
+    col1, col2, space = st.columns([2, 2, 8])
+
+    with col1:
+        if st.button(
+            "📊 Statistiques Globales", 
+            key="btn_global",
+            use_container_width=True,
+            type="primary" if st.session_state.current_page == 'global' else "secondary"
+        ):
+            st.session_state.current_page = 'global'
+            st.rerun()  # Force the page to reload
+
+    with col2:
+        if st.button(
+            "👤 Statistiques par Joueur", 
+            key="btn_player",
+            use_container_width=True,
+            type="primary" if st.session_state.current_page == 'player' else "secondary"
+        ):
+            st.session_state.current_page = 'player'
+            st.rerun()  # Force the page to reload
+
+    st.divider()
+
+    # Squad selector (only when the roster tracks several squads)
+    roster = analyzer.roster
+    selected_squad = roster.default_squad
+    if len(roster.squads) > 1:
+        selected_squad = st.selectbox(
+            "Équipe",
+            list(roster.squads),
+            format_func=roster.squads.get,
+            key="squad_selector"
+        )
+
+    # Game type selector
+    game_types = ["Global", "Scrim", "Tournoi"]
+    selected_game_type = st.selectbox(
+        "Type de parties",
+        game_types,
+        key="game_type_selector"
+    )
+
+    # Additional filters (opponent, tournament, patch, date range)
+    filter_options = analyzer.get_filter_options()
+    # Champion icons of the patch of the most recent games (unless SC_ESPORT_ASSETS_PATCH is set)
+    set_game_patch(filter_options['patches'][-1] if filter_options['patches'] else None)
+    # Start a missing download before any icon is rendered; this rerun uses remote icons meanwhile
+    prefetch_assets()
+    filter_cols = st.columns(4)
+    with filter_cols[0]:
+        selected_opponent = st.selectbox("Adversaire", ["Tous"] + filter_options['opponents'], key="opponent_selector")
+    with filter_cols[1]:
+        selected_tournament = st.selectbox("Tournoi", ["Tous"] + filter_options['tournaments'], key="tournament_selector")
+    with filter_cols[2]:
+        selected_patch = st.selectbox("Patch", ["Tous"] + filter_options['patches'], key="patch_selector")
+    with filter_cols[3]:
+        date_bounds = (filter_options['date_min'], filter_options['date_max'])
+        selected_dates = st.date_input(
+            "Période",
+            value=date_bounds if date_bounds[0] else (),
+            min_value=date_bounds[0],
+            max_value=date_bounds[1],
+            key="date_selector"
+        )
+
+    # The date input returns a single date while the range is being picked
+    selected_dates = tuple(selected_dates) if isinstance(selected_dates, (list, tuple)) else (selected_dates,)
+    date_from = selected_dates[0] if len(selected_dates) > 0 else None
+    date_to = selected_dates[1] if len(selected_dates) > 1 else None
+    # A bound at the edge of the data filters nothing: leave it unset so that the default
+    # full range is served by the rollups and the precomputed trends
+    if date_from is not None and date_from <= date_bounds[0]:
+        date_from = None
+    if date_to is not None and date_to >= date_bounds[1]:
+        date_to = None
+    filters = {
+        'opponent': None if selected_opponent == "Tous" else selected_opponent,
+        'tournament': None if selected_tournament == "Tous" else selected_tournament,
+        'patch': None if selected_patch == "Tous" else selected_patch,
+        'date_from': date_from,
+        'date_to': date_to,
+        'squad': selected_squad if len(roster.squads) > 1 else None,
     }
-    display_player_stats(analyzer, role_to_player[st.session_state.selected_role], selected_game_type)
+
+    # Navigation handling
+    if st.session_state.current_page == 'player':
+        st.header("Statistiques par joueur")
+
+        # Custom CSS for more compact buttons
+        emit_css("compact_buttons", lambda: COMPACT_BUTTONS_CSS)
+
+        # Role buttons, generated from the squad members in roster.json
+        members = roster.squad_players(selected_squad)
+        if not members:
+            st.info("Aucun joueur dans cette équipe")
+            st.stop()
+        if st.session_state.selected_player not in dict(members):
+            st.session_state.selected_player = members[0][0]
+        role_counts = Counter(role for _, role in members)
+        cols = st.columns(len(members))
+
+        for i, (player_name, role) in enumerate(members):
+            with cols[i]:
+                if st.button(
+                    role if role_counts[role] == 1 else f"{role} · {player_name}",
+                    key=f"btn_{player_name}",
+                    type="primary" if st.session_state.selected_player == player_name else "secondary",
+                    use_container_width=True
+                ):
+                    st.session_state.selected_player = player_name
+                    st.rerun()  # Force the page to reload
+
+        # Update player stats display with selected game type
+        display_player_stats(analyzer, st.session_state.selected_player, selected_game_type, filters)
+    else:
+        st.title("Statistiques Globales")
+        display_global_stats(analyzer, selected_game_type, filters)
+
+
+# Opt-in profiling of this whole rerun (SC_ESPORT_PROFILE=1 or ?profile=1 in the URL)
+profiler = profiling.start_profile() if profiling.requested(st.query_params) else None
+
+# Opt-in timing of this rerun (SC_ESPORT_TIMING=1 or ?timing=1 in the URL)
+timing_enabled = timing.requested(st.query_params)
+if timing_enabled:
+    timing.start_rerun(st.session_state.get('current_page', 'global'))
 else:
-    st.title("Statistiques Globales")
-    display_global_stats(analyzer, selected_game_type)  # Added game type
\ No newline at end of file
+    timing.discard_rerun()
+
+# The profiler and the timing spans are closed even when the page ends early
+# (st.stop, st.rerun from a button) or raises
+try:
+    render_page()
+finally:
+    rerun_timings = timing.finish_rerun() if timing_enabled else None
+    profile_report = (profiling.finish_profile(profiler, st.session_state.get('current_page', 'global'))
+                      if profiler is not None else None)
+
+if rerun_timings is not None:
+    display_timing_panel(rerun_timings)
+
+if profile_report is not None:
+    display_profile_panel(profile_report)
+    # ?profile=1 only profiles one rerun
+    if not profiling.requested_by_env() and profiling.PROFILE_QUERY_PARAM in st.query_params:
+        del st.query_params[profiling.PROFILE_QUERY_PARAM]
@@ -2,28 +2,14 @@ import streamlit as st
 import plotly.graph_objects as go
 from utils.formatters import format_champion_name
 
-def display_champion_graph(df):
-    """Display champion statistics graph."""
+def display_champion_graph(champion_stats):
+    """Display champion statistics graph (champion_stats from analyzer.get_player_champions, sorted by games)."""
     st.subheader("Champions les plus joués")
-    
-    # Count games and wins per champion
-    champion_stats = {}
-    for _, row in df.iterrows():
-        champ = row['SKIN']
-        result = row['Win']
-        if champ not in champion_stats:
-            champion_stats[champ] = {'total': 0, 'wins': 0}
-        champion_stats[champ]['total'] += 1
-        if result == 'Win':
-            champion_stats[champ]['wins'] += 1
 
-    # Sort champions by total games
-    sorted_champions = sorted(champion_stats.items(), key=lambda x: x[1]['total'], reverse=True)
-    
     # Prepare data for plot
-    champions = [format_champion_name(champ) for champ, _ in sorted_champions]
-    wins = [stats['wins'] for _, stats in sorted_champions]
-    losses = [stats['total'] - stats['wins'] for _, stats in sorted_champions]
+    champions = [format_champion_name(champ) for champ in champion_stats.index]
+    wins = champion_stats['wins'].tolist()
+    losses = champion_stats['losses'].tolist()
 
     fig = go.Figure(data=[
         go.Bar(
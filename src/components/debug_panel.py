@@ -0,0 +1,35 @@
+import pandas as pd
+import streamlit as st
+
+from utils.profiling import ProfileReport
+from utils.timing import RerunTimings
+
+
+def display_timing_panel(timings: RerunTimings):
+    """Display the spans recorded during this rerun (opt-in debug panel)."""
+    with st.expander(f"⏱️ Timings ({timings.total_ms:.0f} ms)", expanded=False):
+        rows = timings.rows()
+        if not rows:
+            st.caption("No span recorded during this rerun.")
+            return
+        df = pd.DataFrame(rows)
+        df['share'] = df['total_ms'] / timings.total_ms * 100 if timings.total_ms > 0 else 0
+        st.dataframe(
+            df.round({'total_ms': 2, 'max_ms': 2, 'share': 1}),
+            hide_index=True,
+            use_container_width=True
+        )
+
+
+def display_profile_panel(report: ProfileReport):
+    """Display the hottest functions of the profiled rerun and where the report was saved."""
+    with st.expander(f"🔬 Profile ({report.total_s * 1000:.0f} ms)", expanded=True):
+        st.caption(f"Report: {report.path} (pstats) · {report.text_path}")
+        if not report.rows:
+            return
+        df = pd.DataFrame(report.rows)
+        st.dataframe(
+            df.round({'tottime_ms': 2, 'cumtime_ms': 2}),
+            hide_index=True,
+            use_container_width=True
+        )
@@ -1,31 +1,24 @@
 import streamlit as st
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 from pathlib import Path
-from utils.formatters import format_champion_name, get_champion_icon_url
+from utils.champion_assets import emit_atlas_css
+from utils.formatters import champion_icon_html, format_champion_name
+from utils.html_cache import cached_html, css_file_block
+from utils.timing import span
 
 def load_css():
+    # Read once per process; the identical block is re-emitted on each rerun
     css_path = Path(__file__).parent.parent.parent / 'static/css/player_stats.css'
-    with open(css_path) as f:
-        st.markdown(f'<style>{f.read()}</style>', unsafe_allow_html=True)
-
-def display_champion_graph(df: pd.DataFrame):
-    """Display the champion statistics graph."""
-    champion_stats = {}
-    for _, row in df.iterrows():
-        champ = row['SKIN']
-        result = row['Win']
-        if champ not in champion_stats:
-            champion_stats[champ] = {'total': 0, 'wins': 0}
-        champion_stats[champ]['total'] += 1
-        if result == 'Win':
-            champion_stats[champ]['wins'] += 1
-
-    # Sort champions by total games
-    sorted_champions = sorted(champion_stats.items(), key=lambda x: x[1]['total'], reverse=True)
-    champions = [format_champion_name(champ) for champ, _ in sorted_champions]
-    wins = [stats['wins'] for _, stats in sorted_champions]
-    losses = [stats['total'] - stats['wins'] for _, stats in sorted_champions]
+    st.markdown(css_file_block(css_path), unsafe_allow_html=True)
+    emit_atlas_css()
+
+def display_champion_graph(champion_stats: pd.DataFrame):
+    """Display the champion statistics graph (champion_stats from analyzer.get_player_champions, sorted by games)."""
+    champions = [format_champion_name(champ) for champ in champion_stats.index]
+    wins = champion_stats['wins'].tolist()
+    losses = champion_stats['losses'].tolist()
 
     # Create figure
     fig = go.Figure(data=[
@@ -78,9 +71,150 @@ def display_champion_graph(df: pd.DataFrame):
 
     st.plotly_chart(fig, use_container_width=True)
 
+# Metrics of the form chart: label -> column prefix of analyzer.get_player_trends
+TREND_METRICS = {
+    "KDA": "kda",
+    "CS/min": "cs_per_min",
+    "KP (%)": "kp",
+    "Vision/min": "vision_per_min",
+}
+
+def display_trend_chart(trends: pd.DataFrame, key: str = "trend_metric"):
+    """Display the player's form: per-game values, 5/10-game rolling averages and exponential average."""
+    label = st.radio("Métrique", list(TREND_METRICS), horizontal=True, key=key)
+    metric = TREND_METRICS[label]
+    games = trends.index.to_numpy()
+    hover_text = [
+        f"{date:%d/%m/%Y} - Game {numero_game} ({type_partie})"
+        for date, numero_game, type_partie in zip(trends['date'], trends['numero_game'], trends['type_partie'])
+    ]
+
+    fig = go.Figure(data=[
+        go.Scatter(name='Par partie', x=games, y=trends[metric], mode='markers', text=hover_text,
+                   marker=dict(color='rgba(255,255,255,0.35)', size=6)),
+        go.Scatter(name='5 dernières', x=games, y=trends[f"{metric}_5"], mode='lines', text=hover_text,
+                   line=dict(color='#3498DB', width=2)),
+        go.Scatter(name='10 dernières', x=games, y=trends[f"{metric}_10"], mode='lines', text=hover_text,
+                   line=dict(color='#2ECC71', width=2)),
+        go.Scatter(name='Moyenne exponentielle', x=games, y=trends[f"{metric}_ewm"], mode='lines', text=hover_text,
+                   line=dict(color='#F1C40F', width=2, dash='dot')),
+    ])
+    fig.update_traces(hovertemplate='%{text}<br>%{y:.2f}')
+
+    fig.update_layout(
+        title={
+            'text': f"Évolution {label}",
+            'y': 0.95,
+            'x': 0.5,
+            'xanchor': 'center',
+            'yanchor': 'top',
+            'font': dict(size=20)
+        },
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        font=dict(color='white'),
+        hovermode='x unified',
+        showlegend=True,
+        legend=dict(
+            orientation='h',
+            yanchor="bottom",
+            y=-0.3,
+            xanchor="center",
+            x=0.5,
+            bgcolor='rgba(0,0,0,0)',
+            bordercolor='rgba(0,0,0,0)'
+        )
+    )
+
+    fig.update_xaxes(
+        title_text="Parties (ordre chronologique)",
+        showgrid=False,
+        showline=True,
+        linewidth=2,
+        linecolor='rgba(255,255,255,0.2)'
+    )
+
+    fig.update_yaxes(
+        showgrid=True,
+        gridwidth=1,
+        gridcolor='rgba(255,255,255,0.1)',
+        showline=True,
+        linewidth=2,
+        linecolor='rgba(255,255,255,0.2)'
+    )
+
+    st.plotly_chart(fig, use_container_width=True)
+
+def display_weekly_stats(weekly: pd.DataFrame):
+    """Display games won/lost per ISO week (weekly from analyzer.get_player_weekly_stats, chronological)."""
+    weeks = weekly.index.astype(str).tolist()
+    hover_text = [
+        f"Winrate {winrate:.0f}% - KDA {kda:.2f} - CS/min {cs_per_min:.1f}"
+        for winrate, kda, cs_per_min in zip(weekly['winrate'], weekly['kda'], weekly['cs_per_min'].fillna(0))
+    ]
+
+    fig = go.Figure(data=[
+        go.Bar(name='Victoires', x=weeks, y=weekly['wins'], marker_color='#2ECC71', width=0.5, text=hover_text,
+               textposition='none', hovertemplate='%{y} victoire(s)<br>%{text}'),
+        go.Bar(name='Défaites', x=weeks, y=weekly['games'] - weekly['wins'], marker_color='#E74C3C', width=0.5,
+               hovertemplate='%{y} défaite(s)'),
+    ])
+
+    fig.update_layout(
+        barmode='stack',
+        title={
+            'text': "Parties par semaine",
+            'y': 0.95,
+            'x': 0.5,
+            'xanchor': 'center',
+            'yanchor': 'top',
+            'font': dict(size=20)
+        },
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        font=dict(color='white'),
+        hovermode='x unified',
+        showlegend=True,
+        legend=dict(
+            yanchor="top",
+            y=0.99,
+            xanchor="right",
+            x=0.99,
+            bgcolor='rgba(0,0,0,0)',
+            bordercolor='rgba(0,0,0,0)'
+        )
+    )
+
+    fig.update_xaxes(
+        type='category',
+        showgrid=False,
+        showline=True,
+        linewidth=2,
+        linecolor='rgba(255,255,255,0.2)'
+    )
+
+    fig.update_yaxes(
+        showgrid=True,
+        gridwidth=1,
+        gridcolor='rgba(255,255,255,0.1)',
+        showline=True,
+        linewidth=2,
+        linecolor='rgba(255,255,255,0.2)'
+    )
+
+    st.plotly_chart(fig, use_container_width=True)
+
+# Stats shown in the player grid
+PLAYER_GRID_KEYS = ['kda', 'avg_kills', 'avg_deaths', 'avg_assists', 'cs_per_min', 'avg_vision', 'kp']
+
 def display_player_grid(stats: dict):
     """Display the main player statistics grid."""
-    grid_html = f"""
+    grid_stats = {key: stats.get(key, 0) for key in PLAYER_GRID_KEYS}
+    grid_html = cached_html('player_grid', grid_stats, lambda: render_player_grid(grid_stats))
+    st.markdown(grid_html, unsafe_allow_html=True)
+
+def render_player_grid(stats: dict) -> str:
+    return f"""
     <div class="player-stats-grid">
         <div class="player-stat-card">
             <div class="stat-label">KDA</div>
@@ -109,195 +243,232 @@ def display_player_grid(stats: dict):
         </div>
     </div>
     """
-    st.markdown(grid_html, unsafe_allow_html=True)
 
-def display_player_stats(analyzer, player_name: str, game_type: str = "Global"):
-    load_css()
+def display_player_stats(analyzer, player_name: str, game_type: str = "Global", filters: dict = None):
+    with span("player.css"):
+        load_css()
 
     # Récupération des stats
-    stats = analyzer.get_player_stats(player_name, game_type)
+    stats = analyzer.get_player_stats(player_name, game_type, **(filters or {}))
     
     if not stats['match_history']:
         st.error("Aucune donnée disponible")
         return
         
-    df = pd.DataFrame(stats['match_history'])
-    
-    # Calculate CS/min for the entire dataset
-    df['cs_per_min'] = df.apply(
-        lambda row: float(row['Missions_CreepScore']) / (float(row['gameDuration']) / 60000),
-        axis=1
-    )
+    with span("player.prepare"):
+        df = pd.DataFrame(stats['match_history'])
+
+        # Calculate CS/min for the entire dataset (match history values are already numeric)
+        df['cs_per_min'] = df['Missions_CreepScore'] / (df['gameDuration'] / 60000)
+
+        # Calculate stats before displaying
+        stats['cs_per_min'] = df['cs_per_min'].mean()
+        stats['kp'] = df['KP'].mean()
+
+        # Per-champion table from the analyzer rollups, shared by the graph and the table
+        champion_stats = analyzer.get_player_champions(player_name, game_type, **(filters or {}))
+
+        # Rolling and exponential form series, in chronological order
+        trends = analyzer.get_player_trends(player_name, game_type, **(filters or {}))
+
+        # Per ISO week sums, read from the week dimension of the rollups
+        weekly = analyzer.get_player_weekly_stats(player_name, game_type, **(filters or {}))
 
-    # Calculate stats before displaying
-    stats['cs_per_min'] = df['cs_per_min'].mean()
-    stats['kp'] = df['KP'].astype(float).mean()
+        # Sorted history with every numeric/class column, paginated at display time
+        history = prepare_match_history(df)
 
     # Display sections in order
     sections = [
         ("Statistiques du joueur", lambda: display_player_grid(stats)),
-        ("Champions les plus joués", lambda: display_champion_graph(df)),
-        ("Champions Stats", lambda: display_champion_stats(df)),
-        ("Historique des parties", lambda: display_match_history(df))
+        ("Forme", lambda: display_trend_chart(trends, key=f"trend_metric_{player_name}")),
+        ("Par semaine", lambda: display_weekly_stats(weekly)),
+        ("Champions les plus joués", lambda: display_champion_graph(champion_stats)),
+        ("Champions Stats", lambda: display_champion_stats(champion_stats)),
+        ("Historique des parties", lambda: display_match_history(history, key=f"history_{player_name}"))
     ]
     
     for title, display_func in sections:
-        st.markdown(f'<div class="section-title">{title}</div>', unsafe_allow_html=True)
-        display_func()
+        with span(f"player.section.{title}"):
+            st.markdown(f'<div class="section-title">{title}</div>', unsafe_allow_html=True)
+            display_func()
 
-def display_match_history(df: pd.DataFrame):
-    # Sort by date
-    df['DATE'] = pd.to_datetime(df['date'], format='%d%m%Y')
+# Match history page sizes (rows rendered per page)
+HISTORY_PAGE_SIZES = [10, 25, 50, 100]
+
+# Colour class bins for bin_classes: labels[i] for bins[i-1] <= value < bins[i]
+# (KDA and vision use the same thresholds as get_kda_class / get_vision_class)
+KDA_CLASS_BINS = ([1.5, 2.5, 5], ['kda-low', 'kda-medium', 'kda-high', 'kda-gold'])
+CS_CLASS_BINS = ([6, 8, 9], ['color-low', 'color-medium', 'color-good', 'color-high'])
+VISION_CLASS_BINS = ([30, 50, 75], ['color-low', 'color-medium', 'color-good', 'color-high'])
+GOLD_EFFICIENCY_CLASS_BINS = ([1000, 1300, 1600], ['color-low', 'color-medium', 'color-good', 'color-high'])
+
+# Header tooltips of the match history table
+HISTORY_HEADER_TOOLTIPS = {
+    "<th>KDA</th>": "<th title='Kills+Assists / Deaths - Score d&#39;efficacité combative'>KDA</th>",
+    "<th>CS/MIN</th>": "<th title='Creep Score par minute - Mesure l&#39;efficacité du farming'>CS/MIN</th>",
+    "<th>KP</th>": "<th title='Kill Participation - % de participation aux éliminations de l&#39;équipe'>KP</th>",
+    "<th>VISION</th>": "<th title='Score de vision (Efficacité en % = wards utiles/wards achetées)'>VISION</th>",
+    "<th>GOLD EFF</th>": "<th title='Dégâts infligés par 1000 or - Mesure l&#39;efficacité de l&#39;or dépensé'>GOLD EFF</th>",
+}
+
+def bin_classes(values, bins) -> np.ndarray:
+    """Return the colour class of every value at once (NaN gets the lowest class)."""
+    edges, labels = bins
+    values = np.asarray(values, dtype=float)
+    classes = np.asarray(labels)[np.digitize(values, edges)]
+    classes[np.isnan(values)] = labels[0]
+    return classes
+
+def prepare_match_history(df: pd.DataFrame) -> pd.DataFrame:
+    """Sort the history by date and compute every numeric column of the table in bulk."""
+    df = df.assign(DATE=pd.to_datetime(df['date'], format='%d%m%Y'))
     df = df.sort_values('DATE', ascending=False)
-    
-    # Ensure vision columns exist and convert to numeric
-    vision_columns = ['VISION_SCORE', 'VISION_WARDS_BOUGHT_IN_GAME', 'Missions_PlaceUsefulControlWards']
-    for col in vision_columns:
-        if col not in df.columns:
-            df[col] = 0
-        else:
-            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0).astype(int)
-    
-    # Convert other numeric columns
-    for col in ['GOLD_EARNED', 'TOTAL_DAMAGE_DEALT_TO_CHAMPIONS']:
-        if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors='coerce')
-    
-    # Create derived columns for vision
-    df['vision_score_value'] = df['VISION_SCORE']
-    df['vision_useful_wards'] = df['Missions_PlaceUsefulControlWards']
-    df['vision_bought_wards'] = df['VISION_WARDS_BOUGHT_IN_GAME']
-    
-    # Calculate vision efficiency percentage
-    df['vision_efficiency_pct'] = df.apply(
-        lambda row: 100 * row['vision_useful_wards'] / row['vision_bought_wards']
-                    if row['vision_bought_wards'] > 0 else 0,
-        axis=1
-    )
-    
-    # Format vision data for display
-    df['VISION_FORMATTED'] = df.apply(
-        lambda row: format_vision_data(
-            row['vision_score_value'],
-            row['vision_useful_wards'],
-            row['vision_bought_wards'],
-            row['vision_efficiency_pct']
-        ),
-        axis=1
-    )
-    
-    # Calculate gold efficiency - fixing the error by ensuring values exist
-    try:
-        if all(col in df.columns for col in ['TOTAL_DAMAGE_DEALT_TO_CHAMPIONS', 'GOLD_EARNED']):
-            # Store raw values for tooltip and ensure they're numeric
-            df['dmg_dealt'] = pd.to_numeric(df['TOTAL_DAMAGE_DEALT_TO_CHAMPIONS'], errors='coerce').fillna(0)
-            df['gold'] = pd.to_numeric(df['GOLD_EARNED'], errors='coerce').fillna(0)
-            
-            # Calculate gold efficiency safely
-            df['gold_efficiency'] = df.apply(
-                lambda row: (
-                    row['dmg_dealt'] / row['gold'] * 1000
-                    if row['gold'] > 0 else 0
-                ),
-                axis=1
-            )
-        else:
-            # Ensure safe fallback if columns are missing
-            df['cs_per_min'] = df['cs_per_min'] if 'cs_per_min' in df.columns else 0
-            df['gold_efficiency'] = df['cs_per_min'] * 50
-            df['dmg_dealt'] = 0
-            df['gold'] = 0
-    except Exception as e:
-        # If anything goes wrong, provide placeholder values
-        df['gold_efficiency'] = 0
-        df['dmg_dealt'] = 0
-        df['gold'] = 0
-    
-    # Prepare display DataFrame
+
+    kills = df['CHAMPIONS_KILLED'].astype(int).to_numpy()
+    deaths = df['NUM_DEATHS'].astype(int).to_numpy()
+    assists = df['ASSISTS'].astype(int).to_numpy()
+    duration = pd.to_numeric(df['gameDuration']).to_numpy()
+    creep_score = df['Missions_CreepScore'].astype(int).to_numpy()
+    vision_score = pd.to_numeric(df['VISION_SCORE'], errors='coerce').fillna(0).astype(int).to_numpy()
+    useful_wards = pd.to_numeric(df['Missions_PlaceUsefulControlWards'], errors='coerce').fillna(0).astype(int).to_numpy()
+    bought_wards = pd.to_numeric(df['VISION_WARDS_BOUGHT_IN_GAME'], errors='coerce').fillna(0).astype(int).to_numpy()
+    damage = pd.to_numeric(df['TOTAL_DAMAGE_DEALT_TO_CHAMPIONS'], errors='coerce').fillna(0).to_numpy()
+    gold = pd.to_numeric(df['GOLD_EARNED'], errors='coerce').fillna(0).to_numpy()
+    kp = df['KP'].astype(float).to_numpy()
+    contribution = kills + assists
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cs_per_min = creep_score / (duration / 60000)
+        kda = (kills + assists) / np.maximum(1, deaths)
+        vision_efficiency = np.where(bought_wards > 0, 100 * useful_wards / bought_wards, 0)
+        gold_efficiency = np.where(gold > 0, damage / gold * 1000, 0)
+        team_kills = np.where(kp > 0, contribution / kp * 100, 0)
+
+    return pd.DataFrame({
+        'DATE': df['DATE'].dt.strftime('%d/%m/%Y').to_numpy(),
+        'SKIN': df['SKIN'].astype(str).to_numpy(),
+        'Win': df['Win'].to_numpy(),
+        'type_partie': df['type_partie'].to_numpy(),
+        'equipe_adverse': df['equipe_adverse'].to_numpy(),
+        'numero_game': df['numero_game'].to_numpy(),
+        'duration': duration,
+        'KDA': df['KDA'].to_numpy(),
+        'kda': kda,
+        'kda_class': bin_classes(kda, KDA_CLASS_BINS),
+        'KP': kp,
+        'contribution': contribution,
+        'team_kills': team_kills,
+        'creep_score': creep_score,
+        'cs_per_min': cs_per_min,
+        'cs_class': bin_classes(cs_per_min, CS_CLASS_BINS),
+        'vision_score': vision_score,
+        'useful_wards': useful_wards,
+        'bought_wards': bought_wards,
+        'vision_efficiency': vision_efficiency,
+        'vision_class': bin_classes(vision_efficiency, VISION_CLASS_BINS),
+        'damage': damage,
+        'gold': gold,
+        'gold_efficiency': gold_efficiency,
+        'gold_class': bin_classes(gold_efficiency, GOLD_EFFICIENCY_CLASS_BINS),
+    })
+
+def render_match_history(history: pd.DataFrame) -> str:
+    """Build the HTML table for the given rows of a prepared history (usually one page)."""
+    champion_cells = {
+        champ: f'{champion_icon_html(champ, 30)} {format_champion_name(champ)}'
+        for champ in history['SKIN'].unique()
+    }
     display_df = pd.DataFrame()
-    display_df['DATE'] = df['DATE'].dt.strftime('%d/%m/%Y')
-    display_df['CHAMPION'] = df['SKIN'].apply(
-        lambda x: f'<img src="{get_champion_icon_url(x)}" width="30" height="30"> {format_champion_name(x)}'
-    )
-    display_df['W/L'] = df['Win'].apply(lambda x: "✅ Win" if x == "Win" else "❌ Lose")
-    
-    # Correction du type de partie
-    if 'type_partie' in df.columns:
-        display_df['TYPE'] = df['type_partie'].map({'Scrim': '⚔️ Scrim', 'Tournoi': '🛡️ Tournoi'})
-    else:
-        display_df['TYPE'] = "-"
-    
-    # Ajouter les colonnes de base
-    display_df['VS'] = df['equipe_adverse'] 
-    display_df['GAME'] = df['numero_game']
-    display_df['DURÉE'] = pd.to_numeric(df['gameDuration']).apply(
-        lambda x: f"{int(x/60000):02d}:{int((x%60000)/1000):02d}"
-    )
-    
+    display_df['DATE'] = history['DATE']
+    display_df['CHAMPION'] = history['SKIN'].map(champion_cells)
+    display_df['W/L'] = np.where(history['Win'] == 'Win', "✅ Win", "❌ Lose")
+    display_df['TYPE'] = history['type_partie'].map({'Scrim': '⚔️ Scrim', 'Tournoi': '🛡️ Tournoi'})
+    display_df['VS'] = history['equipe_adverse']
+    display_df['GAME'] = history['numero_game']
+    display_df['DURÉE'] = [
+        f"{int(duration // 60000):02d}:{int((duration % 60000) // 1000):02d}"
+        for duration in history['duration']
+    ]
+
     # KDA avec score numérique
-    df['kda_numeric'] = df['KDA'].apply(lambda kda_str: calculate_kda_from_string(kda_str))
-    display_df['KDA'] = df.apply(
-        lambda row: f"{row['KDA']} <span class='{get_kda_class(row['kda_numeric'])}'>[{row['kda_numeric']:.2f}]</span>",
-        axis=1
-    )
-    
+    display_df['KDA'] = [
+        f"{kda_str} <span class='{kda_class}'>[{kda:.2f}]</span>"
+        for kda_str, kda, kda_class in zip(history['KDA'], history['kda'], history['kda_class'])
+    ]
+
     # Kill Participation avec tooltip expliquant le calcul
-    if 'KP' in df.columns:
-        # Stocker les valeurs brutes pour le calcul
-        df['player_contribution'] = df.apply(
-            lambda row: int(row['CHAMPIONS_KILLED']) + int(row['ASSISTS']),
-            axis=1
+    display_df['KP'] = [
+        f"<span title='Calcul: {int(contribution)} (kills+assists) ÷ {int(team_kills)} kills équipe = {kp:.1f}%'>{kp:.1f}%</span>"
+        for contribution, team_kills, kp in zip(history['contribution'], history['team_kills'], history['KP'])
+    ]
+
+    # CS/MIN with tooltip, color classes and star for excellent values
+    display_df['CS/MIN'] = [
+        f"<span class='{cs_class}' title='Calcul: {int(creep_score)} cs ÷ {duration / 60000:.1f} minutes = {cs:.1f}'>{cs:.1f}{' ⭐' if cs >= 9 else ''}</span>"
+        for cs, cs_class, creep_score, duration in zip(
+            history['cs_per_min'], history['cs_class'], history['creep_score'], history['duration']
         )
-        
-        # Créer le tooltip avec explication du calcul
-        display_df['KP'] = df.apply(
-            lambda row: f"<span title='Calcul: {int(row['player_contribution'])} (kills+assists) ÷ {int(row['player_contribution']/row['KP']*100 if row['KP'] > 0 else 0)} kills équipe = {float(row['KP']):.1f}%'>{float(row['KP']):.1f}%</span>",
-            axis=1
+    ]
+
+    # VISION: score (wards utiles/achetées) et efficacité
+    display_df['VISION'] = [
+        format_vision_data(vision_score, useful, bought, efficiency, vision_class)
+        for vision_score, useful, bought, efficiency, vision_class in zip(
+            history['vision_score'], history['useful_wards'], history['bought_wards'],
+            history['vision_efficiency'], history['vision_class']
         )
-    
-    # CS/MIN with tooltip, updated color classes and star for excellent values
-    display_df['CS/MIN'] = df.apply(
-        lambda row: f"<span class='{get_cs_class(row['cs_per_min'])}' title='Calcul: {int(row['Missions_CreepScore'])} cs ÷ {(float(row['gameDuration'])/60000):.1f} minutes = {row['cs_per_min']:.1f}'>{row['cs_per_min']:.1f}{' ⭐' if float(row['cs_per_min']) >= 9 else ''}</span>",
-        axis=1
-    )
-    
-    # VISION: utiliser la colonne formatée sans ajouter CONTROL WARDS
-    display_df['VISION'] = df['VISION_FORMATTED']
-    
+    ]
+
     # Gold efficiency with tooltip showing calculation details
-    display_df['GOLD EFF'] = df.apply(
-        lambda row: f"<span class='{get_gold_efficiency_class(float(row['gold_efficiency']))}' title='Calcul: {int(max(0, row['dmg_dealt'])):,} dégâts ÷ {int(max(1, row['gold'])):,} or = {float(row['gold_efficiency']):.2f} dégâts par 1000 or'>{float(row['gold_efficiency']):.1f}</span>",
-        axis=1
-    )
-    
-    # Prepare HTML table with tooltips
+    display_df['GOLD EFF'] = [
+        f"<span class='{gold_class}' title='Calcul: {int(max(0, damage)):,} dégâts ÷ {int(max(1, gold)):,} or = {efficiency:.2f} dégâts par 1000 or'>{efficiency:.1f}</span>"
+        for efficiency, gold_class, damage, gold in zip(
+            history['gold_efficiency'], history['gold_class'], history['damage'], history['gold']
+        )
+    ]
+
     html_table = display_df.to_html(escape=False, index=False)
-    
-    # Add tooltips to headers - removing CONTROL WARDS tooltip
-    tooltips = {
-        "<th>KDA</th>": "<th title='Kills+Assists / Deaths - Score d&#39;efficacité combative'>KDA</th>",
-        "<th>CS/MIN</th>": "<th title='Creep Score par minute - Mesure l&#39;efficacité du farming'>CS/MIN</th>",
-        "<th>KP</th>": "<th title='Kill Participation - % de participation aux éliminations de l&#39;équipe'>KP</th>",
-        "<th>VISION</th>": "<th title='Score de vision (Efficacité en % = wards utiles/wards achetées)'>VISION</th>",
-        "<th>GOLD EFF</th>": "<th title='Dégâts infligés par 1000 or - Mesure l&#39;efficacité de l&#39;or dépensé'>GOLD EFF</th>",
-    }
-    
-    for original, tooltipped in tooltips.items():
+    for original, tooltipped in HISTORY_HEADER_TOOLTIPS.items():
         html_table = html_table.replace(original, tooltipped)
-    
-    st.markdown(html_table, unsafe_allow_html=True)
+    return html_table
 
-# Fonction pour calculer le KDA numérique à partir de la chaîne KDA
-def calculate_kda_from_string(kda_str):
-    """Calculate KDA score from a string in the format 'kills/deaths/assists'"""
-    try:
-        parts = kda_str.split('/')
-        kills = float(parts[0])
-        deaths = float(parts[1])
-        assists = float(parts[2])
-        return (kills + assists) / max(1, deaths)  # Avoid division by zero
-    except (IndexError, ValueError):
-        return 0
+def _set_history_page(page_key: str, page: int):
+    st.session_state[page_key] = page
+
+@st.fragment
+def display_match_history(history: pd.DataFrame, key: str = "match_history"):
+    """Display one page of a prepared match history.
+
+    Runs as a fragment: changing page only reruns this function, which slices
+    the already prepared history and renders the visible rows.
+    """
+    page_key = f"{key}_page"
+    page_size = st.selectbox(
+        "Parties par page",
+        HISTORY_PAGE_SIZES,
+        index=1,
+        key=f"{key}_page_size",
+        on_change=_set_history_page,
+        args=(page_key, 0)
+    )
+    page_count = max(1, -(-len(history) // page_size))
+    page = min(st.session_state.get(page_key, 0), page_count - 1)
+    start = page * page_size
+
+    page_rows = history.iloc[start:start + page_size]
+    page_html = cached_html('match_history_page', page_rows, lambda: render_match_history(page_rows))
+    st.markdown(page_html, unsafe_allow_html=True)
+
+    if page_count > 1:
+        prev_col, info_col, next_col = st.columns([1, 4, 1])
+        with prev_col:
+            st.button("◀", key=f"{key}_prev", disabled=page == 0,
+                      on_click=_set_history_page, args=(page_key, page - 1))
+        with info_col:
+            st.caption(f"Page {page + 1} / {page_count} · parties {start + 1}-{min(start + page_size, len(history))} sur {len(history)}")
+        with next_col:
+            st.button("▶", key=f"{key}_next", disabled=page >= page_count - 1,
+                      on_click=_set_history_page, args=(page_key, page + 1))
 
 # Function to determine CSS class based on KDA - updated with pastel colors and new thresholds
 def get_kda_class(value):
@@ -315,18 +486,6 @@ def get_vision_class(value):
     if value >= 30: return 'color-medium'   # Orange for medium vision (30-50%)
     return 'color-low'                      # Red for poor vision (<30%)
 
-# Function to determine CSS class based on CS/min with added star for excellent values
-def get_cs_class(value):
-    """Return color class based on CS per minute."""
-    try:
-        value = float(value)
-        if value >= 9: return 'color-high'      # Gold + star for excellent CS (9+)
-        if value >= 8: return 'color-good'      # Green for good CS (8-9)
-        if value >= 6: return 'color-medium'    # Orange for okay CS (6-8)
-        return 'color-low'                      # Red for poor CS (<6)
-    except (ValueError, TypeError):
-        return 'color-low'
-
 # Get CSS class for winrate
 def get_wr_class(value):
     """Return color class based on winrate percentage."""
@@ -348,34 +507,12 @@ def get_color_class(value: float, thresholds: dict) -> str:
         return 'color-medium'  # Orange for medium values
     return 'color-low'         # Red for low values
 
-def display_champion_stats(df: pd.DataFrame):
-    """Display the champion statistics table."""
-    champion_stats = {}
-    
-    for champ in df['SKIN'].unique():
-        champ_data = df[df['SKIN'] == champ]
-        games = len(champ_data)
-        wins = len(champ_data[champ_data['Win'] == 'Win'])
-        
-        # Calculate KDA
-        kda_parts = champ_data['KDA'].str.split('/', expand=True)
-        kills = kda_parts[0].astype(float).mean()
-        deaths = kda_parts[1].astype(float).mean()
-        assists = kda_parts[2].astype(float).mean()
-        kda = (kills + assists) / max(1, deaths)
-        
-        # Calculate KP
-        kp = champ_data['KP'].astype(float).mean()
-        
-        champion_stats[champ] = {
-            'name': format_champion_name(champ),
-            'icon_url': get_champion_icon_url(champ),
-            'games': games,
-            'winrate': (wins / games) * 100,
-            'kda': kda,
-            'kp': kp
-        }
-    
+def display_champion_stats(champion_stats: pd.DataFrame):
+    """Display the champion statistics table (champion_stats from analyzer.get_player_champions, sorted by games)."""
+    table_html = cached_html('champion_table', champion_stats, lambda: render_champion_table(champion_stats))
+    st.write(table_html, unsafe_allow_html=True)
+
+def render_champion_table(champion_stats: pd.DataFrame) -> str:
     # Define thresholds for colors with new tiers
     thresholds = {
         'winrate': {'high': 60, 'good': 50, 'medium': 0},  # Updated thresholds for winrate
@@ -383,52 +520,34 @@ def display_champion_stats(df: pd.DataFrame):
         'kp': {'high': 70, 'good': 60, 'medium': 50}
     }
     
-    # Convert to DataFrame for display
+    # Convert to DataFrame for display (one row per champion, already sorted by games)
     display_df = pd.DataFrame()
     display_df['CHAMPION'] = [
-        f'<img src="{stats["icon_url"]}" width="30" height="30"> {stats["name"]}' 
-        for stats in champion_stats.values()
+        f'{champion_icon_html(champ, 30)} {format_champion_name(champ)}'
+        for champ in champion_stats.index
     ]
-    display_df['GAMES'] = [stats['games'] for stats in champion_stats.values()]
+    display_df['GAMES'] = champion_stats['games'].to_numpy()
     display_df['WR'] = [
-        f'<span class="{get_wr_class(stats["winrate"])}">{stats["winrate"]:.1f}%</span>'
-        for stats in champion_stats.values()
+        f'<span class="{get_wr_class(winrate)}">{winrate:.1f}%</span>'
+        for winrate in champion_stats['winrate']
     ]
     display_df['KDA'] = [
-        f'<span class="{get_kda_class(stats["kda"])}">{stats["kda"]:.2f}</span>'
-        for stats in champion_stats.values()
+        f'<span class="{get_kda_class(kda)}">{kda:.2f}</span>'
+        for kda in champion_stats['kda']
     ]
     display_df['KP'] = [
-        f'<span class="{get_color_class(stats["kp"], thresholds["kp"])}">{stats["kp"]:.1f}%</span>'
-        for stats in champion_stats.values()
+        f'<span class="{get_color_class(kp, thresholds["kp"])}">{kp:.1f}%</span>'
+        for kp in champion_stats['kp']
     ]
-    
-    # Sort by number of games
-    display_df = display_df.sort_values('GAMES', ascending=False)
-    
-    # Display table
-    st.write(
-        display_df.to_html(escape=False, index=False),
-        unsafe_allow_html=True
-    )
+
+    return display_df.to_html(escape=False, index=False)
 
 # Nouvelle fonction simplifiée pour formater les données de vision
-def format_vision_data(vision_score, useful_wards, bought_wards, efficiency_pct):
+def format_vision_data(vision_score, useful_wards, bought_wards, efficiency_pct, vision_class=None):
     """Format vision data into a string with efficiency percentage"""
     if bought_wards > 0:
+        vision_class = vision_class or get_vision_class(efficiency_pct)
         tooltip = f"Wards utiles: {useful_wards}, Wards achetées: {bought_wards}, Ratio: {useful_wards}/{bought_wards} = {efficiency_pct:.0f}%"
-        return f"{vision_score} ({useful_wards}/{bought_wards}) <span title='{tooltip}' class='{get_vision_class(efficiency_pct)}'>{efficiency_pct:.0f}%</span>"
+        return f"{vision_score} ({useful_wards}/{bought_wards}) <span title='{tooltip}' class='{vision_class}'>{efficiency_pct:.0f}%</span>"
     else:
         return f"{vision_score} (0/0) <span class='color-low'>0%</span>"
-
-# Function to determine CSS class based on gold efficiency
-def get_gold_efficiency_class(value):
-    """Return color class based on damage per 1000 gold."""
-    try:
-        value = float(value)  
-        if value >= 1600: return 'color-high'     # Gold for excellent ratio (>1600)
-        if value >= 1300: return 'color-good'     # Green for good ratio (1300-1600)
-        if value >= 1000: return 'color-medium'   # Orange for okay ratio (1000-1300)
-        return 'color-low'                        # Red for poor ratio (<1000)
-    except (ValueError, TypeError):
-        return 'color-low'                        # Default if conversion fails
\ No newline at end of file
@@ -1,23 +1,13 @@
+import pandas as pd
 import streamlit as st
+from data_processing.patches import compare_patches, sort_patches
+from utils.champion_assets import emit_atlas_css
+from utils.formatters import champion_sprite_html, get_champion_icon_url
+from utils.html_cache import cached_html, emit_css
+from utils.timing import span
 
-# Ajouter cette fonction de tri en haut du fichier
-def get_role_order(role):
-    role_order = {
-        'TOP': 1,
-        'JUNGLE': 2,
-        'MID': 3,
-        'ADC': 4,
-        'SUPPORT': 5
-    }
-    return role_order.get(role, 99)
-
-def display_global_stats(analyzer, game_type: str = "Global"):
-    stats = analyzer.get_global_stats(game_type)  # Modifier cette fonction pour filtrer selon le type
-    #print("Debug - Stats structure:", stats)  # Pour débugger
-
-    # Style CSS mis à jour
-    st.markdown("""
-        <style>
+# Style CSS des statistiques globales
+GLOBAL_STATS_CSS = """
         .overview-title {
             color: #8890A0;
             font-size: 14px;
@@ -186,11 +176,55 @@ def display_global_stats(analyzer, game_type: str = "Global"):
             margin-bottom: 20px;
             text-transform: uppercase;
         }
-        </style>
-    """, unsafe_allow_html=True)
+"""
+
+# Ajouter cette fonction de tri en haut du fichier
+def get_role_order(role):
+    role_order = {
+        'TOP': 1,
+        'JUNGLE': 2,
+        'MID': 3,
+        'ADC': 4,
+        'SUPPORT': 5
+    }
+    return role_order.get(role, 99)
+
+def display_global_stats(analyzer, game_type: str = "Global", filters: dict = None):
+    stats = analyzer.get_global_stats(game_type, **(filters or {}))
+    #print("Debug - Stats structure:", stats)  # Pour débugger
+
+    with span("global.css"):
+        display_global_css()
+    with span("global.overview"):
+        display_overview(stats)
+    with span("global.champions"):
+        has_champions = display_champions_played(stats)
+    if not has_champions:
+        return
+    with span("global.players"):
+        display_players_overview(stats)
+    with span("global.patches"):
+        display_patch_comparison(analyzer, game_type, filters)
+
+def display_global_css():
+    # Style CSS mis à jour (construit une fois par process, identique à chaque rerun)
+    emit_css('global_stats', lambda: GLOBAL_STATS_CSS)
+    emit_atlas_css()
+
+# Clés des stats globales utilisées par la carte Overview
+OVERVIEW_KEYS = [
+    'total_games', 'wins', 'losses', 'winrate',
+    'blue_side_games', 'blue_side_wins', 'blue_side_winrate',
+    'red_side_games', 'red_side_wins', 'red_side_winrate',
+]
+
+def display_overview(stats: dict):
+    # Section Overview (HTML réutilisé tant que les chiffres ne changent pas)
+    overview = {key: stats[key] for key in OVERVIEW_KEYS}
+    st.markdown(cached_html('overview', overview, lambda: render_overview(overview)), unsafe_allow_html=True)
 
-    # Section Overview
-    overview_html = f"""
+def render_overview(stats: dict) -> str:
+    return f"""
     <div class="stats-container">
         <div class="stats-overview">
             <div class="overview-title">2025 OVERVIEW</div>
@@ -218,14 +252,14 @@ def display_global_stats(analyzer, game_type: str = "Global"):
         </div>
     </div>
     """
-    st.markdown(overview_html, unsafe_allow_html=True)
 
+def display_champions_played(stats: dict) -> bool:
     # Section Champions joués
     try:
         champion_stats = stats.get('champion_stats', {})
         if not champion_stats:
             st.warning("No champion data available")
-            return
+            return False
 
         # Créer un conteneur HTML avec st.container()
         with st.container():
@@ -255,14 +289,27 @@ def display_global_stats(analyzer, game_type: str = "Global"):
                 with current_cols[col_idx]:
                     games = data.get('games', 0)
                     wins = data.get('wins', 0)
-                    winrate = (wins / games * 100) if games > 0 else 0
-                    winrate_class = "winrate-high" if winrate >= 50 else "winrate-low"
-                    
-                    champion_card = f"""
-                    <div class="champion-card">
-                        <img src="https://ddragon.leagueoflegends.com/cdn/15.11.1/img/champion/{champion}.png" 
+                    champion_card = cached_html(
+                        'champion_card', (champion, games, wins),
+                        lambda: render_champion_card(champion, games, wins)
+                    )
+                    st.markdown(champion_card, unsafe_allow_html=True)
+
+    except Exception as e:
+        st.error(f"Error displaying champions: {str(e)}")
+
+    return True
+
+def render_champion_card(champion: str, games: int, wins: int) -> str:
+    winrate = (wins / games * 100) if games > 0 else 0
+    winrate_class = "winrate-high" if winrate >= 50 else "winrate-low"
+    icon = champion_sprite_html(champion, 48, "champion-icon") or f"""<img src="{get_champion_icon_url(champion)}" 
                              class="champion-icon" 
-                             onerror="this.onerror=null; this.src='https://raw.communitydragon.org/latest/plugins/rcp-be-lol-game-data/global/default/v1/champion-icons/-1.png';">
+                             onerror="this.onerror=null; this.src='https://raw.communitydragon.org/latest/plugins/rcp-be-lol-game-data/global/default/v1/champion-icons/-1.png';">"""
+
+    return f"""
+                    <div class="champion-card">
+                        {icon}
                         <div class="champion-info">
                             <div class="champion-name">{champion}</div>
                             <div class="champion-games">{games} games</div>
@@ -270,11 +317,8 @@ def display_global_stats(analyzer, game_type: str = "Global"):
                         </div>
                     </div>
                     """
-                    st.markdown(champion_card, unsafe_allow_html=True)
-
-    except Exception as e:
-        st.error(f"Error displaying champions: {str(e)}")
 
+def display_players_overview(stats: dict):
     # Ajouter le séparateur and le titre avant la section des joueurs
     st.markdown('<div class="section-divider"></div>', unsafe_allow_html=True)
     st.markdown('<div class="player-overview-title">PLAYERS OVERVIEW</div>', unsafe_allow_html=True)
@@ -286,21 +330,82 @@ def display_global_stats(analyzer, game_type: str = "Global"):
         key=lambda x: get_role_order(x[1]['role'])
     )
 
-    # Afficher les joueurs dans l'ordre
+    # Afficher les joueurs dans l'ordre (HTML réutilisé tant que les stats du joueur ne changent pas)
     for player_name, player_data in sorted_players:
-        role_mapping = {
-            'TOP': 'top',
-            'JUNGLE': 'jungle',
-            'MID': 'middle',
-            'ADC': 'bottom',
-            'SUPPORT': 'utility'
-        }
-        
-        role_icon = role_mapping.get(player_data['role'], 'unknown')
-        vision_per_min = player_data['vision_per_min'] if player_data['games'] > 0 else 0
-        
-        # Remplacer le template player_card par :
-        player_card = f"""
+        player_card = cached_html(
+            'player_card', (player_name, player_data),
+            lambda: render_player_card(player_name, player_data)
+        )
+        st.markdown(player_card, unsafe_allow_html=True)
+
+def display_patch_comparison(analyzer, game_type: str = "Global", filters: dict = None):
+    # Section Comparaison de patchs : les tableaux par patch sont calculés une fois
+    # (cache de l'analyzer), changer de patch ne fait que sélectionner leurs lignes
+    patch_filters = {name: value for name, value in (filters or {}).items() if name != 'patch'}
+    champion_stats = analyzer.get_patch_stats("champion", None, game_type, **patch_filters)
+    patches = sort_patches(champion_stats.index.get_level_values('patch').unique())
+
+    st.markdown('<div class="section-divider"></div>', unsafe_allow_html=True)
+    st.markdown('<div class="player-overview-title">PATCH COMPARISON</div>', unsafe_allow_html=True)
+    if len(patches) < 2:
+        st.info("Au moins deux patchs sont nécessaires pour la comparaison")
+        return
+
+    cols = st.columns(2)
+    with cols[0]:
+        base = st.selectbox("Patch de référence", patches, index=len(patches) - 2, key="patch_base_selector")
+    with cols[1]:
+        target = st.selectbox("Patch comparé", patches, index=len(patches) - 1, key="patch_target_selector")
+    if base == target:
+        st.info("Choisissez deux patchs différents")
+        return
+
+    player_stats = analyzer.get_patch_stats("player", None, game_type, **patch_filters)
+    display_patch_table(compare_patches(champion_stats, base, target), base, target, "Champion")
+    display_patch_table(compare_patches(player_stats, base, target), base, target, "Joueur")
+
+def display_patch_table(comparison: pd.DataFrame, base: str, target: str, label: str):
+    """Display a compare_patches table with per-patch columns and coloured deltas."""
+    table = comparison.rename_axis(label).rename(columns={
+        'games_base': f"Games {base}", 'games_target': f"Games {target}",
+        'winrate_base': f"WR {base}", 'winrate_target': f"WR {target}", 'winrate_delta': "Δ WR",
+        'kda_base': f"KDA {base}", 'kda_target': f"KDA {target}", 'kda_delta': "Δ KDA",
+    })
+    winrates = [f"WR {base}", f"WR {target}", "Δ WR"]
+    kdas = [f"KDA {base}", f"KDA {target}", "Δ KDA"]
+    styled = (
+        table.style
+        .format("{:.1f}%", subset=winrates, na_rep="-")
+        .format("{:.2f}", subset=kdas, na_rep="-")
+        .map(delta_color, subset=["Δ WR", "Δ KDA"])
+    )
+    st.dataframe(styled, use_container_width=True)
+
+def delta_color(value) -> str:
+    if pd.isna(value) or value == 0:
+        return ""
+    return "color: #2ECC71" if value > 0 else "color: #E74C3C"
+
+def champion_mini_icon(champion: str) -> str:
+    sprite = champion_sprite_html(champion, 32, "champion-mini-icon", champion)
+    if sprite is not None:
+        return sprite
+    return f'<img src="{get_champion_icon_url(champion)}" class="champion-mini-icon" title="{champion}">'
+
+def render_player_card(player_name: str, player_data: dict) -> str:
+    role_mapping = {
+        'TOP': 'top',
+        'JUNGLE': 'jungle',
+        'MID': 'middle',
+        'ADC': 'bottom',
+        'SUPPORT': 'utility'
+    }
+    
+    role_icon = role_mapping.get(player_data['role'], 'unknown')
+    vision_per_min = player_data['vision_per_min'] if player_data['games'] > 0 else 0
+    
+    # Remplacer le template player_card par :
+    return f"""
 <div class="player-overview-card">
     <img src="https://raw.communitydragon.org/latest/plugins/rcp-fe-lol-honor/global/default/assets/roleicon_{role_icon}.png" 
          class="role-icon">
@@ -327,13 +432,11 @@ def display_global_stats(analyzer, game_type: str = "Global"):
         </div>
     </div>
     <div class="player-champions-list">
-        {''.join([f'<div class="champion-mini-container"><img src="https://ddragon.leagueoflegends.com/cdn/15.11.1/img/champion/{champ}.png" class="champion-mini-icon" title="{champ}"><span class="champion-play-count">{count}</span></div>' 
+        {''.join([f'<div class="champion-mini-container">{champion_mini_icon(champ)}<span class="champion-play-count">{count}</span></div>' 
                  for champ, count in sorted(player_data['champion_counts'].items(), 
                                          key=lambda x: (-x[1], x[0]))])}
     </div>
 </div>"""
-        
-        st.markdown(player_card, unsafe_allow_html=True)
 
 def display_player_stats(analyzer, player_name):
     stats = analyzer.get_player_stats(player_name)
@@ -429,7 +532,7 @@ def display_player_stats(analyzer, player_name):
                         
                         champion_card = f"""
                         <div class="champion-card">
-                            <img src="https://ddragon.leagueoflegends.com/cdn/15.11.1/img/champion/{champion}.png" 
+                            <img src="{get_champion_icon_url(champion)}" 
                                  class="champion-icon" 
                                  onerror="this.onerror=null; this.src='https://raw.communitydragon.org/latest/plugins/rcp-be-lol-game-data/global/default/v1/champion-icons/-1.png';">
                             <div class="champion-info">
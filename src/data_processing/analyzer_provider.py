@@ -0,0 +1,57 @@
+import hashlib
+import os
+import threading
+from typing import Dict, Tuple
+
+from data_processing.stats_analyzer import StatsAnalyzer
+from utils.timing import span
+
+# Un seul analyzer par dossier de données, partagé par toutes les sessions
+# et tous les reruns du serveur Streamlit (le module reste dans sys.modules).
+_lock = threading.Lock()
+_analyzers: Dict[str, Tuple[str, StatsAnalyzer]] = {}
+
+
+def compute_data_fingerprint(data_path: str) -> str:
+    """Calcule une empreinte du dossier à partir des noms, mtimes et tailles des fichiers JSON."""
+    entries = []
+    with os.scandir(data_path) as it:
+        for entry in it:
+            # Même sélection que glob("*.json") : les fichiers cachés sont ignorés
+            if entry.name.startswith('.') or not entry.name.endswith('.json'):
+                continue
+            if not entry.is_file():
+                continue
+            stat = entry.stat()
+            entries.append(f"{entry.name}:{stat.st_mtime_ns}:{stat.st_size}")
+    entries.sort()
+    return hashlib.sha1("\n".join(entries).encode('utf-8')).hexdigest()
+
+
+def get_analyzer(data_path: str) -> StatsAnalyzer:
+    """Retourne l'analyzer partagé pour ce dossier.
+
+    Quand l'empreinte change, l'analyzer existant est mis à jour via refresh()
+    (seuls les fichiers ajoutés ou modifiés sont relus) au lieu d'être reconstruit.
+    """
+    key = os.path.abspath(data_path)
+    with span("ingest.fingerprint"):
+        fingerprint = compute_data_fingerprint(key)
+    with _lock:
+        cached = _analyzers.get(key)
+        if cached is not None and cached[0] == fingerprint:
+            return cached[1]
+        if cached is not None:
+            analyzer = cached[1]
+            analyzer.refresh()
+        else:
+            with span("ingest.startup"):
+                analyzer = StatsAnalyzer(data_path)
+        _analyzers[key] = (fingerprint, analyzer)
+        return analyzer
+
+
+def clear_analyzers():
+    """Oublie tous les analyzers en cache (utile pour forcer un rechargement)."""
+    with _lock:
+        _analyzers.clear()
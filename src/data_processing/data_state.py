@@ -0,0 +1,96 @@
+"""État des données d'un StatsAnalyzer, publié d'un bloc à chaque refresh.
+
+Un DataState regroupe tout ce qui décrit une version des données : table des
+participants, index du roster et des filtres, manifeste d'ingestion, et les
+structures dérivées construites à la première requête (rollups, séries de
+forme, kills d'équipe). refresh() construit l'état suivant sans
+modifier l'état courant (les index sont copiés avant d'être complétés) puis
+le publie en une seule affectation : une requête lit l'état une fois et ne
+voit jamais un mélange de deux versions, même si un refresh la croise.
+"""
+import copy
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from data_processing.filters import FilterIndex, GameFilter
+from data_processing.ingest import games_from_table
+from data_processing.manifest import IngestManifest
+from data_processing.rollups import Rollups
+from data_processing.roster import RosterIndex
+from data_processing.sql_store import SqlStore
+from data_processing.trends import TrendEngine, player_game_rows
+from utils.timing import span
+
+
+class DataState:
+    """Une version des données ; en mode SQLite, participants et index sont None (les requêtes vont à la base)."""
+
+    def __init__(self, manifest: IngestManifest, data_version: int = 0,
+                 participants: Optional[pd.DataFrame] = None, roster_index: Optional[RosterIndex] = None,
+                 filter_index: Optional[FilterIndex] = None, store: Optional[SqlStore] = None,
+                 extra_fields: Optional[Dict[str, str]] = None, rollups: Optional[Rollups] = None,
+                 trends: Optional[TrendEngine] = None):
+        self.manifest = manifest
+        self.data_version = data_version
+        self.participants = participants
+        self.roster_index = roster_index
+        self.filter_index = filter_index
+        self.store = store
+        self.extra_fields = dict(extra_fields or {})
+        # Construits à la première requête qui en a besoin (None = à reconstruire) ; refresh()
+        # transmet ceux de l'état précédent, déjà complétés des nouvelles parties
+        self._rollups = rollups
+        if rollups is not None:
+            rollups.row_source = self.filter_rows
+        self._trends = trends
+        self._team_kills: Optional[pd.Series] = None
+
+    def with_manifest(self, manifest: IngestManifest) -> 'DataState':
+        """Mêmes données avec un autre manifeste (fichiers touchés sans changement de contenu)."""
+        state = copy.copy(self)
+        state.manifest = manifest
+        return state
+
+    def table(self) -> pd.DataFrame:
+        """Table des participants, relue depuis la base en mode SQLite."""
+        return self.store.table() if self.store is not None else self.participants
+
+    def matches(self) -> List[Dict]:
+        """Parties de la table, reconstruites à chaque appel (voir ingest.games_from_table) : la table
+        seule est gardée en mémoire."""
+        return games_from_table(self.table(), self.extra_fields)
+
+    @property
+    def rollups(self) -> Rollups:
+        """Rollups de la table (voir data_processing.rollups), qui répondent aux requêtes de stats."""
+        if self._rollups is None:
+            with span("analyzer.build_rollups"):
+                self._rollups = Rollups(self.participants, self.filter_rows)
+        return self._rollups
+
+    @property
+    def trends(self) -> TrendEngine:
+        """Moteur de tendances (moyennes glissantes et exponentielles) de chaque joueur."""
+        if self._trends is None:
+            with span("analyzer.build_trends"):
+                self._trends = TrendEngine(player_game_rows(self.table()))
+        return self._trends
+
+    def team_kills(self) -> pd.Series:
+        """Kills d'équipe (joueurs du roster) par partie, en un groupby par version des données."""
+        if self._team_kills is None:
+            participants = self.participants
+            roster_kills = participants['CHAMPIONS_KILLED'].astype('int64').where(participants['player'].notna(), 0)
+            self._team_kills = roster_kills.groupby(participants['game_key'].astype(str), sort=False).sum()
+        return self._team_kills
+
+    def filter_rows(self, game_filter: GameFilter, rows: Optional[np.ndarray] = None) -> pd.DataFrame:
+        """Retourne les lignes participants qui passent le filtre (parmi `rows` si fourni)."""
+        selected = self.filter_index.select(game_filter)
+        if selected is None:
+            return self.participants if rows is None else self.participants.iloc[rows]
+        if rows is not None:
+            selected = np.intersect1d(selected, rows, assume_unique=True)
+        return self.participants.iloc[selected]
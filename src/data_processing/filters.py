@@ -0,0 +1,113 @@
+"""Filtres de parties et index de partitions construits au chargement."""
+import datetime
+from dataclasses import dataclass
+from functools import reduce
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from data_processing.indexing import EMPTY_ROWS, PositionIndex
+
+GAME_TYPES = ["Global", "Scrim", "Tournoi"]
+
+
+@dataclass(frozen=True)
+class GameFilter:
+    """Critères de sélection des parties ; None = pas de contrainte."""
+    game_type: str = "Global"
+    opponent: Optional[str] = None
+    tournament: Optional[str] = None
+    date_from: Optional[datetime.date] = None
+    date_to: Optional[datetime.date] = None
+    patch: Optional[str] = None
+    squad: Optional[str] = None
+
+
+class FilterIndex:
+    """Positions triées des lignes par type de partie, adversaire, tournoi, date, patch et équipe.
+
+    Une combinaison quelconque de filtres se résout par intersection des
+    partitions concernées, sans parcourir la table.
+    """
+
+    # Colonne de la table indexée pour chaque critère de GameFilter
+    COLUMNS = {
+        'game_type': 'type_partie',
+        'opponent': 'equipe_adverse',
+        'tournament': 'nom_tournoi',
+        'patch': 'patch',
+        'date': 'date',
+        'squad': 'squad',
+    }
+
+    def __init__(self, table: pd.DataFrame):
+        self._partitions: Dict[str, PositionIndex] = {column: PositionIndex() for column in self.COLUMNS.values()}
+        self._dates: Dict[str, Optional[datetime.date]] = {}
+        self.extend(table)
+
+    def extend(self, rows: pd.DataFrame, offset: int = 0):
+        """Indexe des lignes ajoutées en fin de table (offset = position de la première)."""
+        for column, partition in self._partitions.items():
+            partition.extend(rows[column], offset=offset)
+        for key in self._partitions['date'].keys():
+            if key not in self._dates:
+                self._dates[key] = _parse_date(key)
+
+    def copy(self) -> 'FilterIndex':
+        """Copie que extend() complète sans toucher à l'index d'origine."""
+        clone = FilterIndex.__new__(FilterIndex)
+        clone._partitions = {column: partition.copy() for column, partition in self._partitions.items()}
+        clone._dates = dict(self._dates)
+        return clone
+
+    def select(self, game_filter: GameFilter) -> Optional[np.ndarray]:
+        """Positions des lignes qui passent le filtre, ou None si aucun critère n'est actif."""
+        selections: List[np.ndarray] = []
+        if game_filter.game_type not in (None, "Global"):
+            selections.append(self._partitions['type_partie'].get(game_filter.game_type))
+        if game_filter.opponent:
+            selections.append(self._partitions['equipe_adverse'].get(game_filter.opponent))
+        if game_filter.tournament:
+            selections.append(self._partitions['nom_tournoi'].get(game_filter.tournament))
+        if game_filter.patch:
+            selections.append(self._partitions['patch'].get(game_filter.patch))
+        if game_filter.squad:
+            selections.append(self._partitions['squad'].get(game_filter.squad))
+        if game_filter.date_from or game_filter.date_to:
+            selections.append(self._date_rows(game_filter.date_from, game_filter.date_to))
+        if not selections:
+            return None
+        # Intersection en partant de la plus petite partition
+        selections.sort(key=len)
+        return reduce(lambda left, right: np.intersect1d(left, right, assume_unique=True), selections)
+
+    def values(self, criterion: str) -> List[str]:
+        """Valeurs disponibles pour un critère ('opponent', 'tournament', 'patch'...)."""
+        return sorted(self._partitions[self.COLUMNS[criterion]].keys())
+
+    def date_range(self) -> Tuple[Optional[datetime.date], Optional[datetime.date]]:
+        dates = [d for d in self._dates.values() if d is not None]
+        if not dates:
+            return None, None
+        return min(dates), max(dates)
+
+    def _date_rows(self, date_from: Optional[datetime.date], date_to: Optional[datetime.date]) -> np.ndarray:
+        chunks = [
+            self._partitions['date'].get(key)
+            for key, day in self._dates.items()
+            if day is not None
+            and (date_from is None or day >= date_from)
+            and (date_to is None or day <= date_to)
+        ]
+        if not chunks:
+            return EMPTY_ROWS
+        return np.sort(np.concatenate(chunks))
+
+
+def _parse_date(value: str) -> Optional[datetime.date]:
+    """Convertit une date de nom de fichier (ddmmyyyy)."""
+    try:
+        return datetime.datetime.strptime(value, '%d%m%Y').date()
+    except ValueError:
+        return None
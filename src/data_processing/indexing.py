@@ -0,0 +1,60 @@
+"""Index de positions de lignes par valeur de colonne catégorielle."""
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+EMPTY_ROWS = np.array([], dtype=np.intp)
+
+
+def group_positions(column: pd.Series, mask: Optional[np.ndarray] = None,
+                    offset: int = 0) -> List[Tuple[str, np.ndarray]]:
+    """Regroupe les positions (triées) par valeur d'une colonne catégorielle.
+
+    Tri stable sur les codes, sans passer par des chaînes ; les valeurs
+    manquantes sont ignorées, ainsi que les lignes hors mask.
+    """
+    codes = column.cat.codes.to_numpy()
+    positions = np.arange(len(codes)) + offset
+    keep = codes >= 0
+    if mask is not None:
+        keep &= mask
+    codes, positions = codes[keep], positions[keep]
+    if len(codes) == 0:
+        return []
+    categories = list(column.cat.categories)
+    order = np.argsort(codes, kind='stable')
+    bounds = np.flatnonzero(np.diff(codes[order])) + 1
+    return [
+        (str(categories[codes[chunk[0]]]), positions[chunk])
+        for chunk in np.split(order, bounds)
+    ]
+
+
+class PositionIndex:
+    """Positions triées des lignes pour chaque valeur d'une colonne, complétables par ajout en fin de table."""
+
+    def __init__(self):
+        self._positions: Dict[str, np.ndarray] = {}
+
+    def extend(self, column: pd.Series, mask: Optional[np.ndarray] = None, offset: int = 0):
+        for key, positions in group_positions(column, mask, offset):
+            if key in self._positions:
+                self._positions[key] = np.concatenate([self._positions[key], positions])
+            else:
+                self._positions[key] = positions
+
+    def copy(self) -> 'PositionIndex':
+        """Copie indépendante : les tableaux ne sont jamais modifiés sur place, seul le dict est copié."""
+        clone = PositionIndex()
+        clone._positions = dict(self._positions)
+        return clone
+
+    def get(self, key: str) -> np.ndarray:
+        return self._positions.get(key, EMPTY_ROWS)
+
+    def keys(self) -> List[str]:
+        return list(self._positions)
+
+    def items(self):
+        return self._positions.items()
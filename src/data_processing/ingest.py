@@ -0,0 +1,312 @@
+"""Ingestion des parties : construit une table colonnaire typée, une ligne par participant."""
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from data_processing.indexing import group_positions
+from data_processing.roster import Roster
+
+# Statistiques numériques des participants et leur type compact.
+# Les valeurs brutes sont des chaînes ("6", "13000") ou None.
+NUMERIC_FIELDS: Dict[str, str] = {
+    'CHAMPIONS_KILLED': 'int16',
+    'NUM_DEATHS': 'int16',
+    'ASSISTS': 'int16',
+    'Missions_CreepScore': 'int16',
+    'MINIONS_KILLED': 'int16',
+    'NEUTRAL_MINIONS_KILLED': 'int16',
+    'VISION_SCORE': 'int16',
+    'WARD_PLACED': 'int16',
+    'WARD_KILLED': 'int16',
+    'Missions_PlaceUsefulControlWards': 'int16',
+    'VISION_WARDS_BOUGHT_IN_GAME': 'int16',
+    'LEVEL': 'int8',
+    'TEAM': 'int16',
+    'GOLD_EARNED': 'int32',
+    'GOLD_SPENT': 'int32',
+    'TOTAL_DAMAGE_DEALT_TO_CHAMPIONS': 'int32',
+    'TOTAL_DAMAGE_TAKEN': 'int32',
+}
+
+# Valeur utilisée quand un champ numérique est absent, None ou non convertible.
+# Même convention que les anciens participant.get(champ, '0').
+NUMERIC_NULL_VALUE = 0
+
+# Champs texte des participants stockés en catégories
+CATEGORICAL_FIELDS: List[str] = ['RIOT_ID_GAME_NAME', 'SKIN', 'WIN', 'TEAM_POSITION']
+
+# Métadonnées de partie recopiées sur chaque ligne participant
+GAME_CATEGORICAL_COLUMNS: List[str] = [
+    'game_key', 'id_partie', 'date', 'type_partie', 'nom_tournoi',
+    'equipe_adverse', 'game_tournoi', 'numero_game', 'patch',
+]
+
+# Projection appliquée à l'ingestion : seuls ces champs bruts sont gardés en mémoire.
+# Le reste (pings, augments, PLAYER_SCORE_*, Missions_Crepe_*...) n'est relu qu'à la
+# demande via StatsAnalyzer.get_raw_game(). Une fonctionnalité qui a besoin d'un champ
+# supplémentaire le déclare dans extra_fields ({champ: 'int16' | 'int32' | 'float32' | 'category'}).
+GAME_FIELDS: List[str] = ['matchId', 'gameDuration', 'gameVersion']
+PARTICIPANT_FIELDS: List[str] = list(NUMERIC_FIELDS) + CATEGORICAL_FIELDS
+
+BLUE_TEAM = 100
+# Préfixe des comptes de l'équipe, utilisé pour déterminer le côté et le résultat d'une partie
+TEAM_PREFIX = 'TSC'
+
+
+def make_game_key(game: Dict) -> str:
+    """Identifiant unique d'une partie : id de la partie + numéro de game."""
+    return f"{game['id_partie']}_{game['numero_game']}"
+
+
+def parse_match_filename(filename: str) -> Dict:
+    """Extrait les métadonnées de partie du nom de fichier.
+
+    Scrim : IDGame_Date_Scrim_EquipeAdverse_GameN[_MatchN].json
+    Tournoi : IDGame_Date_Tournoi_NomTournoi_EquipeAdverse_GameTournoiN_GameN.json
+    """
+    parts = filename.split('_')
+    game_info = {
+        'id_partie': parts[0],
+        'date': parts[1],
+        'type_partie': parts[2],
+    }
+    if parts[2] == 'Tournoi':
+        game_info['nom_tournoi'] = parts[3]
+        game_info['equipe_adverse'] = parts[4]
+        game_info['game_tournoi'] = parts[5]  # GT1, GT2, etc.
+        game_info['numero_game'] = parts[6].replace('Game', '').split('.')[0]  # Remove .json
+    else:  # Scrim
+        game_info['equipe_adverse'] = parts[3]
+        game_info['numero_game'] = parts[4].replace('Game', '').split('.')[0]
+        game_info['game_tournoi'] = None
+    return game_info
+
+
+def project_game(game_data: Dict, extra_fields: Optional[Dict[str, str]] = None) -> Dict:
+    """Ne garde que les champs de la projection (plus les extra_fields demandés)."""
+    participant_fields = PARTICIPANT_FIELDS + [f for f in (extra_fields or {}) if f not in PARTICIPANT_FIELDS]
+    projected = {field: game_data.get(field) for field in GAME_FIELDS}
+    projected['participants'] = [
+        {field: participant.get(field) for field in participant_fields}
+        for participant in game_data.get('participants') or []
+    ]
+    return projected
+
+
+def read_match_file(path: str, extra_fields: Optional[Dict[str, str]] = None,
+                    project: bool = True) -> Tuple[Dict, str]:
+    """Lit un fichier de partie ; retourne la partie enrichie et le hash SHA-1 du contenu.
+
+    Par défaut la partie est réduite à la projection (voir PARTICIPANT_FIELDS) ;
+    project=False retourne l'enregistrement brut complet.
+    """
+    with open(path, 'rb') as f:
+        raw = f.read()
+    game_data = json.loads(raw)
+    if project:
+        game_data = project_game(game_data, extra_fields)
+    game_data.update(parse_match_filename(os.path.basename(path)))
+    game_data['game_key'] = make_game_key(game_data)
+    return game_data, hashlib.sha1(raw).hexdigest()
+
+
+def read_match_files(paths: List[str], extra_fields: Optional[Dict[str, str]] = None,
+                     workers: int = 1, executor: str = 'process',
+                     skip_errors: bool = False) -> List[Optional[Tuple[Dict, str]]]:
+    """Lit plusieurs fichiers de partie, en parallèle si workers > 1.
+
+    Le résultat suit toujours l'ordre de paths, quel que soit le mode, pour que
+    la table construite soit identique à celle du chemin série. executor vaut
+    'process' (décodage JSON limité par le CPU) ou 'thread'. Avec skip_errors,
+    un fichier illisible donne None au lieu de lever une exception.
+    """
+    reader = partial(_read_match_file_task, extra_fields=extra_fields, skip_errors=skip_errors)
+    if workers <= 1 or len(paths) < 2:
+        return [reader(path) for path in paths]
+    pool_class = ProcessPoolExecutor if executor == 'process' else ThreadPoolExecutor
+    # Des lots de fichiers par tâche limitent le coût d'échange entre processus
+    chunksize = max(1, len(paths) // (workers * 4))
+    with pool_class(max_workers=workers) as pool:
+        return list(pool.map(reader, paths, chunksize=chunksize))
+
+
+def _read_match_file_task(path: str, extra_fields: Optional[Dict[str, str]],
+                          skip_errors: bool) -> Optional[Tuple[Dict, str]]:
+    try:
+        return read_match_file(path, extra_fields)
+    except (OSError, ValueError) as e:
+        if not skip_errors:
+            raise
+        print(f"Error loading match file {os.path.basename(path)}: {str(e)}")
+        return None
+
+
+def parse_patch(game_version) -> str:
+    """Réduit un gameVersion ('15.10.680.4378') au patch majeur.mineur ('15.10')."""
+    if not game_version:
+        return 'Unknown'
+    parts = str(game_version).split('.')
+    if len(parts) < 2:
+        return 'Unknown'
+    return f"{parts[0]}.{parts[1]}"
+
+
+def build_participant_table(games: List[Dict], roster: Optional[Roster] = None,
+                            extra_fields: Optional[Dict[str, str]] = None) -> pd.DataFrame:
+    """Construit la table des participants à partir des parties chargées par load_data.
+
+    Les champs numériques sont convertis une seule fois en entiers compacts
+    (les valeurs manquantes valent NUMERIC_NULL_VALUE) ; les noms, champions
+    et adversaires sont stockés en catégories. Si un roster est fourni, chaque
+    participant est résolu vers son joueur, son rôle et son équipe (colonnes
+    player / role / squad).
+    Les extra_fields demandés sont ajoutés avec le type indiqué.
+    """
+    extra_fields = {f: dtype for f, dtype in (extra_fields or {}).items() if f not in PARTICIPANT_FIELDS}
+    game_columns: Dict[str, list] = {col: [] for col in GAME_CATEGORICAL_COLUMNS}
+    durations: list = []
+    participant_columns: Dict[str, list] = {
+        field: [] for field in PARTICIPANT_FIELDS + list(extra_fields)
+    }
+
+    for game in games:
+        participants = game.get('participants') or []
+        game_values = {
+            'game_key': game.get('game_key') or make_game_key(game),
+            'id_partie': game.get('id_partie'),
+            'date': game.get('date'),
+            'type_partie': game.get('type_partie'),
+            'nom_tournoi': game.get('nom_tournoi'),
+            'equipe_adverse': game.get('equipe_adverse'),
+            'game_tournoi': game.get('game_tournoi'),
+            'numero_game': game.get('numero_game'),
+            'patch': parse_patch(game.get('gameVersion')),
+        }
+        for col, value in game_values.items():
+            game_columns[col].extend([value] * len(participants))
+        durations.extend([game.get('gameDuration')] * len(participants))
+
+        for participant in participants:
+            for field, values in participant_columns.items():
+                values.append(participant.get(field))
+
+    data = {}
+    for col, values in game_columns.items():
+        data[col] = pd.Categorical(values)
+
+    data['game_date'] = pd.to_datetime(
+        pd.Series(game_columns['date'], dtype=object), format='%d%m%Y', errors='coerce'
+    )
+    data['gameDuration'] = _to_numeric(durations, 'int32')
+    data['duration_min'] = data['gameDuration'].astype('float64') / 60000
+
+    for field, dtype in NUMERIC_FIELDS.items():
+        data[field] = _to_numeric(participant_columns[field], dtype)
+    for field in CATEGORICAL_FIELDS:
+        data[field] = pd.Categorical(participant_columns[field])
+    for field, dtype in extra_fields.items():
+        if dtype == 'category':
+            data[field] = pd.Categorical(participant_columns[field])
+        else:
+            data[field] = _to_numeric(participant_columns[field], dtype)
+
+    table = pd.DataFrame(data)
+    table['side'] = pd.Categorical(
+        np.where(table['TEAM'] == BLUE_TEAM, 'Blue', 'Red'), categories=['Blue', 'Red']
+    )
+    table['win'] = (table['WIN'] == 'Win').to_numpy()
+    if roster is not None:
+        add_roster_columns(table, roster)
+    return table
+
+
+def add_roster_columns(table: pd.DataFrame, roster: Roster):
+    """Ajoute les colonnes player / role / squad (NaN hors roster).
+
+    Chaque nom distinct est résolu une fois par l'automate des tags ; un
+    participant n'est compté comme joueur du roster qu'aux dates couvertes par
+    une de ses appartenances (la première qui couvre la date l'emporte).
+    """
+    names = table['RIOT_ID_GAME_NAME']
+    mapping = roster.resolve_names(names.cat.categories)
+    roster_names = sorted(roster.players)
+    candidates = pd.Series(pd.Categorical(names.astype(object).map(mapping), categories=roster_names))
+    player = np.full(len(table), None, dtype=object)
+    role = np.full(len(table), None, dtype=object)
+    squad = np.full(len(table), None, dtype=object)
+    dates = table['game_date']
+    for player_name, positions in group_positions(candidates):
+        unassigned = np.ones(len(positions), dtype=bool)
+        player_dates = dates.iloc[positions]
+        for membership in roster.players[player_name].memberships:
+            active = unassigned & membership.active_on(player_dates)
+            player[positions[active]] = player_name
+            role[positions[active]] = membership.role
+            squad[positions[active]] = membership.squad
+            unassigned &= ~active
+    table['player'] = pd.Categorical(player, categories=roster_names)
+    table['role'] = pd.Categorical(role)
+    table['squad'] = pd.Categorical(squad, categories=list(roster.squads))
+
+
+def append_participants(table: pd.DataFrame, new_rows: pd.DataFrame) -> pd.DataFrame:
+    """Ajoute des lignes à la table en conservant les types (catégories fusionnées)."""
+    if table.empty:
+        return new_rows.reset_index(drop=True)
+    if new_rows.empty:
+        return table
+    data = {}
+    for col in table.columns:
+        left, right = table[col], new_rows[col]
+        if isinstance(left.dtype, pd.CategoricalDtype) and isinstance(right.dtype, pd.CategoricalDtype):
+            # equals() ignore le type des catégories (object / str) alors que concat en tient compte
+            if left.dtype == right.dtype and left.cat.categories.dtype == right.cat.categories.dtype \
+                    and left.cat.categories.equals(right.cat.categories):
+                data[col] = pd.concat([left, right], ignore_index=True)
+            elif left.cat.categories.dtype == right.cat.categories.dtype:
+                data[col] = union_categoricals([left, right], ignore_order=True)
+            else:
+                # Ex. colonne entièrement vide d'un côté : catégories de types différents
+                data[col] = pd.Categorical(pd.concat([left.astype(object), right.astype(object)], ignore_index=True))
+        else:
+            data[col] = pd.concat([left, right], ignore_index=True)
+    return pd.DataFrame(data)
+
+
+def games_from_table(table: pd.DataFrame, extra_fields: Optional[Dict[str, str]] = None) -> List[Dict]:
+    """Reconstruit les parties projetées (métadonnées + participants) à partir de la table.
+
+    Seuls les champs présents dans la table sont restitués, avec leurs types convertis.
+    """
+    game_fields = GAME_CATEGORICAL_COLUMNS + ['gameDuration']
+    participant_fields = PARTICIPANT_FIELDS + [f for f in (extra_fields or {}) if f not in PARTICIPANT_FIELDS]
+    games = []
+    for _, rows in table.groupby(table['game_key'].astype(str), sort=False):
+        first = rows.iloc[0]
+        game = {field: _plain(first[field]) for field in game_fields}
+        game['participants'] = [
+            {field: _plain(value) for field, value in zip(participant_fields, values)}
+            for values in rows[participant_fields].itertuples(index=False, name=None)
+        ]
+        games.append(game)
+    return games
+
+
+def _plain(value):
+    """Convertit une valeur pandas/numpy en type Python (None pour les valeurs manquantes)."""
+    if pd.isna(value):
+        return None
+    return value.item() if hasattr(value, 'item') else value
+
+
+def _to_numeric(values: list, dtype: str) -> pd.Series:
+    """Convertit une liste de valeurs brutes vers un type numérique compact, sans NaN."""
+    series = pd.to_numeric(pd.Series(values, dtype=object), errors='coerce')
+    return series.fillna(NUMERIC_NULL_VALUE).astype(dtype)
@@ -0,0 +1,77 @@
+"""Manifeste d'ingestion : ce qui a déjà été lu dans le dossier de données.
+
+Le manifeste n'a pas de fichier propre : il est enregistré avec les données
+qu'il décrit, dans les métadonnées du snapshot Parquet (voir snapshot.py) ou
+dans la table files de la base SQLite (voir sql_store.py). Sans snapshot ni
+base, il n'a rien à décrire au démarrage et l'archive est relue.
+"""
+import os
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+
+@dataclass
+class ManifestDiff:
+    """Différences entre le manifeste et le contenu actuel du dossier."""
+    added: List[str] = field(default_factory=list)
+    modified: List[str] = field(default_factory=list)  # taille ou mtime différents
+    removed: List[str] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.modified or self.removed)
+
+
+def list_match_files(data_path: str) -> Dict[str, os.stat_result]:
+    """Fichiers JSON du dossier (mêmes règles que glob('*.json')) avec leur stat."""
+    files = {}
+    with os.scandir(data_path) as it:
+        for entry in it:
+            if entry.name.startswith('.') or not entry.name.endswith('.json'):
+                continue
+            if entry.is_file():
+                files[entry.name] = entry.stat()
+    return files
+
+
+class IngestManifest:
+    """Chemin, taille, mtime, hash du contenu et clé de partie de chaque fichier ingéré."""
+
+    def __init__(self, entries: Optional[Dict[str, Dict]] = None):
+        self.entries: Dict[str, Dict] = dict(entries or {})
+
+    def copy(self) -> 'IngestManifest':
+        """Copie que refresh() met à jour sans toucher au manifeste de l'état publié."""
+        manifest = IngestManifest()
+        manifest.entries = {filename: dict(entry) for filename, entry in self.entries.items()}
+        return manifest
+
+    def record(self, filename: str, path: str, stat: os.stat_result, digest: str, game_key: str):
+        self.entries[filename] = {
+            'path': path,
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'sha1': digest,
+            'game_key': game_key,
+        }
+
+    def touch(self, filename: str, stat: os.stat_result):
+        """Met à jour taille/mtime d'un fichier dont le contenu n'a pas changé."""
+        entry = self.entries[filename]
+        entry['size'] = stat.st_size
+        entry['mtime_ns'] = stat.st_mtime_ns
+
+    def forget(self, filename: str) -> Optional[Dict]:
+        return self.entries.pop(filename, None)
+
+    def diff(self, files: Dict[str, os.stat_result]) -> ManifestDiff:
+        """Compare les fichiers présents (voir list_match_files) au manifeste."""
+        diff = ManifestDiff()
+        for filename in sorted(files):
+            stat = files[filename]
+            entry = self.entries.get(filename)
+            if entry is None:
+                diff.added.append(filename)
+            elif entry['size'] != stat.st_size or entry['mtime_ns'] != stat.st_mtime_ns:
+                diff.modified.append(filename)
+        diff.removed = sorted(set(self.entries) - set(files))
+        return diff
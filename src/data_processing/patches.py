@@ -0,0 +1,95 @@
+"""Statistiques par patch (majeur.mineur du gameVersion, voir ingest.parse_patch).
+
+Le patch de chaque partie est extrait à l'ingestion ; les rollups et la base
+SQLite gardent leurs sommes par patch. get_patch_stats en tire un tableau
+patch × champion (ou joueur) pour toutes les parties du filtre, mis en cache :
+changer les patchs comparés ne fait que sélectionner des lignes de ce tableau.
+"""
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Sommes par (patch, champion ou joueur) des parties des joueurs du roster ;
+# kp = somme des KP de l'historique (arrondies, une par partie)
+PATCH_SUMS = ['games', 'wins', 'kills', 'deaths', 'assists', 'cs', 'vision', 'duration_min', 'kp']
+# Regroupements de get_patch_stats : nom de l'index -> colonne de la table des participants
+PATCH_GROUPS = {'champion': 'SKIN', 'player': 'player'}
+# Colonnes comparées par compare_patches
+COMPARED_COLUMNS = ['games', 'winrate', 'kda']
+
+
+def patch_sort_key(patch: str) -> Tuple[int, ...]:
+    """Clé de tri d'un patch ('15.9' < '15.10') ; un patch illisible passe en premier."""
+    try:
+        return tuple(int(part) for part in patch.split('.'))
+    except ValueError:
+        return ()
+
+
+def sort_patches(patches: Iterable[str]) -> List[str]:
+    """Patchs dans l'ordre des versions."""
+    return sorted(patches, key=lambda patch: (patch_sort_key(patch), patch))
+
+
+def patch_table(sums: pd.DataFrame, by: str) -> pd.DataFrame:
+    """Tableau par (patch, by) à partir des sommes PATCH_SUMS (colonnes patch, by) : moyennes par partie,
+    winrate, kda, cs_per_min et vision_per_min ; trié par patch puis par nombre de parties."""
+    sums = sums[(sums['games'] > 0).to_numpy()]
+    table = pd.DataFrame({
+        'patch': sums['patch'].astype(str).to_numpy(),
+        by: sums[by].astype(str).to_numpy(),
+        'games': sums['games'].to_numpy().astype('int64'),
+        'wins': sums['wins'].to_numpy().astype('int64'),
+    })
+    games = table['games']
+    for column in ('kills', 'deaths', 'assists', 'kp'):
+        table[column] = sums[column].to_numpy().astype(float) / games
+    table['winrate'] = table['wins'] / games * 100
+    table['kda'] = (table['kills'] + table['assists']) / table['deaths'].clip(lower=1)
+    duration = pd.Series(sums['duration_min'].to_numpy().astype(float))
+    table['cs_per_min'] = sums['cs'].to_numpy() / duration.where(duration > 0)
+    table['vision_per_min'] = sums['vision'].to_numpy() / duration.where(duration > 0)
+
+    order = sorted(range(len(table)), key=lambda i: (
+        patch_sort_key(table['patch'].iat[i]), table['patch'].iat[i], -table['games'].iat[i], table[by].iat[i]
+    ))
+    return table.iloc[order].set_index(['patch', by])
+
+
+def compare_patches(stats: pd.DataFrame, base: str, target: str) -> pd.DataFrame:
+    """Comparaison de deux patchs d'un tableau de get_patch_stats.
+
+    Une ligne par champion (ou joueur) joué sur l'un des deux patchs : games,
+    winrate et kda sur chacun (suffixes _base et _target) et les écarts
+    winrate_delta et kda_delta (NaN s'il n'est joué que sur un patch). Trié
+    par nombre total de parties. Le tableau n'est que parcouru : changer de
+    patchs ne relance aucune agrégation.
+    """
+    patches = stats.index.get_level_values('patch').to_numpy()
+    names = stats.index.get_level_values(1).to_numpy()
+    values = stats[COMPARED_COLUMNS].to_numpy(dtype=float)
+    # Position de chaque nom dans le tableau, sur chacun des deux patchs (-1 s'il n'y est pas joué)
+    positions: Dict[str, List[int]] = {}
+    for side, patch in enumerate((base, target)):
+        for position in np.flatnonzero(patches == patch):
+            positions.setdefault(names[position], [-1, -1])[side] = position
+    keys = list(positions)
+    sides = np.array([positions[key] for key in keys], dtype='int64').reshape(-1, 2)
+
+    comparison = {}
+    for side, suffix in enumerate(('_base', '_target')):
+        present = sides[:, side] >= 0
+        picked = np.where(present[:, None], values[sides[:, side]], np.nan)
+        for column_index, column in enumerate(COMPARED_COLUMNS):
+            comparison[column + suffix] = picked[:, column_index]
+        comparison['games' + suffix] = np.where(present, comparison['games' + suffix], 0).astype('int64')
+    comparison = pd.DataFrame(comparison, index=pd.Index(keys, name=stats.index.names[1]))
+    comparison['winrate_delta'] = comparison['winrate_target'] - comparison['winrate_base']
+    comparison['kda_delta'] = comparison['kda_target'] - comparison['kda_base']
+    comparison = comparison[[
+        'games_base', 'games_target', 'winrate_base', 'winrate_target', 'winrate_delta',
+        'kda_base', 'kda_target', 'kda_delta',
+    ]]
+    total = comparison['games_base'].to_numpy() + comparison['games_target'].to_numpy()
+    return comparison.iloc[np.lexsort((np.array(keys, dtype=object).astype(str), -total))]
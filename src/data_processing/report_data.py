@@ -0,0 +1,69 @@
+"""Données des rapports en lot : liste des rapports, stats de chacun et empreinte de ses entrées.
+
+Le rendu (JSON, CSV, HTML) et l'écriture des fichiers sont dans reports.batch_report.
+"""
+import hashlib
+import json
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from data_processing.stats_analyzer import StatsAnalyzer
+
+FILTER_NAMES = ('opponent', 'tournament', 'patch', 'date_from', 'date_to', 'squad')
+
+
+@dataclass(frozen=True)
+class ReportJob:
+    """Un rapport : stats globales (player_name None) ou d'un joueur, pour un type de partie."""
+    game_type: str
+    player_name: Optional[str] = None
+
+    @property
+    def name(self) -> str:
+        """Chemin du rapport dans le dossier de sortie, sans extension."""
+        if self.player_name is None:
+            return f"global/{_slug(self.game_type)}"
+        return f"players/{_slug(self.player_name)}/{_slug(self.game_type)}"
+
+
+def plan_jobs(analyzer: StatsAnalyzer, game_types: List[str], players: Optional[List[str]] = None) -> List[ReportJob]:
+    players = list(analyzer.players) if players is None else players
+    jobs = []
+    for game_type in game_types:
+        jobs.append(ReportJob(game_type))
+        jobs.extend(ReportJob(game_type, player_name) for player_name in players)
+    return jobs
+
+
+def job_fingerprint(analyzer: StatsAnalyzer, job: ReportJob, filters: Dict, digests: Dict[str, str],
+                    context: str) -> str:
+    """Empreinte des entrées d'un rapport : parties couvertes (et leur contenu), filtres et contexte."""
+    game_keys = analyzer.get_game_keys(job.player_name, job.game_type, **filters)
+    digest = hashlib.sha1(context.encode('utf-8'))
+    digest.update(json.dumps([job.game_type, job.player_name, filters], default=str).encode('utf-8'))
+    for key in game_keys:
+        digest.update(f"{key}:{digests.get(key, '')}\n".encode('utf-8'))
+    return digest.hexdigest()
+
+
+def build_report(analyzer: StatsAnalyzer, job: ReportJob, filters: Dict) -> Dict:
+    """Stats d'un rapport, au format écrit en JSON."""
+    report = {
+        'game_type': job.game_type,
+        'player': job.player_name,
+        'filters': {name: value for name, value in filters.items() if value is not None},
+    }
+    if job.player_name is None:
+        report['stats'] = analyzer.get_global_stats(job.game_type, **filters)
+        return report
+
+    stats = analyzer.get_player_stats(job.player_name, job.game_type, **filters)
+    champions = analyzer.get_player_champions(job.player_name, job.game_type, **filters)
+    report['stats'] = stats
+    report['champions'] = champions.reset_index().to_dict('records')
+    return report
+
+
+def _slug(value: str) -> str:
+    return re.sub(r'[^A-Za-z0-9_-]+', '_', value).strip('_') or '_'
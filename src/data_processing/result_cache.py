@@ -0,0 +1,93 @@
+"""Cache LRU des résultats de requêtes de StatsAnalyzer."""
+import functools
+import inspect
+import pickle
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable
+
+
+class ResultCache:
+    """Cache borné (éviction LRU) avec compteurs de hits/misses.
+
+    Les résultats sont stockés sérialisés (pickle) et chaque lecture renvoie une
+    copie neuve : l'appelant peut modifier ce qu'il reçoit sans altérer le cache.
+    Sur des historiques de milliers de parties, pickle est bien plus rapide que
+    copy.deepcopy.
+    """
+
+    def __init__(self, maxsize: int = 128):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Résultat en cache (compté comme hit), sinon default sans le compter comme miss."""
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is None:
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return pickle.loads(payload)
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+        if payload is not None:
+            return pickle.loads(payload)
+
+        # Calcul hors verrou : une requête lente ne bloque pas les autres sessions
+        result = compute()
+        if self.maxsize > 0:
+            payload = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+            with self._lock:
+                self._entries[key] = payload
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        # Le résultat calculé n'est référencé que par l'appelant : pas de copie
+        return result
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def cached_query(method):
+    """Mémoïse une méthode de StatsAnalyzer dans son result_cache.
+
+    La clé contient le nom de la méthode, ses arguments normalisés (positionnels
+    ou nommés donnent la même clé) et la version des données : un refresh qui
+    modifie les données rend les anciennes entrées inaccessibles.
+    """
+    signature = inspect.signature(method)
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        bound = signature.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        arguments = tuple(bound.arguments.items())[1:]
+        key = (method.__name__, self.data_version, arguments)
+        return self.result_cache.get_or_compute(key, lambda: method(self, *args, **kwargs))
+
+    return wrapper
@@ -0,0 +1,444 @@
+"""Agrégats matérialisés (rollups) de la table des participants.
+
+Deux tables de sommes et de comptes, tenues à jour à l'ingestion :
+
+- groupes de participants, par joueur × équipe × champion × type de partie ×
+  adversaire × tournoi × patch × semaine ISO : lignes et victoires (stats de
+  champions, tous participants confondus) et, pour les joueurs du roster, une
+  partie par (joueur, partie) avec ses kills, deaths, assists, CS, vision, or,
+  dégâts, durée et les sommes de KP ;
+- groupes de parties, par portée (toutes les lignes ou celles d'une équipe) ×
+  mêmes dimensions de partie × côté : parties et victoires.
+
+Les requêtes filtrent et somment des groupes : leur coût dépend du nombre de
+groupes, pas du nombre de parties. Les filtres de dates restent au jour : les
+semaines entièrement couvertes viennent des rollups, les semaines coupées par
+une borne (deux au plus) sont agrégées depuis leurs lignes.
+"""
+import dataclasses
+import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from data_processing.filters import GameFilter
+from data_processing.ingest import TEAM_PREFIX
+from data_processing.patches import PATCH_SUMS, patch_table
+
+GAME_DIMENSIONS = ['type_partie', 'equipe_adverse', 'nom_tournoi', 'patch']
+PARTICIPANT_DIMENSIONS = ['player', 'squad', 'SKIN'] + GAME_DIMENSIONS + ['week']
+# Portée '' = toutes les lignes de la partie ; sinon lignes d'une équipe du roster (filtre squad)
+GAME_GROUP_DIMENSIONS = ['scope'] + GAME_DIMENSIONS + ['week', 'side']
+
+# Sommes par groupe de participants ; games..kp_history_sum ne comptent que les joueurs
+# du roster, une fois par (joueur, partie)
+PARTICIPANT_SUMS = [
+    'rows', 'row_wins', 'games', 'wins', 'kills', 'deaths', 'assists', 'cs', 'vision',
+    'gold', 'damage', 'duration_min', 'kp_sum', 'kp_count', 'kp_squad_sum', 'kp_squad_count',
+    'kp_history_sum',
+]
+GAME_SUMS = ['games', 'wins']
+
+
+class Rollups:
+    """Rollups de la table des participants, complétés par ajout de parties.
+
+    extend() n'ajoute que la contribution des nouvelles lignes (parties
+    complètes) ; après un retrait de parties, l'analyzer reconstruit les
+    rollups comme les autres index. row_source(game_filter) retourne les
+    lignes de la table qui passent un filtre (index = positions) : il sert
+    aux filtres de dates qui coupent une semaine.
+    """
+
+    def __init__(self, table: pd.DataFrame, row_source: Optional[Callable[[GameFilter], pd.DataFrame]] = None):
+        self.row_source = row_source
+        self.participants = _empty_frame(PARTICIPANT_DIMENSIONS, PARTICIPANT_SUMS + ['first_pos'])
+        self.games = _empty_frame(GAME_GROUP_DIMENSIONS, GAME_SUMS)
+        self._week_starts: Dict[str, np.datetime64] = {}
+        self.extend(table)
+
+    def extend(self, rows: pd.DataFrame, offset: int = 0):
+        """Ajoute la contribution de lignes ajoutées en fin de table (offset = position de la première)."""
+        if rows.empty:
+            return
+        positions = np.arange(len(rows)) + offset
+        self.participants = _merge(self.participants, participant_groups(rows, positions),
+                                   PARTICIPANT_DIMENSIONS, {'first_pos': 'min'})
+        self.games = _merge(self.games, game_groups(rows), GAME_GROUP_DIMENSIONS, {})
+        self._add_week_start(self.participants)
+        self._add_week_start(self.games)
+
+    def copy(self, row_source: Optional[Callable[[GameFilter], pd.DataFrame]] = None) -> 'Rollups':
+        """Copie que extend() complète sans toucher aux rollups d'origine (extend remplace les tables
+        de sommes sans les modifier) ; row_source est celui de la nouvelle table."""
+        clone = Rollups.__new__(Rollups)
+        clone.row_source = row_source
+        clone.participants = self.participants
+        clone.games = self.games
+        clone._week_starts = dict(self._week_starts)
+        return clone
+
+    def __len__(self) -> int:
+        return len(self.participants) + len(self.games)
+
+    def _add_week_start(self, frame: pd.DataFrame):
+        """Colonne dérivée week_start : lundi de la semaine ISO (NaT si la date de la partie est illisible)."""
+        weeks = pd.Categorical(frame['week'])
+        for week in weeks.categories:
+            if week not in self._week_starts:
+                self._week_starts[week] = _week_start(week)
+        starts = np.array([self._week_starts[week] for week in weeks.categories] + [np.datetime64('NaT')],
+                          dtype='datetime64[ns]')
+        frame['week_start'] = starts[weeks.codes]
+
+    def _mask(self, frame: pd.DataFrame, game_filter: GameFilter, squad_column: str,
+              player_name: Optional[str] = None) -> np.ndarray:
+        """Groupes qui passent les critères du filtre autres que les dates."""
+        mask = np.ones(len(frame), dtype=bool)
+        if player_name is not None:
+            mask &= (frame['player'] == player_name).to_numpy()
+        if game_filter.game_type not in (None, "Global"):
+            mask &= (frame['type_partie'] == game_filter.game_type).to_numpy()
+        if game_filter.opponent:
+            mask &= (frame['equipe_adverse'] == game_filter.opponent).to_numpy()
+        if game_filter.tournament:
+            mask &= (frame['nom_tournoi'] == game_filter.tournament).to_numpy()
+        if game_filter.patch:
+            mask &= (frame['patch'] == game_filter.patch).to_numpy()
+        if squad_column == 'scope':
+            mask &= (frame['scope'] == (game_filter.squad or '')).to_numpy()
+        elif game_filter.squad:
+            mask &= (frame['squad'] == game_filter.squad).to_numpy()
+        return mask
+
+    def _select(self, game_filter: GameFilter, player_name: Optional[str] = None) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """(groupes de participants, groupes de parties) qui passent le filtre (et du joueur s'il est donné)."""
+        participants = self.participants[self._mask(self.participants, game_filter, 'squad', player_name)]
+        games = self.games[self._mask(self.games, game_filter, 'scope')]
+        date_from, date_to = game_filter.date_from, game_filter.date_to
+        if not (date_from or date_to):
+            return participants, games
+
+        participants = participants[_weeks_within(participants['week_start'], date_from, date_to)]
+        games = games[_weeks_within(games['week_start'], date_from, date_to)]
+        ranges = _partial_weeks(date_from, date_to)
+        if not ranges:
+            return participants, games
+        if self.row_source is None:
+            raise ValueError("Rollups: row_source est requis pour un filtre de dates qui coupe une semaine")
+        # Parties complètes (sans le filtre d'équipe) : les kills d'équipe et les
+        # portées sont calculés comme à l'ingestion, l'équipe est filtrée sur les groupes
+        rows = pd.concat([
+            self.row_source(dataclasses.replace(game_filter, squad=None, date_from=start, date_to=end))
+            for start, end in ranges
+        ])
+        if rows.empty:
+            return participants, games
+        partial_participants = participant_groups(rows, rows.index.to_numpy())
+        partial_games = game_groups(rows)
+        participants = pd.concat([
+            participants, partial_participants[self._mask(partial_participants, game_filter, 'squad', player_name)]
+        ], ignore_index=True)
+        games = pd.concat([games, partial_games[self._mask(partial_games, game_filter, 'scope')]], ignore_index=True)
+        return participants, games
+
+    def _player_groups(self, game_filter: GameFilter, player_name: Optional[str] = None) -> pd.DataFrame:
+        frame, _ = self._select(game_filter, player_name)
+        return frame[(frame['games'] > 0).to_numpy()]
+
+    def global_stats(self, game_filter: GameFilter, players: Dict) -> dict:
+        """Stats globales des parties filtrées (dictionnaire de display_global_stats) : parties et victoires
+        par côté, champions joués et stats de chaque joueur du roster."""
+        groups, games = self._select(game_filter)
+        total_games = int(games['games'].sum())
+        by_side = games.groupby('side', sort=False)[GAME_SUMS].sum()
+        blue_side_games, blue_side_wins = _side_counts(by_side, 'Blue')
+        red_side_games, red_side_wins = _side_counts(by_side, 'Red')
+        wins = blue_side_wins + red_side_wins
+
+        # Champions joués (toutes les lignes), dans l'ordre de première apparition
+        champions = _sum_by(groups, 'SKIN', ['rows', 'row_wins'])
+        champion_stats = {
+            champion: {'games': int(count), 'wins': int(champion_wins)}
+            for champion, count, champion_wins in zip(champions.index, champions['rows'], champions['row_wins'])
+            if champion
+        }
+
+        # Joueurs du roster
+        player_groups = groups[(groups['games'] > 0).to_numpy()]
+        kp_sum, kp_count = ('kp_squad_sum', 'kp_squad_count') if game_filter.squad else ('kp_sum', 'kp_count')
+        player_agg = _sum_by(player_groups, 'player', [
+            'games', 'wins', 'kills', 'deaths', 'assists', 'cs', 'vision', 'duration_min', kp_sum, kp_count
+        ]).rename(columns={kp_sum: 'kp_sum', kp_count: 'kp_count'})
+        champ_counts: Dict[str, Dict[str, int]] = {}
+        pairs = _sum_by(player_groups, ['player', 'SKIN'], ['games'])
+        for (player_name, champ), count in zip(pairs.index, pairs['games']):
+            champ_counts.setdefault(player_name, {})[champ] = int(count)
+
+        player_stats = {}
+        for player_name, agg in player_agg.iterrows():
+            champion_counts = champ_counts[player_name]
+            duration = float(agg['duration_min'])
+            vision_score = int(agg['vision'])
+            player_stats[player_name] = {
+                'role': players[player_name]['role'],
+                'games': int(agg['games']),
+                'wins': int(agg['wins']),
+                'vision_score': vision_score,
+                'champion_counts': champion_counts,
+                'most_played_champions': [
+                    champ for champ, _ in sorted(champion_counts.items(), key=lambda x: x[1], reverse=True)[:3]
+                ],
+                'kda': (int(agg['kills']) + int(agg['assists'])) / max(int(agg['deaths']), 1),
+                'kp': float(agg['kp_sum']) / int(agg['kp_count']) if agg['kp_count'] > 0 else 0,
+                'cs_per_min': int(agg['cs']) / duration if duration > 0 else 0,
+                'vision_per_min': vision_score / duration if duration > 0 else 0,
+            }
+
+        return {
+            'total_games': total_games,
+            'wins': wins,
+            'losses': total_games - wins,
+            'winrate': (wins / total_games) * 100 if total_games > 0 else 0,
+            'blue_side_games': blue_side_games,
+            'blue_side_wins': blue_side_wins,
+            'blue_side_winrate': (blue_side_wins / blue_side_games) * 100 if blue_side_games > 0 else 0,
+            'red_side_games': red_side_games,
+            'red_side_wins': red_side_wins,
+            'red_side_winrate': (red_side_wins / red_side_games) * 100 if red_side_games > 0 else 0,
+            'champion_stats': champion_stats,
+            'player_stats': player_stats
+        }
+
+    def player_totals(self, player_name: str, game_filter: GameFilter) -> Dict[str, float]:
+        """Sommes des parties d'un joueur qui passent le filtre (games, kills, deaths, assists, cs, vision...)."""
+        groups = self._player_groups(game_filter, player_name)
+        totals = groups[['games', 'wins', 'kills', 'deaths', 'assists', 'cs', 'vision', 'gold', 'damage']].sum()
+        result = {column: int(value) for column, value in totals.items()}
+        result['duration_min'] = float(groups['duration_min'].sum())
+        return result
+
+    def player_champions(self, player_name: str, game_filter: GameFilter) -> pd.DataFrame:
+        """Champions du joueur (index SKIN) : games, wins, losses, winrate, moyennes de kills, deaths,
+        assists et KP, kda ; trié par nombre de parties, à égalité dans l'ordre de première apparition."""
+        groups = self._player_groups(game_filter, player_name)
+        sums = _sum_by(groups, 'SKIN', ['games', 'wins', 'kills', 'deaths', 'assists', 'kp_history_sum'])
+        sums = sums.rename(columns={'kp_history_sum': 'kp'})
+        champions = pd.DataFrame(index=sums.index.rename('SKIN'))
+        champions['games'] = sums['games'].astype('int64')
+        champions['wins'] = sums['wins'].astype(int)
+        for column in ('kills', 'deaths', 'assists', 'kp'):
+            champions[column] = sums[column].astype(float) / sums['games']
+        champions = champions[['games', 'wins', 'kills', 'deaths', 'assists', 'kp']]
+        champions['losses'] = champions['games'] - champions['wins']
+        champions['winrate'] = champions['wins'] / champions['games'] * 100
+        champions['kda'] = (champions['kills'] + champions['assists']) / champions['deaths'].clip(lower=1)
+        return champions.sort_values('games', ascending=False, kind='stable')
+
+    def patch_stats(self, game_filter: GameFilter, by: str, player_name: Optional[str] = None) -> pd.DataFrame:
+        """Tableau patches.patch_table par patch × `by` ('SKIN' ou 'player') des parties des joueurs du roster."""
+        groups = self._player_groups(game_filter, player_name)
+        groups = groups.rename(columns={'kp_history_sum': 'kp'})
+        sums = groups.groupby(['patch', by], sort=False)[PATCH_SUMS].sum().reset_index()
+        return patch_table(sums, by)
+
+    def player_weeks(self, player_name: str, game_filter: GameFilter) -> pd.DataFrame:
+        """Une ligne par semaine ISO (index week, ordre chronologique) : games, wins, winrate, kda, cs_per_min."""
+        groups = self._player_groups(game_filter, player_name)
+        # Semaines coupées par un filtre de dates comprises (leurs groupes n'ont pas de week_start)
+        groups = groups[(groups['week'] != '').to_numpy()]
+        weeks = groups.groupby('week')[['games', 'wins', 'kills', 'deaths', 'assists', 'cs', 'duration_min']].sum()
+        weeks['winrate'] = weeks['wins'] / weeks['games'] * 100
+        weeks['kda'] = (weeks['kills'] + weeks['assists']) / weeks['deaths'].clip(lower=1)
+        weeks['cs_per_min'] = weeks['cs'] / weeks['duration_min'].where(weeks['duration_min'] > 0)
+        return weeks
+
+
+def participant_groups(rows: pd.DataFrame, positions: np.ndarray) -> pd.DataFrame:
+    """Contribution de lignes (parties complètes, positions dans la table) aux groupes de participants."""
+    games = rows['game_key'].cat.codes.to_numpy().astype('int64')
+    players = rows['player'].cat.codes.to_numpy().astype('int64')
+    squads = rows['squad'].cat.codes.to_numpy()
+    is_roster = players >= 0
+    # Une seule ligne par (joueur, partie), comme trends.player_game_rows et get_player_stats
+    counted = is_roster & ~pd.Series(games * (len(rows['player'].cat.categories) + 1) + players).duplicated().to_numpy()
+
+    kills = rows['CHAMPIONS_KILLED'].to_numpy().astype('int64')
+    assists = rows['ASSISTS'].to_numpy().astype('int64')
+    roster_kills = pd.Series(np.where(is_roster, kills, 0))
+    team_kills = roster_kills.groupby(games, sort=False).transform('sum').to_numpy()
+    squad_kills = roster_kills.groupby([games, squads], sort=False).transform('sum').to_numpy()
+    contribution = kills + assists
+    with np.errstate(divide='ignore', invalid='ignore'):
+        kp = np.where(team_kills > 0, contribution / team_kills * 100, 0.0)
+        kp_squad = np.where(squad_kills > 0, contribution / squad_kills * 100, 0.0)
+        # KP de l'historique de get_player_stats : arrondie, 0 sans kill d'équipe
+        kp_history = np.where(team_kills > 0, (contribution * 100 / team_kills).round(1), 0.0)
+    has_kp = counted & (team_kills > 0)
+    has_kp_squad = counted & (squad_kills > 0)
+    win = rows['win'].to_numpy()
+
+    contributions = pd.DataFrame({
+        'player': _keys(rows['player']),
+        'squad': _keys(rows['squad']),
+        'SKIN': _keys(rows['SKIN']),
+        **{column: _keys(rows[column]) for column in GAME_DIMENSIONS},
+        'week': _weeks(rows['date']),
+        'rows': 1,
+        'row_wins': win.astype('int64'),
+        'games': counted.astype('int64'),
+        'wins': (counted & win).astype('int64'),
+        'kills': np.where(counted, kills, 0),
+        'deaths': np.where(counted, rows['NUM_DEATHS'].to_numpy().astype('int64'), 0),
+        'assists': np.where(counted, assists, 0),
+        'cs': np.where(counted, rows['Missions_CreepScore'].to_numpy().astype('int64'), 0),
+        'vision': np.where(counted, rows['VISION_SCORE'].to_numpy().astype('int64'), 0),
+        'gold': np.where(counted, rows['GOLD_EARNED'].to_numpy().astype('int64'), 0),
+        'damage': np.where(counted, rows['TOTAL_DAMAGE_DEALT_TO_CHAMPIONS'].to_numpy().astype('int64'), 0),
+        'duration_min': np.where(counted, rows['duration_min'].to_numpy(), 0.0),
+        'kp_sum': np.where(has_kp, kp, 0.0),
+        'kp_count': has_kp.astype('int64'),
+        'kp_squad_sum': np.where(has_kp_squad, kp_squad, 0.0),
+        'kp_squad_count': has_kp_squad.astype('int64'),
+        'kp_history_sum': np.where(counted, kp_history, 0.0),
+        'first_pos': positions,
+    })
+    grouped = contributions.groupby(PARTICIPANT_DIMENSIONS, observed=True, sort=False)
+    groups = grouped[PARTICIPANT_SUMS].sum()
+    groups['first_pos'] = grouped['first_pos'].min()
+    return _plain_keys(groups.reset_index(), PARTICIPANT_DIMENSIONS)
+
+
+def game_groups(rows: pd.DataFrame) -> pd.DataFrame:
+    """Contribution de lignes (parties complètes) aux groupes de parties.
+
+    Côté et résultat viennent du premier compte TSC de la portée ('' et
+    aucune victoire s'il n'y en a pas).
+    """
+    names = rows['RIOT_ID_GAME_NAME']
+    is_team_name = np.append(names.cat.categories.astype(str).str.startswith(TEAM_PREFIX), False)
+    frame = pd.DataFrame({
+        'game': rows['game_key'].cat.codes.to_numpy(),
+        'squad': _keys(rows['squad']),
+        **{column: _keys(rows[column]) for column in GAME_DIMENSIONS},
+        'week': _weeks(rows['date']),
+        'team': is_team_name[names.cat.codes.to_numpy()],
+        'side': _keys(rows['side']),
+        'win': rows['win'].to_numpy(),
+    })
+    scopes = [_scope_games(frame, ['game'], '')]
+    squad_rows = frame[(frame['squad'] != '').to_numpy()]
+    if len(squad_rows):
+        scopes.append(_scope_games(squad_rows, ['game', 'squad'], None))
+    games = _plain_keys(pd.concat(scopes, ignore_index=True), GAME_GROUP_DIMENSIONS)
+    return games.groupby(GAME_GROUP_DIMENSIONS, sort=False).agg(
+        games=('game', 'size'), wins=('win', 'sum')
+    ).reset_index()
+
+
+def _scope_games(frame: pd.DataFrame, keys: List[str], scope: Optional[str]) -> pd.DataFrame:
+    """Une ligne par partie de la portée (scope None = portée de la colonne squad)."""
+    games = frame.drop_duplicates(keys).set_index(keys)[GAME_DIMENSIONS + ['week']]
+    team = frame[frame['team'].to_numpy()].drop_duplicates(keys).set_index(keys)
+    side = team['side'].astype(str).reindex(games.index, fill_value='')
+    games['side'] = side
+    games['win'] = (team['win'].reindex(games.index, fill_value=False).astype(bool) & (side != '')).astype('int64')
+    games = games.reset_index()
+    games['scope'] = scope if scope is not None else games['squad']
+    return games
+
+
+def _keys(column: pd.Series) -> pd.Categorical:
+    """Colonne catégorielle de dimension, les valeurs manquantes devenant la catégorie ''."""
+    codes = column.cat.codes.to_numpy()
+    labels = [str(category) for category in column.cat.categories]
+    if '' in labels:
+        missing = labels.index('')
+    else:
+        missing = len(labels)
+        labels.append('')
+    return pd.Categorical.from_codes(np.where(codes < 0, missing, codes), categories=labels)
+
+
+def _weeks(dates: pd.Series) -> pd.Categorical:
+    """Semaine ISO ('2025-W21') de chaque date de partie (ddmmyyyy), '' si la date est illisible."""
+    days = pd.Series(pd.to_datetime(dates.cat.categories.astype(str), format='%d%m%Y', errors='coerce'))
+    iso = days.dt.isocalendar()
+    weeks = (iso['year'].astype(str) + '-W' + iso['week'].astype(str).str.zfill(2)).where(days.notna(), '')
+    # Code -1 (date manquante) : dernier élément, la semaine ''
+    labels = np.append(weeks.to_numpy(dtype=object), '')
+    return pd.Categorical(labels[dates.cat.codes.to_numpy()])
+
+
+def _plain_keys(frame: pd.DataFrame, dimensions: List[str]) -> pd.DataFrame:
+    """Dimensions en chaînes : les groupes d'ingestions successives se fusionnent par valeur."""
+    for column in dimensions:
+        frame[column] = frame[column].astype(str)
+    return frame
+
+
+def _week_start(week: str) -> np.datetime64:
+    if not week:
+        return np.datetime64('NaT')
+    year, number = week.split('-W')
+    return np.datetime64(datetime.date.fromisocalendar(int(year), int(number), 1))
+
+
+def _weeks_within(week_start: pd.Series, date_from: Optional[datetime.date],
+                  date_to: Optional[datetime.date]) -> np.ndarray:
+    """Groupes dont la semaine est entièrement dans [date_from, date_to]."""
+    mask = week_start.notna().to_numpy().copy()
+    if date_from:
+        mask &= (week_start >= pd.Timestamp(date_from)).to_numpy()
+    if date_to:
+        mask &= (week_start + pd.Timedelta(days=6) <= pd.Timestamp(date_to)).to_numpy()
+    return mask
+
+
+def _partial_weeks(date_from: Optional[datetime.date],
+                   date_to: Optional[datetime.date]) -> List[Tuple[Optional[datetime.date], Optional[datetime.date]]]:
+    """Intervalles de dates des semaines coupées par les bornes (deux au plus, disjoints)."""
+    if date_from and date_to and date_from > date_to:
+        return []
+    ranges = []
+    if date_from and date_from.weekday() != 0:
+        end = date_from + datetime.timedelta(days=6 - date_from.weekday())
+        ranges.append((date_from, min(end, date_to) if date_to else end))
+    if date_to and date_to.weekday() != 6:
+        start = date_to - datetime.timedelta(days=date_to.weekday())
+        if date_from:
+            start = max(start, date_from)
+        if not ranges or start > ranges[0][1]:
+            ranges.append((start, date_to))
+    return ranges
+
+
+def _empty_frame(dimensions: List[str], sums: List[str]) -> pd.DataFrame:
+    frame = pd.DataFrame({column: pd.Series(dtype=object) for column in dimensions})
+    for column in sums:
+        frame[column] = pd.Series(dtype='int64')
+    return frame
+
+
+def _merge(current: pd.DataFrame, added: pd.DataFrame, dimensions: List[str], special: Dict[str, str]) -> pd.DataFrame:
+    """Ajoute des groupes : les groupes existants sont sommés, les nouveaux ajoutés à la fin."""
+    if current.empty:
+        return added
+    aggregations = {column: special.get(column, 'sum') for column in added.columns if column not in dimensions}
+    combined = pd.concat([current[added.columns], added], ignore_index=True)
+    return combined.groupby(dimensions, sort=False).agg(aggregations).reset_index()
+
+
+def _sum_by(groups: pd.DataFrame, keys, columns: List[str]) -> pd.DataFrame:
+    """Sommes de columns par keys, dans l'ordre de première apparition dans la table (first_pos)."""
+    grouped = groups.groupby(keys, sort=False)
+    sums = grouped[columns].sum()
+    sums['first_pos'] = grouped['first_pos'].min()
+    return sums.sort_values('first_pos', kind='stable')
+
+
+def _side_counts(by_side: pd.DataFrame, side: str) -> Tuple[int, int]:
+    if side not in by_side.index:
+        return 0, 0
+    return int(by_side.loc[side, 'games']), int(by_side.loc[side, 'wins'])
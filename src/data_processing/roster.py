@@ -0,0 +1,248 @@
+"""Roster (fichier de configuration), résolution des participants vers ses joueurs et index associés."""
+import datetime
+import json
+import os
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from data_processing.indexing import PositionIndex
+
+ROLES = ["TOP", "JUNGLE", "MID", "ADC", "SUPPORT"]
+ROSTER_ENV = 'SC_ESPORT_ROSTER'
+# roster.json à la racine du dépôt
+DEFAULT_ROSTER_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                                   'roster.json')
+
+
+class TagMatcher:
+    """Automate d'Aho-Corasick sur les tags du roster.
+
+    Trouve en un seul parcours du nom (O(longueur du nom)) le joueur dont un
+    tag y apparaît, quel que soit le nombre total de tags. Si plusieurs
+    joueurs correspondent, le premier dans l'ordre du roster l'emporte.
+    """
+
+    def __init__(self, tags: Iterable[Tuple[str, str]]):
+        # Nœud = dict des transitions ; _fail et _best sont indexés par numéro de nœud
+        self._goto: List[Dict[str, int]] = [{}]
+        self._best: List[Optional[Tuple[int, str]]] = [None]
+        for priority, (tag, player) in enumerate(tags):
+            if not tag:
+                continue
+            node = 0
+            for char in tag:
+                next_node = self._goto[node].get(char)
+                if next_node is None:
+                    next_node = len(self._goto)
+                    self._goto[node][char] = next_node
+                    self._goto.append({})
+                    self._best.append(None)
+                node = next_node
+            if self._best[node] is None or priority < self._best[node][0]:
+                self._best[node] = (priority, player)
+        self._fail = [0] * len(self._goto)
+        self._build_failure_links()
+
+    def _build_failure_links(self):
+        # Parcours en largeur : le lien d'échec d'un nœud pointe vers un nœud moins profond, déjà traité
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0)
+                # Meilleur tag reconnu en ce nœud, suffixes compris
+                inherited = self._best[self._fail[child]]
+                if inherited is not None and (self._best[child] is None or inherited[0] < self._best[child][0]):
+                    self._best[child] = inherited
+
+    def match(self, name: str) -> Optional[str]:
+        """Joueur dont un tag apparaît dans le nom, sinon None."""
+        node = 0
+        best = None
+        for char in name:
+            while node and char not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(char, 0)
+            found = self._best[node]
+            if found is not None and (best is None or found[0] < best[0]):
+                best = found
+        return best[1] if best is not None else None
+
+
+@dataclass(frozen=True)
+class Membership:
+    """Appartenance d'un joueur à une équipe, à un rôle, entre deux dates (incluses, None = sans borne)."""
+    squad: str
+    role: str
+    date_from: Optional[datetime.date] = None
+    date_to: Optional[datetime.date] = None
+
+    def active_on(self, dates: pd.Series) -> np.ndarray:
+        """Masque des dates (datetime64) couvertes par l'appartenance ; une date inconnue ne l'est que sans borne."""
+        active = np.ones(len(dates), dtype=bool)
+        if self.date_from is not None:
+            active &= (dates >= pd.Timestamp(self.date_from)).to_numpy()
+        if self.date_to is not None:
+            active &= (dates <= pd.Timestamp(self.date_to)).to_numpy()
+        return active
+
+    def to_dict(self) -> Dict:
+        return {
+            'squad': self.squad,
+            'role': self.role,
+            'from': self.date_from.isoformat() if self.date_from else None,
+            'to': self.date_to.isoformat() if self.date_to else None,
+        }
+
+
+@dataclass
+class RosterPlayer:
+    tags: List[str]
+    memberships: List[Membership] = field(default_factory=list)
+
+
+class Roster:
+    """Équipes et joueurs suivis, chargés depuis roster.json.
+
+    Format :
+        {
+          "squads": {"main": "SC Esport", "academy": "SC Academy"},
+          "players": {
+            "Spectros": {
+              "tags": ["TSC Spectros", "THODA Spectros"],
+              "memberships": [{"squad": "main", "role": "JUNGLE", "from": "2025-01-01", "to": null}]
+            }
+          }
+        }
+
+    La première équipe est celle affichée par défaut.
+    """
+
+    def __init__(self, squads: Dict[str, str], players: Dict[str, RosterPlayer]):
+        self.squads = dict(squads)
+        self.players = dict(players)
+        self.matcher = TagMatcher(
+            (tag, player_name) for player_name, player in self.players.items() for tag in player.tags
+        )
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Roster':
+        squads = data.get('squads') or {}
+        if not squads:
+            raise ValueError("Roster: au moins une équipe est requise dans 'squads'")
+        players = {}
+        for player_name, entry in (data.get('players') or {}).items():
+            memberships = []
+            for raw in entry.get('memberships') or []:
+                membership = Membership(
+                    squad=raw['squad'],
+                    role=raw['role'],
+                    date_from=_parse_iso_date(raw.get('from')),
+                    date_to=_parse_iso_date(raw.get('to')),
+                )
+                if membership.squad not in squads:
+                    raise ValueError(f"Roster: équipe inconnue '{membership.squad}' pour {player_name}")
+                if membership.role not in ROLES:
+                    raise ValueError(f"Roster: rôle inconnu '{membership.role}' pour {player_name}")
+                memberships.append(membership)
+            if not memberships:
+                raise ValueError(f"Roster: {player_name} n'appartient à aucune équipe")
+            players[player_name] = RosterPlayer(tags=list(entry.get('tags') or []), memberships=memberships)
+        return cls(squads, players)
+
+    @classmethod
+    def load(cls, path: Optional[str] = None) -> 'Roster':
+        """Charge le roster (par défaut SC_ESPORT_ROSTER, sinon roster.json à la racine du dépôt)."""
+        path = path or os.environ.get(ROSTER_ENV, DEFAULT_ROSTER_PATH)
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls.from_dict(json.load(f))
+
+    def to_dict(self) -> Dict:
+        return {
+            'squads': self.squads,
+            'players': {
+                player_name: {
+                    'tags': player.tags,
+                    'memberships': [membership.to_dict() for membership in player.memberships],
+                }
+                for player_name, player in self.players.items()
+            },
+        }
+
+    @property
+    def default_squad(self) -> str:
+        return next(iter(self.squads))
+
+    def role(self, player_name: str) -> str:
+        """Rôle le plus récent du joueur (appartenance qui commence le plus tard)."""
+        memberships = self.players[player_name].memberships
+        return max(memberships, key=lambda m: m.date_from or datetime.date.min).role
+
+    def player_roles(self) -> Dict[str, Dict]:
+        """{joueur: {'role', 'tags'}} : rôle le plus récent de chaque joueur."""
+        return {
+            player_name: {'role': self.role(player_name), 'tags': player.tags}
+            for player_name, player in self.players.items()
+        }
+
+    def squad_players(self, squad: str) -> List[Tuple[str, str]]:
+        """(joueur, rôle) des membres de l'équipe, par ordre de rôle puis de nom."""
+        members = {}
+        for player_name, player in self.players.items():
+            for membership in player.memberships:
+                if membership.squad == squad:
+                    members[player_name] = membership.role
+        return sorted(members.items(), key=lambda item: (ROLES.index(item[1]), item[0]))
+
+    def resolve_names(self, names: Iterable[str]) -> Dict[str, Optional[str]]:
+        """Résout chaque nom distinct une seule fois."""
+        return {name: self.matcher.match(name) for name in set(names)}
+
+
+def _parse_iso_date(value: Optional[str]) -> Optional[datetime.date]:
+    return datetime.date.fromisoformat(value) if value else None
+
+
+class RosterIndex:
+    """Positions des lignes de la table par joueur du roster et par partie.
+
+    Construit une fois après l'ingestion ; les recherches du type « toutes les
+    parties de Spectros » ou « nos joueurs dans la partie X » sont des accès dict.
+    """
+
+    def __init__(self, table: pd.DataFrame):
+        self._by_player = PositionIndex()
+        self._by_game = PositionIndex()
+        self.extend(table)
+
+    def extend(self, rows: pd.DataFrame, offset: int = 0):
+        """Indexe des lignes ajoutées en fin de table (offset = position de la première).
+
+        Coût proportionnel au nombre de lignes ajoutées.
+        """
+        is_roster = rows['player'].notna().to_numpy()
+        self._by_player.extend(rows['player'], is_roster, offset)
+        self._by_game.extend(rows['game_key'], is_roster, offset)
+
+    def copy(self) -> 'RosterIndex':
+        """Copie que extend() complète sans toucher à l'index d'origine."""
+        clone = RosterIndex.__new__(RosterIndex)
+        clone._by_player = self._by_player.copy()
+        clone._by_game = self._by_game.copy()
+        return clone
+
+    def player_rows(self, player_name: str) -> np.ndarray:
+        """Positions des lignes du joueur (ordre de la table)."""
+        return self._by_player.get(player_name)
+
+    def game_rows(self, game_key: str) -> np.ndarray:
+        """Positions des lignes des joueurs du roster dans une partie."""
+        return self._by_game.get(game_key)
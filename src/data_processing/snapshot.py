@@ -0,0 +1,79 @@
+"""Snapshot binaire (Parquet) de la table des participants pour un démarrage à froid rapide."""
+import hashlib
+import json
+import os
+from typing import Dict, Optional, Tuple
+
+import pandas as pd
+
+from data_processing.ingest import CATEGORICAL_FIELDS, GAME_CATEGORICAL_COLUMNS, NUMERIC_FIELDS
+
+# À incrémenter quand le format de la table change
+SNAPSHOT_VERSION = 2
+SNAPSHOT_META = 'snapshot.json'
+
+
+def schema_signature(roster: Dict, extra_fields: Optional[Dict[str, str]] = None) -> str:
+    """Signature du schéma de la table et du roster (un changement invalide le snapshot)."""
+    schema = {
+        'version': SNAPSHOT_VERSION,
+        'numeric': NUMERIC_FIELDS,
+        'categorical': CATEGORICAL_FIELDS,
+        'game': GAME_CATEGORICAL_COLUMNS,
+        'extra': extra_fields or {},
+        'roster': roster,
+    }
+    return hashlib.sha1(json.dumps(schema, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def data_fingerprint(manifest_entries: Dict[str, Dict], signature: str) -> str:
+    """Empreinte des fichiers couverts par le snapshot (nom, taille, mtime, hash) et du schéma."""
+    digest = hashlib.sha1(signature.encode('utf-8'))
+    for filename in sorted(manifest_entries):
+        entry = manifest_entries[filename]
+        digest.update(f"{filename}:{entry['size']}:{entry['mtime_ns']}:{entry['sha1']}\n".encode('utf-8'))
+    return digest.hexdigest()
+
+
+def write_snapshot(snapshot_dir: str, table: pd.DataFrame, manifest_entries: Dict[str, Dict], signature: str):
+    """Écrit la table en Parquet avec les entrées du manifeste qu'elle couvre."""
+    fingerprint = data_fingerprint(manifest_entries, signature)
+    try:
+        os.makedirs(snapshot_dir, exist_ok=True)
+        table_file = f"participants-{fingerprint}.parquet"
+        table.to_parquet(os.path.join(snapshot_dir, table_file), index=False)
+        meta = {
+            'signature': signature,
+            'fingerprint': fingerprint,
+            'table_file': table_file,
+            'files': manifest_entries,
+        }
+        meta_path = os.path.join(snapshot_dir, SNAPSHOT_META)
+        with open(f"{meta_path}.tmp", 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        os.replace(f"{meta_path}.tmp", meta_path)
+        # Supprimer les anciens snapshots
+        for name in os.listdir(snapshot_dir):
+            if name.startswith('participants-') and name != table_file:
+                os.remove(os.path.join(snapshot_dir, name))
+    except (OSError, ImportError) as e:
+        print(f"Error writing snapshot in {snapshot_dir}: {str(e)}")
+
+
+def read_snapshot(snapshot_dir: str, signature: str) -> Optional[Tuple[pd.DataFrame, Dict[str, Dict]]]:
+    """Retourne (table, entrées du manifeste) si un snapshot valide existe pour ce schéma."""
+    meta_path = os.path.join(snapshot_dir, SNAPSHOT_META)
+    if not os.path.exists(meta_path):
+        return None
+    try:
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta.get('signature') != signature:
+            return None
+        if meta.get('fingerprint') != data_fingerprint(meta['files'], signature):
+            return None
+        table = pd.read_parquet(os.path.join(snapshot_dir, meta['table_file']))
+    except (OSError, ValueError, KeyError, ImportError) as e:
+        print(f"Error reading snapshot in {snapshot_dir}: {str(e)}")
+        return None
+    return table, meta['files']
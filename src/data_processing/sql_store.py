@@ -0,0 +1,474 @@
+"""Stockage des parties dans une base SQLite embarquée (fichier, sans serveur).
+
+Deux tables, games (une ligne par partie, clé id_partie + numero_game) et
+participants (une ligne par participant), indexées sur le joueur, le
+champion, la date, le type de partie, l'adversaire et le patch. Les requêtes
+de StatsAnalyzer s'y exécutent en agrégations SQL : seules les lignes qui
+passent le filtre sont lues, l'archive n'a pas besoin de tenir en mémoire.
+
+L'ingestion est idempotente : une partie réingérée remplace la ligne de même
+(id_partie, numero_game) et ses participants. La base garde aussi les entrées
+du manifeste d'ingestion (table files) et la signature du schéma et du roster
+avec lesquels elle a été remplie ; une signature différente la vide.
+"""
+import datetime
+import os
+import sqlite3
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from data_processing.filters import GameFilter
+from data_processing.ingest import CATEGORICAL_FIELDS, GAME_CATEGORICAL_COLUMNS, NUMERIC_FIELDS, TEAM_PREFIX
+from data_processing.patches import patch_table
+
+# À incrémenter quand le schéma des tables change
+STORE_VERSION = 1
+
+GAME_COLUMNS: Dict[str, str] = {
+    **{column: 'TEXT' for column in GAME_CATEGORICAL_COLUMNS},
+    'game_date': 'TEXT',  # AAAA-MM-JJ, NULL si la date du nom de fichier est illisible
+    'week': 'TEXT',  # semaine ISO ('2025-W21')
+    'gameDuration': 'INTEGER',
+    'duration_min': 'REAL',
+}
+PARTICIPANT_COLUMNS: Dict[str, str] = {
+    'game_key': 'TEXT',
+    'id_partie': 'TEXT',
+    'numero_game': 'TEXT',
+    'slot': 'INTEGER',  # rang du participant dans la partie
+    **{field: 'TEXT' for field in CATEGORICAL_FIELDS},
+    **{field: 'INTEGER' for field in NUMERIC_FIELDS},
+    'side': 'TEXT',
+    'won': 'INTEGER',  # colonne win de la table (SQLite ne distingue pas WIN et win)
+    'player': 'TEXT',
+    'role': 'TEXT',
+    'squad': 'TEXT',
+    # Calculés à l'ingestion, partie par partie : les filtres gardent ou écartent des
+    # parties entières (ou toutes les lignes d'une équipe), ces valeurs restent justes
+    'counted': 'INTEGER',  # première ligne du joueur du roster dans la partie
+    'team_kills': 'INTEGER',  # kills des joueurs du roster dans la partie
+    'squad_kills': 'INTEGER',  # kills des joueurs de l'équipe de la ligne dans la partie
+    'team_row': 'INTEGER',  # premier compte TSC de la partie (côté et résultat)
+    'squad_team_row': 'INTEGER',  # premier compte TSC de l'équipe de la ligne dans la partie
+    'kp': 'REAL',  # KP de l'historique (arrondie, 0 sans kill d'équipe), joueurs du roster seulement
+}
+FILE_COLUMNS = ['path', 'size', 'mtime_ns', 'sha1', 'game_key']
+_FROM = "FROM participants p JOIN games g ON g.game_key = p.game_key"
+
+INDEXES = {
+    'participants_player': 'participants (player)',
+    'participants_skin': 'participants (SKIN)',
+    'participants_squad': 'participants (squad)',
+    'participants_game': 'participants (game_key)',
+    'games_date': 'games (game_date)',
+    'games_type': 'games (type_partie)',
+    'games_opponent': 'games (equipe_adverse)',
+    'games_patch': 'games (patch)',
+}
+
+# Colonnes des lignes d'un joueur lues pour son historique (voir StatsAnalyzer.get_player_stats)
+HISTORY_COLUMNS = [
+    'p.game_key', 'p.SKIN', 'p.WIN', 'p.won', 'p.CHAMPIONS_KILLED', 'p.NUM_DEATHS', 'p.ASSISTS',
+    'p.Missions_CreepScore', 'p.VISION_SCORE', 'p.Missions_PlaceUsefulControlWards',
+    'p.VISION_WARDS_BOUGHT_IN_GAME', 'p.TOTAL_DAMAGE_DEALT_TO_CHAMPIONS', 'p.GOLD_EARNED', 'p.kp',
+    'g.date', 'g.type_partie', 'g.equipe_adverse', 'g.numero_game', 'g.game_tournoi',
+    'g.gameDuration', 'g.duration_min', 'g.week',
+]
+
+
+class SqlStore:
+    """Base SQLite des parties ; les méthodes de requête prennent un GameFilter."""
+
+    def __init__(self, path: str, signature: str, extra_fields: Optional[Dict[str, str]] = None):
+        self.path = path
+        self.extra_fields = dict(extra_fields or {})
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        # Une connexion partagée par les threads (sessions Streamlit, API), sérialisée par un verrou
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+            row = self._conn.execute("SELECT value FROM meta WHERE key = 'signature'").fetchone()
+            expected = f"{STORE_VERSION}:{signature}"
+            if row is None or row[0] != expected:
+                self._create_tables(expected)
+
+    def _participant_columns(self) -> Dict[str, str]:
+        columns = dict(PARTICIPANT_COLUMNS)
+        for field, dtype in self.extra_fields.items():
+            if field not in columns:
+                columns[field] = 'TEXT' if dtype == 'category' else ('REAL' if dtype.startswith('float') else 'INTEGER')
+        return columns
+
+    def _create_tables(self, signature: str):
+        """(Re)crée des tables vides : le prochain refresh réingère tout le dossier."""
+        with self._conn:
+            for table in ('files', 'games', 'participants'):
+                self._conn.execute(f"DROP TABLE IF EXISTS {table}")
+            self._conn.execute(
+                "CREATE TABLE files (filename TEXT PRIMARY KEY, path TEXT, size INTEGER, "
+                "mtime_ns INTEGER, sha1 TEXT, game_key TEXT)"
+            )
+            game_columns = ', '.join(f'"{column}" {sql_type}' for column, sql_type in GAME_COLUMNS.items())
+            self._conn.execute(
+                f"CREATE TABLE games ({game_columns}, PRIMARY KEY (id_partie, numero_game), UNIQUE (game_key))"
+            )
+            participant_columns = ', '.join(
+                f'"{column}" {sql_type}' for column, sql_type in self._participant_columns().items()
+            )
+            self._conn.execute(
+                f"CREATE TABLE participants (row_id INTEGER PRIMARY KEY, {participant_columns}, "
+                "UNIQUE (id_partie, numero_game, slot))"
+            )
+            for name, target in INDEXES.items():
+                self._conn.execute(f"CREATE INDEX {name} ON {target}")
+            self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('signature', ?)", (signature,))
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _query(self, sql: str, params: Iterable = ()) -> pd.DataFrame:
+        with self._lock:
+            return pd.read_sql_query(sql, self._conn, params=list(params))
+
+    # --- Ingestion ---
+
+    def files(self) -> Dict[str, Dict]:
+        """Entrées du manifeste d'ingestion enregistrées avec les données."""
+        with self._lock:
+            rows = self._conn.execute(f"SELECT filename, {', '.join(FILE_COLUMNS)} FROM files").fetchall()
+        return {row[0]: dict(zip(FILE_COLUMNS, row[1:])) for row in rows}
+
+    def save_files(self, entries: Dict[str, Dict]):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM files")
+            self._conn.executemany(
+                f"INSERT INTO files (filename, {', '.join(FILE_COLUMNS)}) VALUES (?, ?, ?, ?, ?, ?)",
+                [(filename, *(entry[column] for column in FILE_COLUMNS)) for filename, entry in entries.items()],
+            )
+
+    def replace_games(self, stale_keys: Iterable[str], rows: pd.DataFrame):
+        """Retire les parties périmées et écrit celles de rows (table de build_participant_table).
+
+        Les parties de rows remplacent, ligne et participants, celles de même
+        (id_partie, numero_game) : ingérer deux fois une partie ne la compte qu'une fois.
+        """
+        stale = [(key,) for key in stale_keys]
+        with self._lock, self._conn:
+            self._conn.executemany("DELETE FROM participants WHERE game_key = ?", stale)
+            self._conn.executemany("DELETE FROM games WHERE game_key = ?", stale)
+            if rows.empty:
+                return
+            games, participants = _split_rows(rows)
+            participant_columns = [column for column in self._participant_columns() if column in participants.columns]
+            self._conn.executemany(
+                "DELETE FROM participants WHERE id_partie = ? AND numero_game = ?",
+                _records(games, ['id_partie', 'numero_game']),
+            )
+            game_columns = list(GAME_COLUMNS)
+            updates = ', '.join(f'"{column}" = excluded."{column}"' for column in game_columns)
+            self._conn.executemany(
+                f"INSERT INTO games ({_names(game_columns)}) VALUES ({_placeholders(game_columns)}) "
+                f"ON CONFLICT (id_partie, numero_game) DO UPDATE SET {updates}",
+                _records(games, game_columns),
+            )
+            self._conn.executemany(
+                f"INSERT INTO participants ({_names(participant_columns)}) "
+                f"VALUES ({_placeholders(participant_columns)})",
+                _records(participants, participant_columns),
+            )
+
+    def table(self) -> pd.DataFrame:
+        """Toute la base sous forme de table des participants (colonnes texte en catégories)."""
+        game_columns = [column for column in GAME_COLUMNS if column not in ('game_key', 'week')]
+        stored_only = {'game_key', 'id_partie', 'numero_game', 'slot', 'counted', 'team_kills', 'squad_kills',
+                       'team_row', 'squad_team_row', 'kp'}
+        participant_columns = [column for column in self._participant_columns() if column not in stored_only]
+        table = self._query(
+            f"SELECT p.game_key, {', '.join('g.' + _quote(c) for c in game_columns)}, "
+            f"{', '.join('p.' + _quote(c) for c in participant_columns)} "
+            "FROM participants p JOIN games g ON g.game_key = p.game_key ORDER BY p.row_id"
+        )
+        for column in table.columns:
+            if table[column].dtype == object or pd.api.types.is_string_dtype(table[column]):
+                table[column] = table[column].astype('category')
+        table['game_date'] = pd.to_datetime(table['game_date'].astype(object))
+        table['win'] = table.pop('won').astype(bool)
+        return table
+
+    # --- Requêtes ---
+
+    def game_count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM games").fetchone()[0]
+
+    def filter_options(self) -> Dict:
+        """Valeurs des filtres, comme FilterIndex.values / date_range."""
+        options = {}
+        with self._lock:
+            for key, column in (('opponents', 'equipe_adverse'), ('tournaments', 'nom_tournoi'), ('patches', 'patch')):
+                rows = self._conn.execute(f"SELECT DISTINCT {column} FROM games WHERE {column} IS NOT NULL").fetchall()
+                options[key] = sorted(row[0] for row in rows)
+            date_min, date_max = self._conn.execute("SELECT MIN(game_date), MAX(game_date) FROM games").fetchone()
+        options['date_min'] = datetime.date.fromisoformat(date_min) if date_min else None
+        options['date_max'] = datetime.date.fromisoformat(date_max) if date_max else None
+        return options
+
+    def game_keys(self, game_filter: GameFilter, player_name: Optional[str] = None) -> List[str]:
+        where, params = _where(game_filter, player_name)
+        frame = self._query(f"SELECT DISTINCT p.game_key {_FROM}{where}", params)
+        return sorted(frame['game_key'])
+
+    def global_stats(self, game_filter: GameFilter, players: Dict) -> dict:
+        """Même résultat que Rollups.global_stats sur les lignes filtrées."""
+        # Avec un filtre d'équipe, les parties ne comptent que les lignes de l'équipe :
+        # premier compte TSC et kills d'équipe de l'équipe (voir _split_rows)
+        team_row, team_kills = ('squad_team_row', 'squad_kills') if game_filter.squad else ('team_row', 'team_kills')
+        with self._lock:
+            where, params = _where(game_filter)
+            total_games = self._conn.execute(f"SELECT COUNT(DISTINCT p.game_key) {_FROM}{where}", params).fetchone()[0]
+            # Côté et résultat : premier compte TSC de la partie
+            where, params = _where(game_filter, None, f"p.{team_row} = 1")
+            sides = dict(
+                (side, (games, side_wins)) for side, games, side_wins in self._conn.execute(
+                    f"SELECT p.side, COUNT(*), SUM(p.won) {_FROM}{where} GROUP BY p.side", params
+                )
+            )
+        blue_side_games, blue_side_wins = sides.get('Blue', (0, 0))
+        red_side_games, red_side_wins = sides.get('Red', (0, 0))
+        wins = blue_side_wins + red_side_wins
+
+        # Champions joués (toutes les lignes), dans l'ordre de première apparition
+        where, params = _where(game_filter, None, "p.SKIN IS NOT NULL", "p.SKIN != ''")
+        champions = self._query(
+            f"SELECT p.SKIN, COUNT(*) AS games, SUM(p.won) AS wins {_FROM}{where} "
+            "GROUP BY p.SKIN ORDER BY MIN(p.row_id)",
+            params,
+        )
+        champion_stats = {
+            champion: {'games': int(count), 'wins': int(champion_wins)}
+            for champion, count, champion_wins in zip(champions['SKIN'], champions['games'], champions['wins'])
+        }
+
+        # Joueurs du roster : une ligne par (joueur, partie)
+        where, params = _where(game_filter, None, "p.counted = 1")
+        player_agg = self._query(
+            "SELECT p.player, COUNT(*) AS games, SUM(p.won) AS wins, SUM(p.CHAMPIONS_KILLED) AS kills, "
+            "SUM(p.NUM_DEATHS) AS deaths, SUM(p.ASSISTS) AS assists, SUM(p.Missions_CreepScore) AS cs, "
+            "SUM(p.VISION_SCORE) AS vision_score, SUM(g.duration_min) AS duration_min, "
+            f"AVG(CASE WHEN p.{team_kills} > 0 "
+            f"THEN CAST(p.CHAMPIONS_KILLED + p.ASSISTS AS REAL) / p.{team_kills} * 100 END) AS kp "
+            f"{_FROM}{where} GROUP BY p.player ORDER BY MIN(p.row_id)",
+            params,
+        )
+        pairs = self._query(
+            f"SELECT p.player, COALESCE(p.SKIN, '') AS SKIN, COUNT(*) AS games {_FROM}{where} "
+            "GROUP BY p.player, p.SKIN ORDER BY MIN(p.row_id)",
+            params,
+        )
+        champ_counts: Dict[str, Dict[str, int]] = {}
+        for player_name, champ, count in zip(pairs['player'], pairs['SKIN'], pairs['games']):
+            champ_counts.setdefault(player_name, {})[champ] = int(count)
+
+        player_stats = {}
+        for agg in player_agg.itertuples(index=False):
+            champion_counts = champ_counts[agg.player]
+            duration = float(agg.duration_min)
+            vision_score = int(agg.vision_score)
+            player_stats[agg.player] = {
+                'role': players[agg.player]['role'],
+                'games': int(agg.games),
+                'wins': int(agg.wins),
+                'vision_score': vision_score,
+                'champion_counts': champion_counts,
+                'most_played_champions': [
+                    champ for champ, _ in sorted(champion_counts.items(), key=lambda x: x[1], reverse=True)[:3]
+                ],
+                'kda': (int(agg.kills) + int(agg.assists)) / max(int(agg.deaths), 1),
+                'kp': float(agg.kp) if pd.notna(agg.kp) else 0,
+                'cs_per_min': int(agg.cs) / duration if duration > 0 else 0,
+                'vision_per_min': vision_score / duration if duration > 0 else 0,
+            }
+
+        return {
+            'total_games': total_games,
+            'wins': wins,
+            'losses': total_games - wins,
+            'winrate': (wins / total_games) * 100 if total_games > 0 else 0,
+            'blue_side_games': blue_side_games,
+            'blue_side_wins': blue_side_wins,
+            'blue_side_winrate': (blue_side_wins / blue_side_games) * 100 if blue_side_games > 0 else 0,
+            'red_side_games': red_side_games,
+            'red_side_wins': red_side_wins,
+            'red_side_winrate': (red_side_wins / red_side_games) * 100 if red_side_games > 0 else 0,
+            'champion_stats': champion_stats,
+            'player_stats': player_stats
+        }
+
+    def _player_games(self, player_name: str, game_filter: GameFilter) -> Tuple[str, list]:
+        """CTE pg : une ligne par partie du joueur qui passe le filtre (la première si plusieurs comptes)."""
+        where, params = _where(game_filter, player_name, "p.counted = 1")
+        return f"WITH pg AS (SELECT p.row_id, {', '.join(HISTORY_COLUMNS)} {_FROM}{where})", params
+
+    def player_rows(self, player_name: str, game_filter: GameFilter) -> pd.DataFrame:
+        """Parties du joueur qui passent le filtre, dans l'ordre d'ingestion (colonnes de HISTORY_COLUMNS)."""
+        sql, params = self._player_games(player_name, game_filter)
+        return self._query(f"{sql} SELECT * FROM pg ORDER BY row_id", params)
+
+    def player_totals(self, player_name: str, game_filter: GameFilter) -> Dict[str, float]:
+        """Mêmes sommes que Rollups.player_totals."""
+        sql, params = self._player_games(player_name, game_filter)
+        with self._lock:
+            row = self._conn.execute(
+                f"{sql} SELECT COUNT(*), TOTAL(won), TOTAL(CHAMPIONS_KILLED), TOTAL(NUM_DEATHS), TOTAL(ASSISTS), "
+                "TOTAL(Missions_CreepScore), TOTAL(VISION_SCORE), TOTAL(GOLD_EARNED), "
+                "TOTAL(TOTAL_DAMAGE_DEALT_TO_CHAMPIONS), TOTAL(duration_min) FROM pg",
+                params,
+            ).fetchone()
+        columns = ['games', 'wins', 'kills', 'deaths', 'assists', 'cs', 'vision', 'gold', 'damage']
+        totals = {column: int(value) for column, value in zip(columns, row)}
+        totals['duration_min'] = float(row[-1])
+        return totals
+
+    def player_champions(self, player_name: str, game_filter: GameFilter) -> pd.DataFrame:
+        """Même tableau que Rollups.player_champions sur l'historique filtré du joueur."""
+        sql, params = self._player_games(player_name, game_filter)
+        champions = self._query(
+            f"{sql} SELECT COALESCE(SKIN, '') AS SKIN, COUNT(*) AS games, SUM(won) AS wins, "
+            "AVG(CHAMPIONS_KILLED) AS kills, AVG(NUM_DEATHS) AS deaths, AVG(ASSISTS) AS assists, AVG(kp) AS kp "
+            "FROM pg GROUP BY SKIN ORDER BY MIN(row_id)",
+            params,
+        ).set_index('SKIN')
+        for column in ('kills', 'deaths', 'assists', 'kp'):
+            champions[column] = champions[column].astype(float)
+        champions['losses'] = champions['games'] - champions['wins']
+        champions['winrate'] = champions['wins'] / champions['games'] * 100
+        champions['kda'] = (champions['kills'] + champions['assists']) / champions['deaths'].clip(lower=1)
+        return champions.sort_values('games', ascending=False, kind='stable')
+
+    def patch_stats(self, game_filter: GameFilter, by: str, player_name: Optional[str] = None) -> pd.DataFrame:
+        """Même tableau que Rollups.patch_stats (patch × `by`, 'SKIN' ou 'player')."""
+        where, params = _where(game_filter, player_name, "p.counted = 1")
+        sums = self._query(
+            f"SELECT COALESCE(g.patch, '') AS patch, COALESCE(p.{_quote(by)}, '') AS {_quote(by)}, "
+            "COUNT(*) AS games, TOTAL(p.won) AS wins, TOTAL(p.CHAMPIONS_KILLED) AS kills, "
+            "TOTAL(p.NUM_DEATHS) AS deaths, TOTAL(p.ASSISTS) AS assists, TOTAL(p.Missions_CreepScore) AS cs, "
+            "TOTAL(p.VISION_SCORE) AS vision, TOTAL(g.duration_min) AS duration_min, TOTAL(p.kp) AS kp "
+            f"{_FROM}{where} GROUP BY 1, 2",
+            params,
+        )
+        return patch_table(sums, by)
+
+    def player_weeks(self, player_name: str, game_filter: GameFilter) -> pd.DataFrame:
+        """Même tableau que Rollups.player_weeks (une ligne par semaine ISO)."""
+        sql, params = self._player_games(player_name, game_filter)
+        weeks = self._query(
+            f"{sql} SELECT week, COUNT(*) AS games, SUM(won) AS wins, SUM(CHAMPIONS_KILLED) AS kills, "
+            "SUM(NUM_DEATHS) AS deaths, SUM(ASSISTS) AS assists, SUM(Missions_CreepScore) AS cs, "
+            "SUM(duration_min) AS duration_min FROM pg WHERE week IS NOT NULL GROUP BY week ORDER BY week",
+            params,
+        ).set_index('week')
+        weeks['duration_min'] = weeks['duration_min'].astype(float)
+        weeks['winrate'] = weeks['wins'] / weeks['games'] * 100
+        weeks['kda'] = (weeks['kills'] + weeks['assists']) / weeks['deaths'].clip(lower=1)
+        weeks['cs_per_min'] = weeks['cs'] / weeks['duration_min'].where(weeks['duration_min'] > 0)
+        return weeks
+
+
+def _where(game_filter: GameFilter, player_name: Optional[str] = None, *conditions: str) -> Tuple[str, list]:
+    """Clause WHERE (alias p = participants, g = games) et paramètres d'un filtre, plus d'éventuelles conditions."""
+    clauses, params = list(conditions), []
+    if player_name is not None:
+        clauses.append("p.player = ?")
+        params.append(player_name)
+    if game_filter.game_type not in (None, "Global"):
+        clauses.append("g.type_partie = ?")
+        params.append(game_filter.game_type)
+    if game_filter.opponent:
+        clauses.append("g.equipe_adverse = ?")
+        params.append(game_filter.opponent)
+    if game_filter.tournament:
+        clauses.append("g.nom_tournoi = ?")
+        params.append(game_filter.tournament)
+    if game_filter.patch:
+        clauses.append("g.patch = ?")
+        params.append(game_filter.patch)
+    if game_filter.squad:
+        clauses.append("p.squad = ?")
+        params.append(game_filter.squad)
+    if game_filter.date_from:
+        clauses.append("g.game_date >= ?")
+        params.append(game_filter.date_from.isoformat())
+    if game_filter.date_to:
+        clauses.append("g.game_date <= ?")
+        params.append(game_filter.date_to.isoformat())
+    return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+
+def _split_rows(rows: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """(lignes de games, lignes de participants) d'une table de build_participant_table."""
+    games = rows['game_key'].cat.codes.to_numpy().astype('int64')
+    players = rows['player'].cat.codes.to_numpy().astype('int64')
+    squads = rows['squad'].cat.codes.to_numpy().astype('int64')
+    is_roster = players >= 0
+    is_team = rows['RIOT_ID_GAME_NAME'].astype(str).str.startswith(TEAM_PREFIX).to_numpy()
+    is_squad_team = is_team & (squads >= 0)
+    kills = rows['CHAMPIONS_KILLED'].to_numpy().astype('int64')
+    roster_kills = pd.Series(np.where(is_roster, kills, 0))
+    team_kills = roster_kills.groupby(games, sort=False).transform('sum').to_numpy()
+    squad_kills = roster_kills.groupby([games, squads], sort=False).transform('sum').to_numpy()
+    # Même KP que l'historique de get_player_stats
+    contribution = kills + rows['ASSISTS'].to_numpy().astype('int64')
+    kp = np.divide(contribution * 100, team_kills, out=np.zeros(len(rows)), where=team_kills > 0).round(1)
+
+    def first_of(keys: np.ndarray, mask: np.ndarray) -> np.ndarray:
+        """Première ligne de chaque clé parmi les lignes de mask."""
+        return mask & ~pd.Series(np.where(mask, keys, -1)).duplicated().to_numpy()
+
+    participants = rows.assign(
+        won=rows['win'].to_numpy(),
+        slot=pd.Series(games).groupby(games, sort=False).cumcount().to_numpy(),
+        counted=first_of(games * (len(rows['player'].cat.categories) + 1) + players, is_roster),
+        team_kills=team_kills,
+        squad_kills=pd.Series(squad_kills, index=rows.index).where(squads >= 0),
+        team_row=first_of(games, is_team),
+        squad_team_row=first_of(games * (len(rows['squad'].cat.categories) + 1) + squads, is_squad_team),
+        kp=pd.Series(kp, index=rows.index).where(is_roster),
+    )
+    first = ~pd.Series(games).duplicated().to_numpy()
+    game_rows = rows[first]
+    days = game_rows['game_date']
+    iso = days.dt.isocalendar()
+    game_rows = game_rows.assign(
+        game_date=days.dt.strftime('%Y-%m-%d').where(days.notna(), None),
+        week=(iso['year'].astype(str) + '-W' + iso['week'].astype(str).str.zfill(2)).where(days.notna(), None),
+    )
+    return game_rows, participants
+
+
+def _records(frame: pd.DataFrame, columns: List[str]) -> List[tuple]:
+    """Lignes de frame en tuples de valeurs Python (None pour les valeurs manquantes)."""
+    values = []
+    for column in columns:
+        array = frame[column].to_numpy(dtype=object, copy=True)
+        array[pd.isna(array)] = None
+        values.append(array)
+    return list(zip(*values))
+
+
+def _quote(column: str) -> str:
+    return f'"{column}"'
+
+
+def _names(columns: List[str]) -> str:
+    return ', '.join(_quote(column) for column in columns)
+
+
+def _placeholders(columns: List[str]) -> str:
+    return ', '.join('?' for _ in columns)
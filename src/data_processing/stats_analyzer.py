@@ -1,35 +1,158 @@
-import json
 import os
 import glob
-from typing import Dict, List
+import datetime
+import threading
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from data_processing.data_state import DataState
+from data_processing.filters import FilterIndex, GameFilter
+from data_processing.ingest import append_participants, build_participant_table, read_match_file, read_match_files
+from data_processing.manifest import IngestManifest, list_match_files
+from data_processing.patches import PATCH_GROUPS, sort_patches
+from data_processing.result_cache import ResultCache, cached_query
+from data_processing.roster import Roster, RosterIndex
+from data_processing.rollups import Rollups
+from data_processing.snapshot import read_snapshot, schema_signature, write_snapshot
+from data_processing.sql_store import SqlStore
+from data_processing.trends import TrendEngine, player_game_rows
+from utils.timing import span, timed
+
+INGEST_WORKERS_ENV = 'SC_ESPORT_INGEST_WORKERS'
+RESULT_CACHE_SIZE_ENV = 'SC_ESPORT_RESULT_CACHE_SIZE'
+SNAPSHOT_DIRNAME = 'snapshot'
+STORAGE_ENV = 'SC_ESPORT_STORAGE'
+STORAGES = ('memory', 'sqlite')
+SQL_STORE_FILENAME = 'stats.sqlite'
 
 class StatsAnalyzer:
-    def __init__(self, data_path: str):
+    def __init__(self, data_path: str, cache_dir: Optional[str] = None, use_snapshot: bool = True,
+                 extra_fields: Optional[Dict[str, str]] = None, ingest_workers: Optional[int] = None,
+                 ingest_executor: str = 'process', result_cache_size: Optional[int] = None,
+                 roster_path: Optional[str] = None, storage: Optional[str] = None,
+                 store_path: Optional[str] = None):
         self.data_path = data_path
-        self.players = {
-            "Claquette": {
-                "role": "TOP", 
-                "tags": ["TSC Claquette"]
-            },
-            "Spectros": {
-                "role": "JUNGLE", 
-                "tags": ["TSC Spectros", "THODA Spectros"]
-            },
-            "Futeyy": {
-                "role": "MID", 
-                "tags": ["TSC Futeyy"]
-            },
-            "Tixty": {
-                "role": "ADC", 
-                "tags": ["TSC Tixty"]
-            },
-            "Dert": {
-                "role": "SUPPORT", 
-                "tags": ["TSC Dert"]
-            }
-        }
-        # Charger les données lors de l'initialisation
-        self.matches = self.load_data()
+        # Lecture des fichiers : 1 = série (débogage), 0 = un worker par cœur, n = n workers.
+        # Par défaut : variable d'environnement SC_ESPORT_INGEST_WORKERS, sinon série.
+        if ingest_workers is None:
+            ingest_workers = int(os.environ.get(INGEST_WORKERS_ENV, '1'))
+        self.ingest_workers = ingest_workers if ingest_workers > 0 else (os.cpu_count() or 1)
+        self.ingest_executor = ingest_executor
+        # Résultats des requêtes (get_global_stats, get_player_stats...) mémoïsés par
+        # arguments et version des données ; 0 désactive le cache.
+        # Par défaut : variable d'environnement SC_ESPORT_RESULT_CACHE_SIZE, sinon 128 entrées.
+        if result_cache_size is None:
+            result_cache_size = int(os.environ.get(RESULT_CACHE_SIZE_ENV, '128'))
+        self.result_cache = ResultCache(result_cache_size)
+        # Champs bruts supplémentaires à garder en plus de la projection par défaut
+        # (voir ingest.PARTICIPANT_FIELDS), ex. {'DOUBLE_KILLS': 'int16'}
+        self.extra_fields = dict(extra_fields or {})
+        # Dossier des fichiers générés (snapshot, base SQLite...), par défaut data/.cache
+        self.cache_dir = cache_dir or os.path.join(data_path, '.cache')
+        # Stockage des parties : 'memory' (table pandas en mémoire) ou 'sqlite' (base embarquée,
+        # requêtes en SQL, voir data_processing.sql_store). Par défaut : variable
+        # d'environnement SC_ESPORT_STORAGE, sinon 'memory'.
+        if storage is None:
+            storage = os.environ.get(STORAGE_ENV, 'memory')
+        if storage not in STORAGES:
+            raise ValueError(f"Unknown storage {storage!r} (expected one of {', '.join(STORAGES)})")
+        self.storage = storage
+        # La base SQLite est elle-même persistante : pas de snapshot Parquet
+        self.use_snapshot = use_snapshot and storage == 'memory'
+        # Équipes et joueurs suivis (roster.json, voir data_processing.roster) ; players
+        # garde la forme {joueur: {'role', 'tags'}} avec le rôle le plus récent
+        self.roster = Roster.load(roster_path)
+        self.players = self.roster.player_roles()
+        self.snapshot_dir = os.path.join(self.cache_dir, SNAPSHOT_DIRNAME)
+        self.store: Optional[SqlStore] = None
+        # Un refresh à la fois ; les requêtes ne prennent pas de verrou (voir DataState)
+        self._refresh_lock = threading.Lock()
+        # Le manifeste d'ingestion est enregistré avec les données : métadonnées du snapshot
+        # ou table files de la base SQLite (voir data_processing.manifest)
+        self._state = DataState(IngestManifest(), extra_fields=self.extra_fields)
+
+        if storage == 'sqlite':
+            # Le manifeste est enregistré dans la base, avec les données qu'il décrit ;
+            # refresh() n'ingère que les fichiers que la base ne contient pas encore
+            self.store = SqlStore(store_path or os.path.join(self.cache_dir, SQL_STORE_FILENAME),
+                                  self._schema_signature(), self.extra_fields)
+            self._state = DataState(IngestManifest(self.store.files()), store=self.store, extra_fields=self.extra_fields)
+            self.refresh()
+            return
+
+        # Charger les données lors de l'initialisation : depuis le snapshot s'il est
+        # valide (seuls les fichiers plus récents sont relus), sinon depuis les JSON
+        with span("ingest.read_snapshot"):
+            snapshot = read_snapshot(self.snapshot_dir, self._schema_signature()) if use_snapshot else None
+        if snapshot is not None:
+            participants, entries = snapshot
+            self._state = DataState(IngestManifest(entries), 0, participants, RosterIndex(participants),
+                                    FilterIndex(participants), extra_fields=self.extra_fields)
+            self.refresh()
+        else:
+            matches = self.load_data()
+            # Table colonnaire typée (une ligne par participant) utilisée par les agrégations,
+            # chaque participant étant résolu vers son joueur du roster dès le chargement ;
+            # les parties lues ne sont pas gardées (voir matches)
+            with span("ingest.build_table"):
+                participants = build_participant_table(matches, self.roster, self.extra_fields)
+                del matches
+                roster_index = RosterIndex(participants)
+                # Partitions par type de partie, adversaire, tournoi, date et patch
+                filter_index = FilterIndex(participants)
+            self._state = DataState(self.manifest, 0, participants, roster_index, filter_index,
+                                    extra_fields=self.extra_fields)
+            self._write_snapshot()
+
+    # Vues de l'état publié : une requête qui en lit plusieurs prend self._state une seule fois
+
+    @property
+    def data_version(self) -> int:
+        """Version des données, incrémentée à chaque refresh qui modifie quelque chose."""
+        return self._state.data_version
+
+    @property
+    def manifest(self) -> IngestManifest:
+        return self._state.manifest
+
+    @property
+    def participants(self) -> Optional[pd.DataFrame]:
+        """Table des participants (None en mode SQLite)."""
+        return self._state.participants
+
+    @property
+    def roster_index(self) -> Optional[RosterIndex]:
+        return self._state.roster_index
+
+    @property
+    def filter_index(self) -> Optional[FilterIndex]:
+        return self._state.filter_index
+
+    @property
+    def matches(self) -> List[Dict]:
+        """Parties chargées, reconstruites depuis la table à chaque accès (diagnostic, benchmarks)."""
+        return self._state.matches()
+
+    @property
+    def rollups(self) -> Rollups:
+        """Rollups de la table (voir data_processing.rollups), qui répondent aux requêtes de stats."""
+        return self._state.rollups
+
+    @property
+    def trends(self) -> TrendEngine:
+        """Moteur de tendances (moyennes glissantes et exponentielles) de chaque joueur."""
+        return self._state.trends
+
+    def _schema_signature(self) -> str:
+        return schema_signature(self.roster.to_dict(), self.extra_fields)
+
+    @timed("ingest.write_snapshot")
+    def _write_snapshot(self):
+        if self.use_snapshot:
+            state = self._state
+            write_snapshot(self.snapshot_dir, state.participants, state.manifest.entries, self._schema_signature())
 
     def parse_filename(self, filename: str) -> Dict:
         """Parse un nom de fichier pour extraire les informations de la partie."""
@@ -88,292 +211,231 @@ class StatsAnalyzer:
                 'numero_match': 'Match 1'
             }
 
+    @timed("ingest.load_data")
     def load_data(self) -> List[Dict]:
         games = []
-        for file in glob.glob(os.path.join(self.data_path, "*.json")):
-            with open(file, 'r', encoding='utf-8') as f:
-                game_data = json.load(f)
-                
-                # Parse filename to extract metadata
-                filename = os.path.basename(file)
-                parts = filename.split('_')
-                
-                game_data['id_partie'] = parts[0]
-                game_data['date'] = parts[1]
-                game_data['type_partie'] = parts[2]
-                
-                if parts[2] == 'Tournoi':
-                    game_data['nom_tournoi'] = parts[3]
-                    game_data['equipe_adverse'] = parts[4]
-                    game_data['game_tournoi'] = parts[5]  # GT1, GT2, etc.
-                    game_data['numero_game'] = parts[6].replace('Game', '').split('.')[0]  # Remove .json
-                else:  # Scrim
-                    game_data['equipe_adverse'] = parts[3]
-                    game_data['numero_game'] = parts[4].replace('Game', '').split('.')[0]
-                    game_data['game_tournoi'] = None
-                
-                games.append(game_data)
+        files = sorted(glob.glob(os.path.join(self.data_path, "*.json")))
+        results = read_match_files(files, self.extra_fields, self.ingest_workers, self.ingest_executor)
+        for file, (game_data, digest) in zip(files, results):
+            self.manifest.record(os.path.basename(file), file, os.stat(file), digest, game_data['game_key'])
+            games.append(game_data)
         return games
 
-    def get_global_stats(self, game_type: str = "Global") -> dict:
-        # Filtrer les matches selon le type
-        if game_type == "Global":
-            filtered_matches = self.matches
-        elif game_type == "Scrim":
-            filtered_matches = [m for m in self.matches if m['type_partie'] == 'Scrim']
-        elif game_type == "Tournoi":
-            filtered_matches = [m for m in self.matches if m['type_partie'] == 'Tournoi']
-        
-        total_games = len(filtered_matches)
-        wins = 0
-        blue_side_games = 0
-        blue_side_wins = 0
-        red_side_games = 0
-        red_side_wins = 0
-
-        for game in filtered_matches:
-            for participant in game['participants']:
-                if participant['RIOT_ID_GAME_NAME'].startswith('TSC'):
-                    team = participant['TEAM']
-                    win = participant['WIN'] == 'Win'
-                    
-                    if team == '100':  # Blue side
-                        blue_side_games += 1
-                        if win:
-                            blue_side_wins += 1
-                            wins += 1
-                    else:  # Red side
-                        red_side_games += 1
-                        if win:
-                            red_side_wins += 1
-                            wins += 1
-                    break  # Only need to check one TSC player per game
-
-        # Ajouter la collecte des stats des champions
-        champion_stats = {}
-        for game in filtered_matches:
-            for player in game['participants']:
-                champion = player.get('SKIN')
-                if champion:
-                    if champion not in champion_stats:
-                        champion_stats[champion] = {'games': 0, 'wins': 0}
-                    champion_stats[champion]['games'] += 1
-                    if player.get('WIN') == 'Win':
-                        champion_stats[champion]['wins'] += 1
-        
-        # Add player statistics
-        player_stats = {}
-        for game in filtered_matches:
-            for player_data in game['participants']:
-                player_name = player_data['RIOT_ID_GAME_NAME']
-                
-                # Trouver le nom du joueur et son rôle à partir des tags
-                found_player = None
-                for p_name, p_info in self.players.items():
-                    if any(tag in player_name for tag in p_info['tags']):
-                        found_player = p_name
-                        break
-                
-                if found_player:
-                    if found_player not in player_stats:
-                        player_stats[found_player] = {
-                            'role': self.players[found_player]['role'],
-                            'games': 0,
-                            'wins': 0,
-                            'kills': 0,
-                            'deaths': 0,
-                            'assists': 0,
-                            'cs': 0,
-                            'vision_score': 0,
-                            'champion_counts': {},
-                            'most_played_champions': []
-                        }
-    
-                    stats = player_stats[found_player]
-                    stats['games'] += 1
-                    stats['wins'] += 1 if player_data['WIN'] == 'Win' else 0
-                    stats['kills'] += int(player_data['CHAMPIONS_KILLED'])
-                    stats['deaths'] += int(player_data['NUM_DEATHS'])
-                    stats['assists'] += int(player_data['ASSISTS'])
-                    stats['cs'] += int(player_data['Missions_CreepScore'])
-                    stats['vision_score'] += int(player_data.get('VISION_SCORE', 0))  # Use get() with default value
-                    
-                    # Track champion played
-                    champ = player_data['SKIN']
-                    if champ in stats['champion_counts']:
-                        stats['champion_counts'][champ] += 1
-                    else:
-                        stats['champion_counts'][champ] = 1
-
-        # Calculate averages and format data for each player
-        for player_name, stats in player_stats.items():
-            games = stats['games']
-            stats['kda'] = (stats['kills'] + stats['assists']) / max(stats['deaths'], 1)
-            
-            # Calculate KP per game then average
-            kp_per_game = []
-            for game in filtered_matches:
-                game_team_kills = 0
-                player_contribution = 0
-                
-                # First get team kills for this game
-                for participant in game['participants']:
-                    if any(tag in participant['RIOT_ID_GAME_NAME'] for p_info in self.players.values() for tag in p_info['tags']):
-                        game_team_kills += int(participant['CHAMPIONS_KILLED'])
-                
-                # Then get player's contribution
-                for participant in game['participants']:
-                    if any(tag in participant['RIOT_ID_GAME_NAME'] for tag in self.players[player_name]['tags']):
-                        kills = int(participant['CHAMPIONS_KILLED'])
-                        assists = int(participant['ASSISTS'])
-                        player_contribution = kills + assists
-                        if game_team_kills > 0:
-                            kp_per_game.append((player_contribution / game_team_kills) * 100)
-                        break
-            
-            # Calculate average KP
-            stats['kp'] = sum(kp_per_game) / len(kp_per_game) if kp_per_game else 0
-
-            # Calculate total game duration in minutes
-            total_game_duration = 0  # Fixed typo in variable name
-            for game in filtered_matches:
-                for participant in game['participants']:
-                    if any(tag in participant['RIOT_ID_GAME_NAME'] for tag in self.players[player_name]['tags']):
-                        # gameDuration is in milliseconds, convert to minutes
-                        total_game_duration += game['gameDuration'] / 60000
-                        break
-            
-            # Calculate real CS per minute using actual game duration
-            stats['cs_per_min'] = stats['cs'] / total_game_duration if total_game_duration > 0 else 0
-            
-            # Calculate total team kills before player stats
-            total_team_kills = 0
-            for game in filtered_matches:
-                game_team_kills = 0
-                for participant in game['participants']:
-                    if any(tag in participant['RIOT_ID_GAME_NAME'] for p_info in self.players.values() for tag in p_info['tags']):
-                        game_team_kills += int(participant['CHAMPIONS_KILLED'])  # Convert to int
-                total_team_kills += game_team_kills
-            
-            # Get most played champions
-            stats['most_played_champions'] = sorted(
-                stats['champion_counts'].items(),
-                key=lambda x: x[1],
-                reverse=True
-            )[:3]
-            stats['most_played_champions'] = [champ for champ, _ in stats['most_played_champions']]
-            
-            # Keep vision_score for support role display
-            temp_vision = stats['vision_score']
-            
-            # Clean up temporary data
-            del stats['kills']
-            del stats['deaths']
-            del stats['assists']
-            del stats['cs']
-            
-            # Calculate vision per minute using actual game duration
-            total_vision_score = stats['vision_score']
-            total_game_duration = 0
-            for game in filtered_matches:
-                for participant in game['participants']:
-                    if any(tag in participant['RIOT_ID_GAME_NAME'] for tag in self.players[player_name]['tags']):
-                        total_game_duration += game['gameDuration'] / 60000  # Convert ms to minutes
-                        break
-            
-            stats['vision_per_min'] = total_vision_score / total_game_duration if total_game_duration > 0 else 0
-            
-            # Keep champion counts for display
-            stats['champion_counts'] = stats['champion_counts']
+    @timed("ingest.refresh")
+    def refresh(self) -> Dict[str, List[str]]:
+        """Met à jour les données avec les fichiers ajoutés, modifiés ou supprimés.
 
-        return {
-            'total_games': total_games,
-            'wins': wins,
-            'losses': total_games - wins,
-            'winrate': (wins / total_games) * 100 if total_games > 0 else 0,
-            'blue_side_games': blue_side_games,
-            'blue_side_wins': blue_side_wins,
-            'blue_side_winrate': (blue_side_wins / blue_side_games) * 100 if blue_side_games > 0 else 0,
-            'red_side_games': red_side_games,
-            'red_side_wins': red_side_wins,
-            'red_side_winrate': (red_side_wins / red_side_games) * 100 if red_side_games > 0 else 0,
-            'champion_stats': champion_stats,
-            'player_stats': player_stats
-        }
+        Seuls les fichiers nouveaux ou dont le contenu a changé sont relus ; les
+        lignes correspondantes sont retirées/ajoutées dans la table et l'index du
+        roster est complété, sans relire le reste de l'archive. Le nouvel état
+        est construit à côté de l'état courant, qui reste lisible jusqu'à sa
+        publication.
+        """
+        with self._refresh_lock:
+            return self._refresh()
 
-    def get_player_stats(self, player_name: str, game_type: str = "Global"):
-        # Filtrer les matches selon le type
-        if game_type == "Global":
-            filtered_matches = self.matches
-        elif game_type == "Scrim":
-            filtered_matches = [m for m in self.matches if m['type_partie'] == 'Scrim']
-        elif game_type == "Tournoi":
-            filtered_matches = [m for m in self.matches if m['type_partie'] == 'Tournoi']
-    
-        player_tags = self.players[player_name]["tags"]
-        match_history = []
-        total_kills = 0
-        total_deaths = 0
-        total_assists = 0
-        total_cs = 0
-        total_vision = 0
-        game_duration_minutes = 0
-        
-        for game in filtered_matches:
-            for participant in game['participants']:
-                if any(tag in participant['RIOT_ID_GAME_NAME'] for tag in player_tags):
-                    # Calculate team kills first
-                    game_team_kills = sum(
-                        int(p['CHAMPIONS_KILLED']) 
-                        for p in game['participants']
-                        if any(tag in p['RIOT_ID_GAME_NAME'] for p_info in self.players.values() for tag in p_info['tags'])
-                    )
-
-                    match_info = {
-                        'SKIN': participant['SKIN'],
-                        'Win': participant['WIN'],
-                        'KDA': f"{participant['CHAMPIONS_KILLED']}/{participant['NUM_DEATHS']}/{participant['ASSISTS']}",
-                        'CHAMPIONS_KILLED': participant['CHAMPIONS_KILLED'],
-                        'NUM_DEATHS': participant['NUM_DEATHS'],
-                        'ASSISTS': participant['ASSISTS'],
-                        'date': game['date'],
-                        'type_partie': game['type_partie'],
-                        'equipe_adverse': game['equipe_adverse'],
-                        'Missions_CreepScore': participant['Missions_CreepScore'],
-                        'VISION_SCORE': participant.get('VISION_SCORE', '0'),
-                        'Missions_PlaceUsefulControlWards': participant.get('Missions_PlaceUsefulControlWards', '0'),
-                        'VISION_WARDS_BOUGHT_IN_GAME': participant.get('VISION_WARDS_BOUGHT_IN_GAME', '0'),
-                        'TOTAL_DAMAGE_DEALT_TO_CHAMPIONS': participant.get('TOTAL_DAMAGE_DEALT_TO_CHAMPIONS', '0'),
-                        'GOLD_EARNED': participant.get('GOLD_EARNED', '0'),
-                        'gameDuration': game['gameDuration'],
-                        'KP': 0,  # Initialisation
-                        'numero_game': game.get('numero_game', '1'),  # Default to '1' if not found
-                        'game_tournoi': game.get('game_tournoi', None)  # Add tournament game number if available
-                    }
-
-                    # Calculate KP directly here
-                    player_contribution = int(participant['CHAMPIONS_KILLED']) + int(participant['ASSISTS'])
-                    match_info['KP'] = round((player_contribution / game_team_kills * 100), 1) if game_team_kills > 0 else 0
-                    
-                    # Calculate gold efficiency (damage to champions per gold earned)
-                    gold_earned = int(participant.get('GOLD_EARNED', '0'))
-                    damage_to_champions = int(participant.get('TOTAL_DAMAGE_DEALT_TO_CHAMPIONS', '0'))
-                    match_info['GOLD_EFFICIENCY'] = round(damage_to_champions / gold_earned, 2) if gold_earned > 0 else 0
+    def _refresh(self) -> Dict[str, List[str]]:
+        state = self._state
+        files = list_match_files(self.data_path)
+        diff = state.manifest.diff(files)
+        changes = {'added': [], 'changed': [], 'removed': []}
+        if not diff:
+            return changes
+
+        manifest = state.manifest.copy()
+
+        stale_keys = set()
+        new_games = []
+        candidates = diff.added + diff.modified
+        paths = [os.path.join(self.data_path, filename) for filename in candidates]
+        results = read_match_files(paths, self.extra_fields, self.ingest_workers, self.ingest_executor,
+                                   skip_errors=True)
+        for filename, path, result in zip(candidates, paths, results):
+            if result is None:
+                continue
+            game_data, digest = result
+            previous = manifest.entries.get(filename)
+            if previous is not None:
+                if previous['sha1'] == digest:
+                    # Fichier touché mais contenu identique : rien à relire
+                    manifest.touch(filename, files[filename])
+                    continue
+                stale_keys.add(previous['game_key'])
+                changes['changed'].append(filename)
+            else:
+                changes['added'].append(filename)
+            manifest.record(filename, path, files[filename], digest, game_data['game_key'])
+            new_games.append(game_data)
+
+        for filename in diff.removed:
+            entry = manifest.forget(filename)
+            stale_keys.add(entry['game_key'])
+            changes['removed'].append(filename)
+
+        # Une partie réingérée remplace l'ancienne version de même clé
+        stale_keys.update(game['game_key'] for game in new_games)
+        if stale_keys or new_games:
+            new_state = self._apply_changes(state, manifest, stale_keys, new_games)
+        else:
+            new_state = state.with_manifest(manifest)
+        if self.store is not None:
+            self.store.save_files(manifest.entries)
+        # Publication : les requêtes suivantes voient toutes les nouvelles données à la fois
+        self._state = new_state
+        if new_state.data_version != state.data_version:
+            # Les entrées des versions précédentes ne seront plus jamais lues
+            self.result_cache.clear()
+        self._write_snapshot()
+        return changes
+
+    def _apply_changes(self, state: DataState, manifest: IngestManifest, stale_keys: set,
+                       new_games: List[Dict]) -> DataState:
+        """État suivant : parties périmées retirées et nouvelles ajoutées, sans modifier `state`."""
+        if self.store is not None:
+            new_rows = build_participant_table(new_games, self.roster, self.extra_fields)
+            self.store.replace_games(stale_keys, new_rows)
+            return DataState(manifest, state.data_version + 1, store=self.store, extra_fields=self.extra_fields,
+                             trends=_extended_trends(state._trends, stale_keys, new_rows))
+        participants = state.participants
+        roster_index = state.roster_index
+        filter_index = state.filter_index
+        rollups = state._rollups
+        trends = state._trends
+        existing_keys = set(participants['game_key'].astype(str).unique()) if len(participants) else set()
+        stale_keys &= existing_keys
+        if stale_keys:
+            participants = participants[~participants['game_key'].isin(stale_keys)].reset_index(drop=True)
+            # les positions ont bougé : index reconstruits plus bas
+            roster_index = None
+            filter_index = None
+            rollups = None
+
+        if new_games:
+            new_rows = build_participant_table(new_games, self.roster, self.extra_fields)
+            offset = len(participants)
+            participants = append_participants(participants, new_rows)
+            if roster_index is not None:
+                # Copies complétées : l'état courant garde ses index tant qu'il est lu
+                roster_index = roster_index.copy()
+                roster_index.extend(new_rows, offset)
+                filter_index = filter_index.copy()
+                filter_index.extend(new_rows, offset)
+                if rollups is not None:
+                    # Seule la contribution des nouvelles parties est ajoutée aux rollups
+                    rollups = rollups.copy()
+                    rollups.extend(new_rows, offset)
+            trends = _extended_trends(trends, stale_keys, new_rows)
+        elif stale_keys:
+            trends = None
+
+        if roster_index is None:
+            roster_index = RosterIndex(participants)
+            filter_index = FilterIndex(participants)
+        # rollups et trends à None : reconstruits à la prochaine requête
+        return DataState(manifest, state.data_version + 1, participants, roster_index, filter_index,
+                         extra_fields=self.extra_fields, rollups=rollups, trends=trends)
+
+    def get_raw_game(self, game_key: str) -> Optional[Dict]:
+        """Relit depuis le disque l'enregistrement complet (tous les champs) d'une partie."""
+        for filename, entry in self._state.manifest.entries.items():
+            if entry['game_key'] == game_key:
+                game_data, _ = read_match_file(os.path.join(self.data_path, filename), project=False)
+                return game_data
+        return None
+
+    def game_count(self) -> int:
+        """Nombre de parties chargées."""
+        if self.store is not None:
+            return self.store.game_count()
+        return int(self._state.participants['game_key'].nunique())
+
+    def get_filter_options(self) -> Dict:
+        """Valeurs disponibles pour les filtres (adversaires, tournois, patchs, bornes de dates)."""
+        if self.store is not None:
+            options = self.store.filter_options()
+        else:
+            filter_index = self._state.filter_index
+            date_min, date_max = filter_index.date_range()
+            options = {
+                'opponents': filter_index.values('opponent'),
+                'tournaments': filter_index.values('tournament'),
+                'patches': filter_index.values('patch'),
+                'date_min': date_min,
+                'date_max': date_max,
+            }
+        # Ordre des versions : 15.9 avant 15.10
+        options['patches'] = sort_patches(options['patches'])
+        return options
+
+    def latest_patch(self) -> Optional[str]:
+        """Patch le plus récent des parties chargées (None sans partie)."""
+        patches = self.get_filter_options()['patches']
+        return patches[-1] if patches else None
+
+    def get_game_keys(self, player_name: Optional[str] = None, game_type: str = "Global",
+                      opponent: Optional[str] = None, tournament: Optional[str] = None,
+                      date_from: Optional[datetime.date] = None, date_to: Optional[datetime.date] = None,
+                      patch: Optional[str] = None, squad: Optional[str] = None) -> List[str]:
+        """Clés (triées) des parties couvertes par une requête globale, ou par celle d'un joueur."""
+        game_filter = GameFilter(game_type, opponent, tournament, date_from, date_to, patch, squad)
+        return self._game_keys(self._state, game_filter, player_name)
+
+    def _game_keys(self, state: DataState, game_filter: GameFilter, player_name: Optional[str]) -> List[str]:
+        if self.store is not None:
+            return self.store.game_keys(game_filter, player_name)
+        rows = state.roster_index.player_rows(player_name) if player_name is not None else None
+        table = state.filter_rows(game_filter, rows)
+        return sorted(table['game_key'].astype(str).unique())
+
+    def game_digests(self) -> Dict[str, str]:
+        """Empreinte (sha1 du fichier source) de chaque partie chargée, par clé de partie."""
+        return {entry['game_key']: entry['sha1'] for entry in self._state.manifest.entries.values()}
+
+    @timed("analyzer.get_global_stats")
+    @cached_query
+    def get_global_stats(self, game_type: str = "Global", opponent: Optional[str] = None,
+                         tournament: Optional[str] = None, date_from: Optional[datetime.date] = None,
+                         date_to: Optional[datetime.date] = None, patch: Optional[str] = None,
+                         squad: Optional[str] = None) -> dict:
+        game_filter = GameFilter(game_type, opponent, tournament, date_from, date_to, patch, squad)
+        if self.store is not None:
+            return self.store.global_stats(game_filter, self.players)
+        return self.rollups.global_stats(game_filter, self.players)
+
+    @timed("analyzer.get_player_stats")
+    @cached_query
+    def get_player_stats(self, player_name: str, game_type: str = "Global", opponent: Optional[str] = None,
+                         tournament: Optional[str] = None, date_from: Optional[datetime.date] = None,
+                         date_to: Optional[datetime.date] = None, patch: Optional[str] = None,
+                         squad: Optional[str] = None):
+        game_filter = GameFilter(game_type, opponent, tournament, date_from, date_to, patch, squad)
+        if self.store is not None:
+            # Parties du joueur (KP calculée à l'ingestion) et sommes lues en SQL
+            rows = self.store.player_rows(player_name, game_filter)
+            match_history = _match_history(rows, rows['kp'].to_numpy())
+            totals = self.store.player_totals(player_name, game_filter)
+        else:
+            state = self._state
+            # Lignes du joueur via l'index du roster, croisées avec les partitions des filtres
+            rows = state.filter_rows(game_filter, state.roster_index.player_rows(player_name))
+            rows = rows.drop_duplicates('game_key')
+            team_kills = state.team_kills()
+            game_team_kills = team_kills.reindex(rows['game_key'].astype(str)).to_numpy()
+            contribution = (rows['CHAMPIONS_KILLED'].astype('int32') + rows['ASSISTS'].astype('int32')).to_numpy()
+            kp = np.divide(contribution * 100, game_team_kills, out=np.zeros(len(rows)),
+                           where=game_team_kills > 0).round(1)
+            match_history = _match_history(rows, kp)
+            # Moyennes depuis les rollups ; seul l'historique est construit partie par partie
+            totals = state.rollups.player_totals(player_name, game_filter)
+
+        total_games = totals['games']
+        total_kills = totals['kills']
+        total_deaths = totals['deaths']
+        total_assists = totals['assists']
+        total_cs = totals['cs']
+        total_vision = totals['vision']
+        game_duration_minutes = totals['duration_min']
 
-                    match_history.append(match_info)
-                
-                    # Update totals
-                    total_kills += int(participant['CHAMPIONS_KILLED'])
-                    total_deaths += int(participant['NUM_DEATHS'])
-                    total_assists += int(participant['ASSISTS'])
-                    total_cs += int(participant['Missions_CreepScore'])
-                    total_vision += int(participant.get('VISION_SCORE', '0'))
-                    game_duration_minutes += float(game['gameDuration']) / 60000  # Correction: divisé par 60000 pour convertir ms en minutes
-                
-                    break
-    
-        total_games = len(match_history)
-    
         return {
             'total_games': total_games,
             'kda': (total_kills + total_assists) / total_deaths if total_deaths > 0 else (total_kills + total_assists),
@@ -384,3 +446,106 @@ class StatsAnalyzer:
             'avg_vision': total_vision / total_games if total_games > 0 else 0,
             'match_history': match_history
         }
+
+    @timed("analyzer.get_player_champions")
+    @cached_query
+    def get_player_champions(self, player_name: str, game_type: str = "Global", opponent: Optional[str] = None,
+                             tournament: Optional[str] = None, date_from: Optional[datetime.date] = None,
+                             date_to: Optional[datetime.date] = None, patch: Optional[str] = None,
+                             squad: Optional[str] = None) -> pd.DataFrame:
+        """Tableau des champions du joueur (voir Rollups.player_champions), depuis les rollups ou la base SQL."""
+        game_filter = GameFilter(game_type, opponent, tournament, date_from, date_to, patch, squad)
+        if self.store is not None:
+            return self.store.player_champions(player_name, game_filter)
+        return self.rollups.player_champions(player_name, game_filter)
+
+    @timed("analyzer.get_player_weekly_stats")
+    @cached_query
+    def get_player_weekly_stats(self, player_name: str, game_type: str = "Global", opponent: Optional[str] = None,
+                                tournament: Optional[str] = None, date_from: Optional[datetime.date] = None,
+                                date_to: Optional[datetime.date] = None, patch: Optional[str] = None,
+                                squad: Optional[str] = None) -> pd.DataFrame:
+        """Stats du joueur par semaine ISO (games, wins, winrate, kda, cs_per_min), depuis les rollups ou la base SQL."""
+        game_filter = GameFilter(game_type, opponent, tournament, date_from, date_to, patch, squad)
+        if self.store is not None:
+            return self.store.player_weeks(player_name, game_filter)
+        return self.rollups.player_weeks(player_name, game_filter)
+
+    @timed("analyzer.get_patch_stats")
+    @cached_query
+    def get_patch_stats(self, by: str = "champion", player_name: Optional[str] = None, game_type: str = "Global",
+                        opponent: Optional[str] = None, tournament: Optional[str] = None,
+                        date_from: Optional[datetime.date] = None, date_to: Optional[datetime.date] = None,
+                        squad: Optional[str] = None) -> pd.DataFrame:
+        """Stats par patch × champion (by='champion') ou × joueur (by='player') des joueurs du roster.
+
+        Un seul tableau pour tous les patchs (voir patches.patch_table), gardé en
+        cache : patches.compare_patches y compare deux patchs sans autre requête.
+        """
+        if by not in PATCH_GROUPS:
+            raise ValueError(f"Unknown patch grouping {by!r} (expected one of {', '.join(PATCH_GROUPS)})")
+        game_filter = GameFilter(game_type, opponent, tournament, date_from, date_to, None, squad)
+        if self.store is not None:
+            stats = self.store.patch_stats(game_filter, PATCH_GROUPS[by], player_name)
+        else:
+            stats = self.rollups.patch_stats(game_filter, PATCH_GROUPS[by], player_name)
+        return stats.rename_axis(['patch', by])
+
+    @timed("analyzer.get_player_trends")
+    @cached_query
+    def get_player_trends(self, player_name: str, game_type: str = "Global", opponent: Optional[str] = None,
+                          tournament: Optional[str] = None, date_from: Optional[datetime.date] = None,
+                          date_to: Optional[datetime.date] = None, patch: Optional[str] = None,
+                          squad: Optional[str] = None) -> pd.DataFrame:
+        """Forme du joueur partie par partie : valeurs, moyennes sur 5 et 10 parties et moyennes exponentielles."""
+        state = self._state
+        filters = (opponent, tournament, date_from, date_to, patch, squad)
+        if all(value is None for value in filters):
+            return state.trends.series(player_name, game_type)
+        # Filtres : la série est recalculée sur les seules parties retenues
+        game_keys = self._game_keys(state, GameFilter(game_type, *filters), player_name)
+        return state.trends.series(player_name, game_type, game_keys)
+
+
+def _extended_trends(trends: Optional[TrendEngine], stale_keys: set, new_rows: pd.DataFrame) -> Optional[TrendEngine]:
+    """Copie des séries de forme complétée des nouvelles parties ; None (à reconstruire) si des parties
+    connues sont retirées ou si les séries n'étaient pas construites."""
+    if trends is None or any(key in trends for key in stale_keys):
+        return None
+    trends = trends.copy()
+    trends.extend(player_game_rows(new_rows))
+    return trends
+
+
+def _match_history(rows: pd.DataFrame, kp: np.ndarray) -> List[Dict]:
+    """Historique des parties d'un joueur (une ligne par partie) ; kp = KP arrondie de chaque partie."""
+    kills = rows['CHAMPIONS_KILLED'].astype('int32')
+    deaths = rows['NUM_DEATHS'].astype('int32')
+    assists = rows['ASSISTS'].astype('int32')
+    gold_earned = rows['GOLD_EARNED'].astype('int64')
+    damage_to_champions = rows['TOTAL_DAMAGE_DEALT_TO_CHAMPIONS'].astype('int64')
+    gold_efficiency = (damage_to_champions / gold_earned.where(gold_earned > 0)).round(2).fillna(0)
+
+    history = pd.DataFrame({
+        'SKIN': rows['SKIN'].astype(str),
+        'Win': rows['WIN'].astype(str),
+        'KDA': kills.astype(str) + '/' + deaths.astype(str) + '/' + assists.astype(str),
+        'CHAMPIONS_KILLED': kills,
+        'NUM_DEATHS': deaths,
+        'ASSISTS': assists,
+        'date': rows['date'].astype(str),
+        'type_partie': rows['type_partie'].astype(str),
+        'equipe_adverse': rows['equipe_adverse'].astype(str),
+        'Missions_CreepScore': rows['Missions_CreepScore'],
+        'VISION_SCORE': rows['VISION_SCORE'],
+        'Missions_PlaceUsefulControlWards': rows['Missions_PlaceUsefulControlWards'],
+        'VISION_WARDS_BOUGHT_IN_GAME': rows['VISION_WARDS_BOUGHT_IN_GAME'],
+        'TOTAL_DAMAGE_DEALT_TO_CHAMPIONS': damage_to_champions,
+        'GOLD_EARNED': gold_earned,
+        'gameDuration': rows['gameDuration'],
+        'KP': kp,
+        'numero_game': rows['numero_game'].astype(str),
+        'game_tournoi': rows['game_tournoi'].astype(object).where(rows['game_tournoi'].notna(), None),
+        'GOLD_EFFICIENCY': gold_efficiency,
+    })
+    return history.to_dict('records')
@@ -0,0 +1,269 @@
+"""Tendances de forme des joueurs : moyennes glissantes et exponentielles, partie par partie.
+
+Les parties de chaque joueur sont triées chronologiquement (date puis numéro de
+game). Chaque nouvelle partie met à jour des sommes glissantes (fenêtres de 5 et
+10 parties) et des moyennes exponentielles en O(1) : ajouter une partie à la
+fin d'une série ne recalcule pas son historique. Seule une partie plus
+ancienne que la dernière de sa série (réingestion d'une vieille partie) fait
+recalculer cette série.
+
+Les ratios (KDA, CS/min, vision/min) sont calculés sur les sommes de la
+fenêtre, comme les stats globales ; la KP est la moyenne des KP par partie.
+"""
+import datetime
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_WINDOWS = (5, 10)
+# Moyenne exponentielle : alpha = 2 / (span + 1), comme pandas ewm(span=...)
+DEFAULT_SPAN = 10
+
+# Sommes tenues par les fenêtres et les moyennes exponentielles (ordre de TrendGame.values)
+SUM_FIELDS = ['kills', 'deaths', 'assists', 'cs', 'vision', 'duration_min', 'kp']
+METRICS = ['kda', 'cs_per_min', 'kp', 'vision_per_min']
+
+
+@dataclass(frozen=True)
+class TrendGame:
+    """Une partie d'un joueur ; sort_key = (date, numéro de game, clé de partie), values dans l'ordre de SUM_FIELDS."""
+    sort_key: Tuple[datetime.date, int, str]
+    game_key: str
+    type_partie: str
+    values: Tuple[float, ...]
+
+
+def metrics(sums: Sequence[float], games: float) -> Tuple[float, float, float, float]:
+    """KDA, CS/min, KP et vision/min (ordre de METRICS) de sommes, ou de moyennes avec games = 1.
+
+    Les morts sont ramenées à 1 au minimum, comme dans les rollups et les stats par patch.
+    """
+    kills, deaths, assists, cs, vision, duration, kp = sums
+    return (
+        (kills + assists) / max(deaths, 1),
+        cs / duration if duration > 0 else np.nan,
+        kp / games if games > 0 else np.nan,
+        vision / duration if duration > 0 else np.nan,
+    )
+
+
+class RollingWindow:
+    """Sommes des `size` dernières parties, mises à jour en O(1) par partie."""
+
+    def __init__(self, size: int):
+        self.size = size
+        self._games: Deque[TrendGame] = deque()
+        self._sums = [0.0] * len(SUM_FIELDS)
+
+    def push(self, game: TrendGame) -> Tuple[float, float, float, float]:
+        self._games.append(game)
+        if len(self._games) > self.size:
+            oldest = self._games.popleft().values
+            self._sums = [total + value - old for total, value, old in zip(self._sums, game.values, oldest)]
+        else:
+            self._sums = [total + value for total, value in zip(self._sums, game.values)]
+        return metrics(self._sums, len(self._games))
+
+    def copy(self) -> 'RollingWindow':
+        clone = RollingWindow(self.size)
+        clone._games = deque(self._games)
+        clone._sums = list(self._sums)
+        return clone
+
+
+class ExponentialAverage:
+    """Moyennes exponentielles des sommes (s = alpha * x + (1 - alpha) * s), en O(1) par partie."""
+
+    def __init__(self, span: int):
+        self.alpha = 2 / (span + 1)
+        self._means: Optional[List[float]] = None
+
+    def push(self, game: TrendGame) -> Tuple[float, float, float, float]:
+        if self._means is None:
+            self._means = list(game.values)
+        else:
+            alpha = self.alpha
+            self._means = [mean + alpha * (value - mean) for mean, value in zip(self._means, game.values)]
+        return metrics(self._means, 1)
+
+    def copy(self) -> 'ExponentialAverage':
+        clone = ExponentialAverage.__new__(ExponentialAverage)
+        clone.alpha = self.alpha
+        clone._means = self._means
+        return clone
+
+
+class PlayerTrend:
+    """Série chronologique des parties d'un joueur avec ses points de tendance."""
+
+    def __init__(self, windows: Iterable[int] = DEFAULT_WINDOWS, span: int = DEFAULT_SPAN):
+        self.windows = tuple(windows)
+        self.span = span
+        self.games: List[TrendGame] = []
+        # Un tuple par partie : METRICS de la partie, de chaque fenêtre puis de la moyenne exponentielle
+        self.points: List[tuple] = []
+        self._frame: Optional[pd.DataFrame] = None
+        self._reset()
+
+    def _reset(self):
+        self.points = []
+        self._rolling = [RollingWindow(size) for size in self.windows]
+        self._ewm = ExponentialAverage(self.span)
+
+    def push(self, game: TrendGame):
+        """Ajoute une partie : O(1) si elle est la plus récente, sinon la série est recalculée."""
+        self._frame = None
+        if self.games and game.sort_key < self.games[-1].sort_key:
+            self.games.append(game)
+            self.games.sort(key=lambda item: item.sort_key)
+            self._reset()
+            for previous in self.games:
+                self._point(previous)
+            return
+        self.games.append(game)
+        self._point(game)
+
+    def copy(self) -> 'PlayerTrend':
+        """Copie que push() complète sans toucher à la série d'origine."""
+        clone = PlayerTrend(self.windows, self.span)
+        clone.games = list(self.games)
+        clone.points = list(self.points)
+        clone._rolling = [window.copy() for window in self._rolling]
+        clone._ewm = self._ewm.copy()
+        clone._frame = self._frame
+        return clone
+
+    def _point(self, game: TrendGame):
+        point = metrics(game.values, 1)
+        for window in self._rolling:
+            point += window.push(game)
+        self.points.append(point + self._ewm.push(game))
+
+    def frame(self) -> pd.DataFrame:
+        """Une ligne par partie (index game = rang chronologique à partir de 1), gardée jusqu'au prochain ajout."""
+        if self._frame is not None:
+            return self._frame
+        columns = METRICS + [f"{metric}_{size}" for size in self.windows for metric in METRICS] \
+            + [f"{metric}_ewm" for metric in METRICS]
+        frame = pd.DataFrame(self.points, columns=columns, dtype='float64')
+        frame.insert(0, 'game_key', [game.game_key for game in self.games])
+        frame.insert(1, 'date', pd.to_datetime([game.sort_key[0] for game in self.games]))
+        frame.insert(2, 'numero_game', [game.sort_key[1] for game in self.games])
+        frame.insert(3, 'type_partie', [game.type_partie for game in self.games])
+        frame.index = pd.RangeIndex(1, len(frame) + 1, name='game')
+        self._frame = frame
+        return frame
+
+
+class TrendEngine:
+    """Séries de tendance par joueur et type de partie ('Global' = toutes les parties).
+
+    extend() pousse les parties ajoutées dans les séries concernées ; après un
+    retrait de parties, l'analyzer reconstruit le moteur comme les autres index.
+    copy() partage les séries avec le moteur d'origine : extend() ne copie que
+    celles qu'il complète.
+    """
+
+    def __init__(self, rows: Optional[pd.DataFrame] = None, windows: Iterable[int] = DEFAULT_WINDOWS,
+                 span: int = DEFAULT_SPAN):
+        self.windows = tuple(windows)
+        self.span = span
+        self._series: Dict[Tuple[str, str], PlayerTrend] = {}
+        self._game_keys: set = set()
+        # Séries encore partagées avec le moteur dont celui-ci est une copie
+        self._shared: set = set()
+        if rows is not None:
+            self.extend(rows)
+
+    def __contains__(self, game_key: str) -> bool:
+        return game_key in self._game_keys
+
+    def copy(self) -> 'TrendEngine':
+        """Copie que extend() complète sans toucher au moteur d'origine."""
+        clone = TrendEngine(windows=self.windows, span=self.span)
+        clone._series = dict(self._series)
+        clone._game_keys = set(self._game_keys)
+        clone._shared = set(self._series)
+        return clone
+
+    def extend(self, rows: pd.DataFrame):
+        """Ajoute des parties de joueurs (voir player_game_rows), dans l'ordre chronologique."""
+        for player_name, game in sorted(trend_games(rows), key=lambda item: item[1].sort_key):
+            self._game_keys.add(game.game_key)
+            for scope in ('Global', game.type_partie):
+                series = self._series.get((player_name, scope))
+                if series is None:
+                    series = self._series[(player_name, scope)] = PlayerTrend(self.windows, self.span)
+                elif (player_name, scope) in self._shared:
+                    series = self._series[(player_name, scope)] = series.copy()
+                    self._shared.discard((player_name, scope))
+                series.push(game)
+
+    def series(self, player_name: str, game_type: str = "Global",
+               game_keys: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """Tendance d'un joueur ; avec game_keys, recalculée sur ces seules parties (filtres)."""
+        series = self._series.get((player_name, game_type or "Global"))
+        if series is None:
+            return PlayerTrend(self.windows, self.span).frame()
+        if game_keys is None:
+            return series.frame()
+        keys = set(game_keys)
+        filtered = PlayerTrend(self.windows, self.span)
+        for game in series.games:
+            if game.game_key in keys:
+                filtered.push(game)
+        return filtered.frame()
+
+
+def player_game_rows(table: pd.DataFrame) -> pd.DataFrame:
+    """Une ligne par (joueur du roster, partie) d'une table de parties complètes, avec la KP de l'historique."""
+    rows = table[table['player'].notna().to_numpy()]
+    roster_kills = table['CHAMPIONS_KILLED'].astype('int64').where(table['player'].notna(), 0)
+    team_kills = roster_kills.groupby(table['game_key'].astype(str), sort=False).sum()
+    rows = rows.drop_duplicates(['player', 'game_key'])
+    game_team_kills = team_kills.reindex(rows['game_key'].astype(str)).to_numpy()
+    contribution = (rows['CHAMPIONS_KILLED'].astype('int64') + rows['ASSISTS'].astype('int64')).to_numpy()
+    kp = np.divide(contribution * 100, game_team_kills, out=np.zeros(len(rows)), where=game_team_kills > 0).round(1)
+    return pd.DataFrame({
+        'player': rows['player'].astype(str).to_numpy(),
+        'game_key': rows['game_key'].astype(str).to_numpy(),
+        'date': rows['date'].astype(str).to_numpy(),
+        'numero_game': rows['numero_game'].astype(str).to_numpy(),
+        'type_partie': rows['type_partie'].astype(str).to_numpy(),
+        'kills': rows['CHAMPIONS_KILLED'].to_numpy().astype('int64'),
+        'deaths': rows['NUM_DEATHS'].to_numpy().astype('int64'),
+        'assists': rows['ASSISTS'].to_numpy().astype('int64'),
+        'cs': rows['Missions_CreepScore'].to_numpy().astype('int64'),
+        'vision': rows['VISION_SCORE'].to_numpy().astype('int64'),
+        'duration_min': rows['duration_min'].to_numpy().astype('float64'),
+        'kp': kp,
+    })
+
+
+def trend_games(rows: pd.DataFrame) -> List[Tuple[str, TrendGame]]:
+    """(joueur, TrendGame) pour chaque ligne de player_game_rows."""
+    dates = {value: _parse_date(value) for value in rows['date'].unique()}
+    return [
+        (player_name, TrendGame(
+            sort_key=(dates[date], _game_number(numero_game), game_key),
+            game_key=game_key, type_partie=type_partie,
+            values=(int(kills), int(deaths), int(assists), int(cs), int(vision), float(duration_min), float(kp)),
+        ))
+        for player_name, game_key, date, numero_game, type_partie, kills, deaths, assists, cs, vision,
+        duration_min, kp in rows.itertuples(index=False, name=None)
+    ]
+
+
+def _parse_date(value: str) -> datetime.date:
+    """Date de nom de fichier (ddmmyyyy) ; les dates illisibles sont classées en premier."""
+    try:
+        return datetime.datetime.strptime(value, '%d%m%Y').date()
+    except ValueError:
+        return datetime.date.min
+
+
+def _game_number(value: str) -> int:
+    return int(value) if value.isdigit() else 0
@@ -0,0 +1,320 @@
+"""Génération en lot des rapports (JSON, CSV, HTML) sans passer par Streamlit.
+
+Les données sont chargées une fois ; un rapport est produit pour les stats
+globales et pour chaque joueur du roster, pour chaque type de partie, avec
+les mêmes filtres optionnels. Les rapports peuvent être calculés en
+parallèle (--workers) et, en mode incrémental, seuls ceux dont les parties
+d'entrée (ou le roster, les filtres, les templates) ont changé sont régénérés.
+Les données de chaque rapport viennent de data_processing.report_data ; ce
+module les met en forme et écrit les fichiers.
+
+Usage :
+    python run.py report --output reports/
+    python run.py report --output reports/ --incremental --workers 0
+    python run.py report --game-types Tournoi --date-from 2025-05-01
+"""
+import argparse
+import datetime
+import functools
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+
+from data_processing.filters import GAME_TYPES
+from data_processing.report_data import FILTER_NAMES, ReportJob, build_report, job_fingerprint, plan_jobs
+from data_processing.snapshot import schema_signature
+from data_processing.stats_analyzer import StatsAnalyzer
+from utils.champion_assets import prefetch_assets, set_game_patch
+from utils.formatters import format_champion_name, get_champion_icon_url
+from utils.helpers import json_default
+
+# À incrémenter quand le contenu des rapports change (invalide le mode incrémental)
+REPORT_VERSION = 1
+REPORT_MANIFEST = 'report_manifest.json'
+ROOT_DIR = Path(__file__).resolve().parent.parent.parent
+TEMPLATES_DIR = ROOT_DIR / 'templates'
+STATIC_DIR = ROOT_DIR / 'static'
+
+
+def run_context(analyzer: StatsAnalyzer) -> str:
+    """Partie commune à toutes les empreintes : version du format, roster et templates."""
+    digest = hashlib.sha1(f"{REPORT_VERSION}\n".encode('utf-8'))
+    digest.update(schema_signature(analyzer.roster.to_dict(), analyzer.extra_fields).encode('utf-8'))
+    for path in sorted(TEMPLATES_DIR.rglob('*.html')) + [STATIC_DIR / 'css' / 'player_stats.css']:
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def write_report(output_dir: str, job: ReportJob, report: Dict) -> List[str]:
+    """Écrit <nom>.json, <nom>.csv, <nom>_champions.csv et <nom>.html ; retourne les fichiers écrits."""
+    base = os.path.join(output_dir, job.name)
+    os.makedirs(os.path.dirname(base), exist_ok=True)
+    written = []
+
+    with open(f"{base}.json", 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False, default=json_default)
+    written.append(f"{base}.json")
+
+    if job.player_name is None:
+        rows, champions, html = _global_tables(job, report)
+    else:
+        rows, champions, html = _player_tables(job, report)
+    rows.to_csv(f"{base}.csv", index=False)
+    champions.to_csv(f"{base}_champions.csv", index=False)
+    with open(f"{base}.html", 'w', encoding='utf-8') as f:
+        f.write(html)
+    written.extend([f"{base}.csv", f"{base}_champions.csv", f"{base}.html"])
+    return written
+
+
+def _global_tables(job: ReportJob, report: Dict) -> Tuple[pd.DataFrame, pd.DataFrame, str]:
+    stats = report['stats']
+    players = [
+        {
+            'name': player_name,
+            'role': data['role'],
+            'games': data['games'],
+            'wins': data['wins'],
+            'winrate': data['wins'] / data['games'] * 100 if data['games'] else 0,
+            'kda': data['kda'],
+            'kp': data['kp'],
+            'cs_per_min': data['cs_per_min'],
+            'vision_per_min': data['vision_per_min'],
+        }
+        for player_name, data in stats['player_stats'].items()
+    ]
+    champions = pd.DataFrame(
+        [{'champion': champion, 'games': data['games'], 'wins': data['wins']}
+         for champion, data in stats['champion_stats'].items()],
+        columns=['champion', 'games', 'wins'],
+    ).sort_values('games', ascending=False, kind='stable')
+    champions['winrate'] = (champions['wins'] / champions['games'] * 100).round(1)
+
+    html = _environment().get_template('report_global.html').render(
+        game_type=job.game_type,
+        stats=stats,
+        players=[dict(player, link=f"../{ReportJob(job.game_type, player['name']).name}.html") for player in players],
+        champions=[
+            _champion_row(row.champion, row.games, row.winrate, '-', '-')
+            for row in champions.itertuples(index=False)
+        ],
+    )
+    return pd.DataFrame(players), champions, html
+
+
+def _player_tables(job: ReportJob, report: Dict) -> Tuple[pd.DataFrame, pd.DataFrame, str]:
+    stats = report['stats']
+    history = pd.DataFrame(stats['match_history'])
+    champions = pd.DataFrame(report['champions'])
+    history_rows = []
+    if len(history):
+        cs_per_min = history['Missions_CreepScore'] / (history['gameDuration'] / 60000)
+        history_rows = [
+            {
+                'date': _format_date(game.date),
+                'champion': format_champion_name(game.SKIN),
+                'result': game.Win,
+                'type_partie': game.type_partie,
+                'equipe_adverse': game.equipe_adverse,
+                'kda': game.KDA,
+                'kp': game.KP,
+                'cs_per_min': cs,
+                'vision_score': game.VISION_SCORE,
+            }
+            for game, cs in zip(history.itertuples(index=False), cs_per_min)
+        ]
+
+    grid = {
+        'kda': stats['kda'],
+        'avg_kills': stats['avg_kills'],
+        'cs_per_min': stats['avg_cspm'],
+        'avg_vision': stats['avg_vision'],
+        'kp': float(history['KP'].mean()) if len(history) else 0,
+    }
+    html = _environment().get_template('report_player.html').render(
+        player_name=job.player_name,
+        game_type=job.game_type,
+        stats=grid,
+        champions=[
+            _champion_row(row.SKIN, row.games, row.winrate, f"{row.kda:.2f}", f"{row.kp:.1f}%")
+            for row in champions.itertuples(index=False)
+        ],
+        history=history_rows,
+    )
+    return history, champions, html
+
+
+def _champion_row(champion: str, games: int, winrate: float, kda: str, kp: str) -> Dict:
+    return {
+        'name': format_champion_name(champion),
+        'icon_url': get_champion_icon_url(champion),
+        'games': int(games),
+        'winrate': round(float(winrate), 1),
+        'kda': kda,
+        'kp': kp,
+        'wr_color': '#2ECC71' if winrate >= 50 else '#E74C3C',
+    }
+
+
+def write_index(output_dir: str, jobs: List[ReportJob], game_types: List[str], filters: Dict):
+    rows = [{'label': 'Global', 'links': [f"{ReportJob(game_type).name}.html" for game_type in game_types]}]
+    players = list(dict.fromkeys(job.player_name for job in jobs if job.player_name is not None))
+    rows.extend(
+        {'label': player_name, 'links': [f"{ReportJob(game_type, player_name).name}.html" for game_type in game_types]}
+        for player_name in players
+    )
+    html = _environment().get_template('report_index.html').render(
+        generated_at=datetime.datetime.now().strftime('%d/%m/%Y %H:%M'),
+        filters=', '.join(f"{name} = {value}" for name, value in filters.items() if value is not None),
+        game_types=game_types,
+        rows=rows,
+    )
+    with open(os.path.join(output_dir, 'index.html'), 'w', encoding='utf-8') as f:
+        f.write(html)
+
+
+def run_job(analyzer: StatsAnalyzer, job: ReportJob, filters: Dict, output_dir: str) -> Tuple[str, List[str]]:
+    return job.name, write_report(output_dir, job, build_report(analyzer, job, filters))
+
+
+# Analyzer propre à chaque process worker, chargé depuis le snapshot à son démarrage
+_worker_analyzer: Optional[StatsAnalyzer] = None
+
+
+def _init_worker(data_path: str, cache_dir: Optional[str], roster_path: Optional[str]):
+    global _worker_analyzer
+    _worker_analyzer = StatsAnalyzer(data_path, cache_dir=cache_dir, roster_path=roster_path, result_cache_size=0)
+    set_game_patch(_worker_analyzer.latest_patch())
+    prefetch_assets(wait=True)
+
+
+def _run_in_worker(job: ReportJob, filters: Dict, output_dir: str) -> Tuple[str, List[str]]:
+    return run_job(_worker_analyzer, job, filters, output_dir)
+
+
+def generate_reports(analyzer: StatsAnalyzer, output_dir: str, game_types: List[str] = GAME_TYPES,
+                     players: Optional[List[str]] = None, filters: Optional[Dict] = None,
+                     incremental: bool = False, workers: int = 1, executor: str = 'process',
+                     roster_path: Optional[str] = None) -> Dict[str, List[str]]:
+    """Génère les rapports ; retourne {'generated': [...], 'skipped': [...]} (noms des rapports).
+
+    workers : 1 = série, 0 = un worker par cœur, n = n workers ('process' ou 'thread').
+    """
+    filters = {name: (filters or {}).get(name) for name in FILTER_NAMES}
+    os.makedirs(output_dir, exist_ok=True)
+    # Icônes des champions du patch des parties les plus récentes
+    set_game_patch(analyzer.latest_patch())
+    # Reports are written once: wait for the atlas rather than fall back to remote icons
+    prefetch_assets(wait=True)
+    manifest_path = os.path.join(output_dir, REPORT_MANIFEST)
+    previous = _read_manifest(manifest_path)
+
+    jobs = plan_jobs(analyzer, game_types, players)
+    context = run_context(analyzer)
+    digests = analyzer.game_digests()
+    fingerprints = {job.name: job_fingerprint(analyzer, job, filters, digests, context) for job in jobs}
+    pending = [
+        job for job in jobs
+        if not (incremental and previous.get(job.name) == fingerprints[job.name]
+                and os.path.exists(os.path.join(output_dir, f"{job.name}.html")))
+    ]
+
+    workers = workers if workers > 0 else (os.cpu_count() or 1)
+    if workers == 1 or len(pending) <= 1:
+        results = [run_job(analyzer, job, filters, output_dir) for job in pending]
+    elif executor == 'thread':
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(lambda job: run_job(analyzer, job, filters, output_dir), pending))
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(analyzer.data_path, analyzer.cache_dir, roster_path)) as pool:
+            results = list(pool.map(_run_in_worker, pending, [filters] * len(pending), [output_dir] * len(pending)))
+
+    write_index(output_dir, jobs, game_types, filters)
+    manifest = dict(previous)
+    manifest.update(fingerprints)
+    _write_manifest(manifest_path, manifest)
+    generated = [name for name, _ in results]
+    pending_names = set(generated)
+    return {'generated': generated, 'skipped': [job.name for job in jobs if job.name not in pending_names]}
+
+
+def _read_manifest(path: str) -> Dict[str, str]:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f).get('reports', {})
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_manifest(path: str, reports: Dict[str, str]):
+    with open(f"{path}.tmp", 'w', encoding='utf-8') as f:
+        json.dump({'version': REPORT_VERSION, 'reports': reports}, f, indent=2)
+    os.replace(f"{path}.tmp", path)
+
+
+@functools.lru_cache(maxsize=None)
+def _environment() -> Environment:
+    # static/ permet à base.html d'inclure css/player_stats.css
+    return Environment(
+        loader=FileSystemLoader([str(TEMPLATES_DIR), str(STATIC_DIR)]),
+        autoescape=select_autoescape(['html']),
+    )
+
+
+def _format_date(value: str) -> str:
+    """ddmmyyyy -> dd/mm/yyyy (inchangé si le format est différent)."""
+    if isinstance(value, str) and len(value) == 8 and value.isdigit():
+        return f"{value[:2]}/{value[2:4]}/{value[4:]}"
+    return value
+
+
+def _parse_date_arg(value: str) -> datetime.date:
+    try:
+        return datetime.date.fromisoformat(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"date invalide (AAAA-MM-JJ attendu) : {value}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="run.py report", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--data", default="data/", help="Dossier des fichiers de parties")
+    parser.add_argument("--cache-dir", help="Dossier du cache d'ingestion (défaut <data>/.cache)")
+    parser.add_argument("--roster", help="Fichier roster (défaut roster.json)")
+    parser.add_argument("--output", default="reports", help="Dossier de sortie")
+    parser.add_argument("--game-types", nargs="+", default=GAME_TYPES, choices=GAME_TYPES)
+    parser.add_argument("--players", nargs="+", help="Joueurs à inclure (défaut : tout le roster)")
+    parser.add_argument("--opponent")
+    parser.add_argument("--tournament")
+    parser.add_argument("--patch")
+    parser.add_argument("--squad")
+    parser.add_argument("--date-from", type=_parse_date_arg)
+    parser.add_argument("--date-to", type=_parse_date_arg)
+    parser.add_argument("--incremental", action="store_true",
+                        help="Ne régénère que les rapports dont les entrées ont changé")
+    parser.add_argument("--workers", type=int, default=1, help="1 = série, 0 = un par cœur")
+    parser.add_argument("--executor", choices=["process", "thread"], default="process")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    analyzer = StatsAnalyzer(args.data, cache_dir=args.cache_dir, roster_path=args.roster)
+    unknown = sorted(set(args.players or []) - set(analyzer.players))
+    if unknown:
+        parser.error(f"joueurs absents du roster : {', '.join(unknown)}")
+
+    filters = {name: getattr(args, name) for name in FILTER_NAMES}
+    result = generate_reports(
+        analyzer, args.output, args.game_types, args.players, filters,
+        incremental=args.incremental, workers=args.workers, executor=args.executor, roster_path=args.roster,
+    )
+    print(f"{len(result['generated'])} rapports générés, {len(result['skipped'])} inchangés "
+          f"dans {args.output} ({time.perf_counter() - start:.1f} s)")
+    return 0
@@ -0,0 +1,352 @@
+"""Local champion asset store: metadata, icons and a sprite atlas per patch.
+
+Assets are fetched once from a source laid out like Data Dragon
+(cdn/<patch>/data/en_US/champion.json, cdn/<patch>/img/champion/<id>.png)
+and kept on disk under <cache dir>/<patch>/, so later runs work offline.
+The source is ddragon by default; SC_ESPORT_ASSETS_SOURCE can point to a
+local mirror directory or another server (e.g. a mock), or be "none" to
+skip the store and use remote icon URLs. The Data Dragon version follows
+the patch of the most recent games (set_game_patch), unless
+SC_ESPORT_ASSETS_PATCH pins one. Assets already on disk are read on first
+use; missing ones are downloaded in the background while pages keep the
+previous assets (or remote icon URLs), and a failed download is retried
+with exponential backoff.
+
+All icons of a patch are packed into one atlas image; pages reference an icon
+with CSS offsets into it (see atlas_css and ChampionAtlas.icon_style)
+instead of one image request per icon.
+"""
+import abc
+import base64
+import io
+import json
+import math
+import os
+import re
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from PIL import Image
+
+from utils.html_cache import emit_css
+
+DDRAGON_URL = "https://ddragon.leagueoflegends.com"
+# Used when SC_ESPORT_ASSETS_PATCH is unset and no game patch is known
+DEFAULT_PATCH = "15.11.1"
+DEFAULT_CACHE_DIR = os.path.join("data", ".cache", "champions")
+ASSETS_SOURCE_ENV = 'SC_ESPORT_ASSETS_SOURCE'
+ASSETS_PATCH_ENV = 'SC_ESPORT_ASSETS_PATCH'
+ASSETS_DIR_ENV = 'SC_ESPORT_ASSETS_DIR'
+
+# Icons are displayed at 30 to 48px: 64px cells stay sharp without a huge atlas
+ATLAS_CELL = 64
+FETCH_WORKERS = 8
+# Delay before retrying a failed load, doubled after each failure up to the maximum (seconds)
+RETRY_DELAY = 30.0
+RETRY_MAX_DELAY = 900.0
+
+
+class AssetUnavailable(Exception):
+    """The requested asset is neither cached on disk nor available from the source."""
+
+
+class AssetSource(abc.ABC):
+    """Where assets are fetched from; paths follow the Data Dragon layout."""
+
+    @abc.abstractmethod
+    def fetch(self, path: str) -> bytes:
+        """Bytes of the asset at `path`; raises AssetUnavailable when it cannot be fetched."""
+
+
+class HttpSource(AssetSource):
+    def __init__(self, base_url: str = DDRAGON_URL, timeout: float = 5.0):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+
+    def fetch(self, path: str) -> bytes:
+        try:
+            with urllib.request.urlopen(f"{self.base_url}/{path}", timeout=self.timeout) as response:
+                return response.read()
+        except OSError as e:
+            raise AssetUnavailable(f"{self.base_url}/{path}: {e}") from e
+
+
+class DirectorySource(AssetSource):
+    """Local mirror of the Data Dragon tree (or of the parts the app needs)."""
+
+    def __init__(self, root: str):
+        self.root = Path(root)
+
+    def fetch(self, path: str) -> bytes:
+        try:
+            return (self.root / path).read_bytes()
+        except OSError as e:
+            raise AssetUnavailable(str(e)) from e
+
+
+def source_from_setting(setting: Optional[str]) -> Optional[AssetSource]:
+    """Source for a SC_ESPORT_ASSETS_SOURCE value (URL, directory, "none" or unset for ddragon)."""
+    if not setting:
+        return HttpSource()
+    if setting.lower() == 'none':
+        return None
+    if setting.startswith(('http://', 'https://')):
+        return HttpSource(setting)
+    return DirectorySource(setting)
+
+
+def champion_key(name: str) -> str:
+    """Data Dragon id of a champion as written in the data or in the UI."""
+    key = name.replace(" ", "")
+    return "MonkeyKing" if key == "Wukong" else key
+
+
+@dataclass
+class ChampionAtlas:
+    patch: str
+    cell: int
+    columns: int
+    rows: int
+    image_uri: str
+    positions: Dict[str, Tuple[int, int]] = field(default_factory=dict)
+
+    def icon_style(self, champion: str, size: int) -> Optional[str]:
+        """Inline style placing `champion` in a .champion-sprite element, None if it is not in the atlas."""
+        position = self.positions.get(champion_key(champion))
+        if position is None:
+            return None
+        column, row = position
+        return f"--s:{size}px;--c:{column};--r:{row}"
+
+
+class ChampionAssetStore:
+    """Champion metadata, icons and atlas of one patch, cached on disk."""
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, patch: str = DEFAULT_PATCH,
+                 source: Optional[AssetSource] = None):
+        self.patch = patch
+        self.source = source
+        self.patch_dir = Path(cache_dir) / patch
+        self._metadata: Optional[Dict[str, Dict]] = None
+
+    def _cached(self, relative: str, remote: str) -> bytes:
+        """Bytes of an asset from the disk cache, fetched from the source on a miss."""
+        path = self.patch_dir / relative
+        if path.exists():
+            return path.read_bytes()
+        if self.source is None:
+            raise AssetUnavailable(f"{path} is not cached and no source is configured")
+        data = self.source.fetch(remote)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+        return data
+
+    def is_cached(self, cell: int = ATLAS_CELL) -> bool:
+        """True when the metadata and the atlas are on disk (loading them needs no download)."""
+        return all((self.patch_dir / name).exists()
+                   for name in ("champion.json", f"atlas-{cell}.webp", f"atlas-{cell}.json"))
+
+    def metadata(self) -> Dict[str, Dict]:
+        """champion.json entries by champion id."""
+        if self._metadata is None:
+            raw = self._cached("champion.json", f"cdn/{self.patch}/data/en_US/champion.json")
+            self._metadata = json.loads(raw)['data']
+        return self._metadata
+
+    def display_names(self) -> Dict[str, str]:
+        return {champion_id: entry['name'] for champion_id, entry in self.metadata().items()}
+
+    def icon(self, champion_id: str) -> bytes:
+        return self._cached(f"icons/{champion_id}.png", f"cdn/{self.patch}/img/champion/{champion_id}.png")
+
+    def atlas(self, cell: int = ATLAS_CELL) -> ChampionAtlas:
+        """Atlas of every champion of the patch, built on first use and then read from disk."""
+        image_path = self.patch_dir / f"atlas-{cell}.webp"
+        index_path = self.patch_dir / f"atlas-{cell}.json"
+        if not (image_path.exists() and index_path.exists()):
+            self._build_atlas(cell, image_path, index_path)
+        index = json.loads(index_path.read_text(encoding='utf-8'))
+        image_uri = f"data:image/webp;base64,{base64.b64encode(image_path.read_bytes()).decode('utf-8')}"
+        return ChampionAtlas(
+            patch=self.patch,
+            cell=cell,
+            columns=index['columns'],
+            rows=index['rows'],
+            image_uri=image_uri,
+            positions={champion: tuple(position) for champion, position in index['positions'].items()},
+        )
+
+    def _build_atlas(self, cell: int, image_path: Path, index_path: Path):
+        champion_ids = sorted(self.metadata())
+        with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as executor:
+            icons = list(executor.map(self._icon_or_none, champion_ids))
+        available = [(champion_id, data) for champion_id, data in zip(champion_ids, icons) if data is not None]
+        if not available:
+            raise AssetUnavailable(f"no champion icon available for patch {self.patch}")
+
+        columns = math.ceil(math.sqrt(len(available)))
+        rows = math.ceil(len(available) / columns)
+        sheet = Image.new('RGB', (columns * cell, rows * cell))
+        positions = {}
+        for i, (champion_id, data) in enumerate(available):
+            column, row = i % columns, i // columns
+            with Image.open(io.BytesIO(data)) as icon:
+                sheet.paste(icon.convert('RGB').resize((cell, cell), Image.LANCZOS), (column * cell, row * cell))
+            positions[champion_id] = [column, row]
+
+        sheet.save(image_path, format='WEBP', quality=85, method=6)
+        tmp_path = index_path.with_name(f"{index_path.name}.tmp")
+        tmp_path.write_text(json.dumps({'columns': columns, 'rows': rows, 'positions': positions}), encoding='utf-8')
+        os.replace(tmp_path, index_path)
+
+    def _icon_or_none(self, champion_id: str) -> Optional[bytes]:
+        try:
+            return self.icon(champion_id)
+        except AssetUnavailable as e:
+            print(f"Champion icon unavailable: {str(e)}")
+            return None
+
+
+def atlas_css(atlas: ChampionAtlas) -> str:
+    """Stylesheet of the .champion-sprite element; each element sets --s (size), --c and --r (cell)."""
+    return f"""
+        .champion-sprite {{
+            display: inline-block;
+            vertical-align: middle;
+            width: var(--s);
+            height: var(--s);
+            background-image: url({atlas.image_uri});
+            background-size: calc(var(--s) * {atlas.columns}) calc(var(--s) * {atlas.rows});
+            background-position: calc(var(--c) * var(--s) * -1) calc(var(--r) * var(--s) * -1);
+        }}
+    """
+
+
+# Assets per Data Dragon version, loaded once per process. The lock only guards
+# these dicts: loads run in their own thread, and a session that needs a version
+# that is still loading (or waiting to be retried) uses the previous assets meanwhile.
+_lock = threading.Lock()
+_loaded: Dict[str, Tuple[Optional[ChampionAtlas], Dict[str, str]]] = {}
+_loading: Dict[str, threading.Thread] = {}
+# Failed versions: (failed attempts, time.monotonic() of the next attempt)
+_failed: Dict[str, Tuple[int, float]] = {}
+_latest: Tuple[Optional[ChampionAtlas], Dict[str, str]] = (None, {})
+_game_patch: Optional[str] = None
+
+
+def _store(patch: str) -> Optional[ChampionAssetStore]:
+    """Store of a version, None when SC_ESPORT_ASSETS_SOURCE is "none"."""
+    source = source_from_setting(os.environ.get(ASSETS_SOURCE_ENV))
+    if source is None:
+        return None
+    return ChampionAssetStore(os.environ.get(ASSETS_DIR_ENV, DEFAULT_CACHE_DIR), patch, source)
+
+
+def _load(patch: str) -> Tuple[Tuple[Optional[ChampionAtlas], Dict[str, str]], bool]:
+    """(atlas, display names) of a version and whether they loaded; the atlas is None on failure."""
+    store = _store(patch)
+    if store is None:
+        return (None, {}), True
+    display_names: Dict[str, str] = {}
+    try:
+        display_names = store.display_names()
+        return (store.atlas(), display_names), True
+    except (AssetUnavailable, OSError, ValueError, KeyError) as e:
+        print(f"Champion assets unavailable, using remote icons: {str(e)}")
+        return (None, display_names), False
+
+
+def _load_and_publish(patch: str):
+    """Load a version and publish it, or schedule its next attempt when it fails."""
+    global _latest
+    assets, loaded = _load(patch)
+    with _lock:
+        _loading.pop(patch, None)
+        if loaded:
+            _loaded[patch] = assets
+            _failed.pop(patch, None)
+            _latest = assets
+            return
+        attempts = _failed[patch][0] + 1 if patch in _failed else 1
+        _failed[patch] = (attempts, time.monotonic() + min(RETRY_MAX_DELAY, RETRY_DELAY * 2 ** (attempts - 1)))
+        if _latest[0] is None:
+            # No atlas loaded yet: at least keep the display names
+            _latest = assets
+
+
+def _assets(wait: bool = False) -> Tuple[Optional[ChampionAtlas], Dict[str, str]]:
+    """Assets of the current version, or the previous ones while it loads.
+
+    The first caller starts the load; it waits for it only when the assets are
+    already on disk (or with wait=True), so a download never blocks a render.
+    """
+    patch = assets_patch()
+    with _lock:
+        assets = _loaded.get(patch)
+        if assets is not None:
+            return assets
+        loader = _loading.get(patch)
+        start = loader is None and (patch not in _failed or time.monotonic() >= _failed[patch][1])
+        if start:
+            loader = _loading[patch] = threading.Thread(target=_load_and_publish, args=(patch,),
+                                                        name=f"champion-assets-{patch}", daemon=True)
+            loader.start()
+        fallback = _latest
+    if start:
+        store = _store(patch)
+        wait = wait or store is None or store.is_cached()
+    if loader is None or not wait:
+        return fallback
+    loader.join()
+    with _lock:
+        return _loaded.get(patch, _latest)
+
+
+def prefetch_assets(wait: bool = False):
+    """Start loading the assets of the current version if needed; wait=True blocks until the load ends."""
+    _assets(wait)
+
+
+def get_atlas() -> Optional[ChampionAtlas]:
+    """Atlas shared by the process, None when the assets could not be loaded."""
+    return _assets()[0]
+
+
+def ddragon_version(game_patch: str) -> Optional[str]:
+    """Data Dragon version of a major.minor game patch ('15.10' -> '15.10.1'), None if it is not one."""
+    return f"{game_patch}.1" if re.fullmatch(r"\d+\.\d+", game_patch or "") else None
+
+
+def set_game_patch(game_patch: Optional[str]):
+    """Use the assets of this game patch (usually the latest one in the data); cheap when it is unchanged."""
+    global _game_patch
+    _game_patch = game_patch
+
+
+def assets_patch() -> str:
+    """Data Dragon version to load: SC_ESPORT_ASSETS_PATCH, else the game patch, else DEFAULT_PATCH."""
+    return os.environ.get(ASSETS_PATCH_ENV) or ddragon_version(_game_patch) or DEFAULT_PATCH
+
+
+def current_patch() -> str:
+    atlas = get_atlas()
+    return atlas.patch if atlas is not None else assets_patch()
+
+
+def emit_atlas_css():
+    """Emit the sprite stylesheet (a no-op when the atlas is unavailable)."""
+    atlas = get_atlas()
+    if atlas is not None:
+        emit_css(f"champion_atlas_{atlas.patch}", lambda: atlas_css(atlas))
+
+
+def get_display_names() -> Dict[str, str]:
+    """Champion display names by id from the patch metadata (empty when unavailable)."""
+    return _assets()[1]
@@ -1,7 +1,19 @@
 """Utility functions for formatting data in the SC-Esport-Stats application."""
+import functools
+from html import escape
+from typing import Optional
+
+from utils.champion_assets import champion_key, current_patch, get_atlas, get_display_names
 
 def format_champion_name(name: str) -> str:
-    """Format champion name for display."""
+    """Format champion name for display (name from the patch metadata when available)."""
+    display = get_display_names().get(name)
+    if display is not None:
+        return display
+    return _split_champion_name(name)
+
+@functools.lru_cache(maxsize=None)
+def _split_champion_name(name: str) -> str:
     if name == "MonkeyKing":
         return "Wukong"
     
@@ -14,7 +26,21 @@ def format_champion_name(name: str) -> str:
 
 def get_champion_icon_url(champion_name: str) -> str:
     """Get champion icon URL."""
-    formatted_name = champion_name.replace(" ", "")
-    if formatted_name == "Wukong":
-        formatted_name = "MonkeyKing"
-    return f"https://ddragon.leagueoflegends.com/cdn/15.11.1/img/champion/{formatted_name}.png"
\ No newline at end of file
+    return f"https://ddragon.leagueoflegends.com/cdn/{current_patch()}/img/champion/{champion_key(champion_name)}.png"
+
+def champion_sprite_html(champion_name: str, size: int, css_class: str = "", title: Optional[str] = None) -> Optional[str]:
+    """Champion icon as an offset into the sprite atlas, None if the atlas does not have it."""
+    atlas = get_atlas()
+    style = atlas.icon_style(champion_name, size) if atlas is not None else None
+    if style is None:
+        return None
+    classes = f"champion-sprite {css_class}" if css_class else "champion-sprite"
+    title_attr = f' title="{escape(title)}"' if title else ""
+    return f'<span class="{classes}" style="{style}"{title_attr}></span>'
+
+def champion_icon_html(champion_name: str, size: int) -> str:
+    """Champion icon from the sprite atlas, or a remote <img> when the atlas does not have it."""
+    sprite = champion_sprite_html(champion_name, size)
+    if sprite is not None:
+        return sprite
+    return f'<img src="{get_champion_icon_url(champion_name)}" width="{size}" height="{size}">'
@@ -1,3 +1,7 @@
+import datetime
+
+import numpy as np
+
 def load_json(file_path):
     import json
     with open(file_path, 'r') as file:
@@ -9,4 +13,18 @@ def save_to_csv(data, file_path):
     df.to_csv(file_path, index=False)
 
 def format_date(date):
-    return date.strftime('%Y-%m-%d')
\ No newline at end of file
+    return date.strftime('%Y-%m-%d')
+
+def json_default(value):
+    """json.dump fallback for dates and numpy scalars/arrays found in stats dicts."""
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    if isinstance(value, np.integer):
+        return int(value)
+    if isinstance(value, np.bool_):
+        return bool(value)
+    if isinstance(value, np.floating):
+        return float(value)
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
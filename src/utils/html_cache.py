@@ -0,0 +1,126 @@
+"""Cache of rendered HTML fragments (cards, tables, CSS blocks).
+
+Fragments are keyed by a name and a content hash of the data they are rendered
+from, so an unchanged card or table reuses its HTML across reruns and sessions.
+Identical HTML also lets Streamlit send an already delivered element as a hash
+reference instead of the full payload (see global.minCachedMessageSize in
+.streamlit/config.toml).
+"""
+import hashlib
+import pickle
+import re
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+import pandas as pd
+import streamlit as st
+
+
+def content_hash(data: Any) -> str:
+    """Stable hash of the data a fragment is rendered from (dicts, lists, scalars, DataFrames)."""
+    digest = hashlib.sha1()
+    _update_hash(digest, data)
+    return digest.hexdigest()
+
+
+def _update_hash(digest, data: Any):
+    if isinstance(data, pd.DataFrame):
+        digest.update(repr((list(data.columns), list(data.index), list(data.dtypes.astype(str)))).encode('utf-8'))
+        digest.update(pd.util.hash_pandas_object(data, index=False).to_numpy().tobytes())
+    elif isinstance(data, (list, tuple)) and any(isinstance(item, pd.DataFrame) for item in data):
+        for item in data:
+            _update_hash(digest, item)
+    else:
+        digest.update(pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+class HtmlFragmentCache:
+    """Bounded LRU of rendered HTML, shared by all sessions of the server."""
+
+    def __init__(self, maxsize: int = 512):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Tuple[str, Hashable], str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_render(self, name: str, data: Any, render: Callable[[], str]) -> str:
+        key = (name, content_hash(data))
+        with self._lock:
+            html = self._entries.get(key)
+            if html is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return html
+            self.misses += 1
+
+        html = render()
+        with self._lock:
+            self._entries[key] = html
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return html
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'size': len(self._entries), 'maxsize': self.maxsize}
+
+
+fragment_cache = HtmlFragmentCache()
+
+
+def cached_html(name: str, data: Any, render: Callable[[], str]) -> str:
+    """Return the HTML of fragment `name` for `data`, rendering it only if it is not cached.
+
+    `data` must contain everything the rendered HTML depends on.
+    """
+    return fragment_cache.get_or_render(name, data, render)
+
+
+_CSS_COMMENT = re.compile(r'/\*.*?\*/', re.DOTALL)
+_CSS_SPACE_AROUND = re.compile(r'\s*([{};,])\s*')
+
+
+def minify_css(css: str) -> str:
+    """Drop comments and redundant whitespace from a stylesheet."""
+    css = _CSS_COMMENT.sub('', css)
+    css = ' '.join(css.split())
+    css = _CSS_SPACE_AROUND.sub(r'\1', css)
+    css = css.replace(': ', ':').replace(';}', '}')
+    return css.strip()
+
+
+_css_lock = threading.Lock()
+_css_blocks: Dict[str, str] = {}
+
+
+def style_block(name: str, build: Callable[[], str]) -> str:
+    """Minified <style> block built once per server process (static CSS)."""
+    block = _css_blocks.get(name)
+    if block is None:
+        block = f"<style>{minify_css(build())}</style>"
+        with _css_lock:
+            _css_blocks.setdefault(name, block)
+    return block
+
+
+def css_file_block(path: Path) -> str:
+    """<style> block for a CSS file, read from disk once per server process."""
+    return style_block(str(path), lambda: Path(path).read_text(encoding='utf-8'))
+
+
+def emit_css(name: str, build: Callable[[], str]):
+    """Emit a static CSS block.
+
+    Streamlit rebuilds the page on every rerun and removes elements that are not
+    emitted again, so the block is written on each rerun. The string is built
+    only once per process and is identical every time, so after the first
+    delivery Streamlit sends it as a hash reference.
+    """
+    st.markdown(style_block(name, build), unsafe_allow_html=True)
@@ -1,10 +1,59 @@
 import base64
+import io
+import mimetypes
+import os
+import threading
+from typing import Dict, Optional, Tuple
+
+from PIL import Image
+
+def thumbnail_bytes(image_path: str, max_size: int, quality: int = 85) -> Tuple[bytes, str]:
+    """Image resized to fit in max_size x max_size and recompressed; returns (bytes, mime type).
+
+    Images already small enough are returned as they are.
+    """
+    with Image.open(image_path) as image:
+        mime = Image.MIME.get(image.format, 'application/octet-stream')
+        if max(image.size) <= max_size:
+            with open(image_path, "rb") as image_file:
+                return image_file.read(), mime
+        image.thumbnail((max_size, max_size), Image.LANCZOS)
+        buffer = io.BytesIO()
+        if image.format == 'PNG' or image.mode in ('RGBA', 'LA', 'P'):
+            image.save(buffer, format='PNG', optimize=True)
+            return buffer.getvalue(), 'image/png'
+        image.convert('RGB').save(buffer, format='JPEG', quality=quality, optimize=True, progressive=True)
+        return buffer.getvalue(), 'image/jpeg'
+
+_data_uris: Dict[Tuple[str, Optional[int], float], str] = {}
+_data_uris_lock = threading.Lock()
+
+def image_data_uri(image_path: str, max_size: Optional[int] = None) -> str:
+    """data: URI of an image (resized to max_size if given), encoded once per process.
+
+    The entry is keyed by the file's modification time, so replacing the image
+    on disk is picked up without restarting the server.
+    """
+    try:
+        key = (os.path.abspath(image_path), max_size, os.path.getmtime(image_path))
+    except OSError as e:
+        print(f"Error loading image {image_path}: {e}")
+        return ""
+    uri = _data_uris.get(key)
+    if uri is not None:
+        return uri
 
-def get_image_as_base64(image_path: str) -> str:
-    """Convert an image file to base64 string."""
     try:
-        with open(image_path, "rb") as image_file:
-            return base64.b64encode(image_file.read()).decode('utf-8')
+        if max_size is None:
+            with open(image_path, "rb") as image_file:
+                data = image_file.read()
+            mime = mimetypes.guess_type(image_path)[0] or 'application/octet-stream'
+        else:
+            data, mime = thumbnail_bytes(image_path, max_size)
     except Exception as e:
         print(f"Error loading image {image_path}: {e}")
         return ""
+    uri = f"data:{mime};base64,{base64.b64encode(data).decode('utf-8')}"
+    with _data_uris_lock:
+        _data_uris[key] = uri
+    return uri
@@ -0,0 +1,94 @@
+"""On-demand cProfile of a full Streamlit rerun.
+
+Off by default. ?profile=1 in the URL profiles the next rerun only (the query
+param is removed afterwards); SC_ESPORT_PROFILE=1 profiles every rerun.
+Reports are written as .prof files (pstats format, viewable as a call tree or
+icicle/flame graph with snakeviz, flameprof or gprof2dot) plus a text summary.
+"""
+import cProfile
+import datetime
+import io
+import os
+import pstats
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+PROFILE_ENV = 'SC_ESPORT_PROFILE'
+PROFILE_DIR_ENV = 'SC_ESPORT_PROFILE_DIR'
+PROFILE_QUERY_PARAM = 'profile'
+DEFAULT_PROFILE_DIR = 'profiles'
+
+
+@dataclass
+class ProfileReport:
+    path: str
+    text_path: str
+    total_s: float
+    rows: List[Dict] = field(default_factory=list)
+
+
+def requested_by_env() -> bool:
+    return os.environ.get(PROFILE_ENV) == '1'
+
+
+def requested(query_params=None) -> bool:
+    """True if this rerun should be profiled (env var or ?profile=1)."""
+    if requested_by_env():
+        return True
+    return query_params is not None and query_params.get(PROFILE_QUERY_PARAM) == '1'
+
+
+def start_profile() -> Optional[cProfile.Profile]:
+    """Start profiling the current thread; None if another profiler is already active."""
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError as e:
+        print(f"Profiling unavailable: {str(e)}")
+        return None
+    return profiler
+
+
+def finish_profile(profiler: cProfile.Profile, label: str = 'rerun', output_dir: Optional[str] = None,
+                   top_n: int = 25) -> ProfileReport:
+    """Stop profiling, write the .prof and text reports and return the top-N hot functions."""
+    profiler.disable()
+    output_dir = output_dir or os.environ.get(PROFILE_DIR_ENV, DEFAULT_PROFILE_DIR)
+    os.makedirs(output_dir, exist_ok=True)
+    stamp = datetime.datetime.now().strftime('%Y%m%d-%H%M%S-%f')
+    path = os.path.join(output_dir, f"{label}-{stamp}.prof")
+    text_path = os.path.join(output_dir, f"{label}-{stamp}.txt")
+    profiler.dump_stats(path)
+
+    stream = io.StringIO()
+    stats = pstats.Stats(profiler, stream=stream)
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(100)
+    stats.sort_stats(pstats.SortKey.TIME).print_stats(100)
+    with open(text_path, 'w', encoding='utf-8') as f:
+        f.write(stream.getvalue())
+
+    return ProfileReport(path=path, text_path=text_path, total_s=stats.total_tt, rows=top_functions(stats, top_n))
+
+
+def top_functions(stats: pstats.Stats, top_n: int = 25) -> List[Dict]:
+    """Functions with the highest own time (tottime), with their cumulative time."""
+    rows = []
+    for (filename, line, name), (_, ncalls, tottime, cumtime, _) in stats.stats.items():
+        rows.append({
+            'function': name,
+            'location': f"{_short_path(filename)}:{line}",
+            'calls': ncalls,
+            'tottime_ms': tottime * 1000,
+            'cumtime_ms': cumtime * 1000,
+        })
+    rows.sort(key=lambda row: row['tottime_ms'], reverse=True)
+    return rows[:top_n]
+
+
+def _short_path(filename: str) -> str:
+    """Keep the interesting end of a path (site-packages/... or the last two parts)."""
+    marker = 'site-packages' + os.sep
+    if marker in filename:
+        return filename.split(marker, 1)[1]
+    parts = filename.replace('\\', '/').split('/')
+    return '/'.join(parts[-2:])
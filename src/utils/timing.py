@@ -0,0 +1,138 @@
+"""Lightweight timing spans, aggregated per Streamlit rerun.
+
+Instrumentation is opt-in (SC_ESPORT_TIMING=1 or the ?timing=1 query param).
+Spans are only recorded on a thread where start_rerun() was called; everywhere
+else span() returns a shared no-op context manager.
+"""
+import contextlib
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+TIMING_ENV = 'SC_ESPORT_TIMING'
+TIMING_QUERY_PARAM = 'timing'
+
+_local = threading.local()
+_NULL_SPAN = contextlib.nullcontext()
+_logger = logging.getLogger('sc_esport.timing')
+
+
+class RerunTimings:
+    """Durations of the spans recorded during one rerun, aggregated by name."""
+
+    def __init__(self, page: str = ''):
+        self.page = page
+        self.started = time.perf_counter()
+        self.total_ms = 0.0
+        self.spans: Dict[str, Dict[str, float]] = {}
+
+    def add(self, name: str, elapsed_ms: float):
+        entry = self.spans.get(name)
+        if entry is None:
+            self.spans[name] = {'count': 1, 'total_ms': elapsed_ms, 'max_ms': elapsed_ms}
+        else:
+            entry['count'] += 1
+            entry['total_ms'] += elapsed_ms
+            entry['max_ms'] = max(entry['max_ms'], elapsed_ms)
+
+    def rows(self) -> List[Dict]:
+        """Spans sorted by total time, for display."""
+        return sorted(
+            ({'span': name, **entry} for name, entry in self.spans.items()),
+            key=lambda row: row['total_ms'],
+            reverse=True
+        )
+
+    def to_dict(self) -> Dict:
+        return {
+            'event': 'rerun_timings',
+            'page': self.page,
+            'total_ms': round(self.total_ms, 3),
+            'spans': {
+                name: {'count': entry['count'], 'total_ms': round(entry['total_ms'], 3),
+                       'max_ms': round(entry['max_ms'], 3)}
+                for name, entry in self.spans.items()
+            },
+        }
+
+
+class _Span:
+    __slots__ = ('recorder', 'name', 'start')
+
+    def __init__(self, recorder: RerunTimings, name: str):
+        self.recorder = recorder
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.recorder.add(self.name, (time.perf_counter() - self.start) * 1000)
+        return False
+
+
+def requested(query_params=None) -> bool:
+    """True if timing is turned on by the environment or the page URL."""
+    if os.environ.get(TIMING_ENV) == '1':
+        return True
+    return query_params is not None and query_params.get(TIMING_QUERY_PARAM) == '1'
+
+
+def start_rerun(page: str = '') -> RerunTimings:
+    """Start collecting spans for the current rerun on this thread."""
+    recorder = RerunTimings(page)
+    _local.recorder = recorder
+    return recorder
+
+
+def finish_rerun() -> Optional[RerunTimings]:
+    """Stop collecting, log the aggregate as one JSON line and return it."""
+    recorder = getattr(_local, 'recorder', None)
+    if recorder is None:
+        return None
+    _local.recorder = None
+    recorder.total_ms = (time.perf_counter() - recorder.started) * 1000
+    _log(recorder.to_dict())
+    return recorder
+
+
+def discard_rerun():
+    """Drop any recorder left on this thread (e.g. by a timed rerun that raised)."""
+    _local.recorder = None
+
+
+def span(name: str):
+    """Context manager timing a block; a no-op unless a rerun is being timed."""
+    recorder = getattr(_local, 'recorder', None)
+    if recorder is None:
+        return _NULL_SPAN
+    return _Span(recorder, name)
+
+
+def timed(name: str):
+    """Decorator version of span()."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            recorder = getattr(_local, 'recorder', None)
+            if recorder is None:
+                return func(*args, **kwargs)
+            with _Span(recorder, name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _log(record: Dict):
+    if not _logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        _logger.addHandler(handler)
+        _logger.setLevel(logging.INFO)
+        _logger.propagate = False
+    _logger.info(json.dumps(record))
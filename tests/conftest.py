@@ -0,0 +1,7 @@
+"""Configuration pytest : les modules de l'application sont importés depuis src/ (comme par run.py)."""
+import sys
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
@@ -0,0 +1,95 @@
+"""Après refresh(), les requêtes servies par les rollups (ou la base SQLite) donnent les mêmes
+résultats qu'un analyzer construit depuis zéro sur les mêmes fichiers."""
+import datetime
+import json
+import os
+import shutil
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from data_processing.stats_analyzer import StatsAnalyzer
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+MATCH_FILES = sorted(DATA_DIR.glob("*.json"))
+# Du mercredi de la semaine 21 au mercredi de la semaine 22 : les deux semaines sont coupées
+WEEK_SPLIT = {'date_from': datetime.date(2025, 5, 21), 'date_to': datetime.date(2025, 5, 28)}
+
+
+def make_analyzer(data_dir: Path, cache_dir: Path, storage: str) -> StatsAnalyzer:
+    return StatsAnalyzer(str(data_dir), cache_dir=str(cache_dir), use_snapshot=False, result_cache_size=0,
+                         storage=storage)
+
+
+def query_results(analyzer: StatsAnalyzer, date_range: dict) -> dict:
+    results = {}
+    for game_type in ("Global", "Scrim", "Tournoi"):
+        results[('global', game_type)] = analyzer.get_global_stats(game_type, **date_range)
+        for by in ("champion", "player"):
+            results[('patches', game_type, by)] = analyzer.get_patch_stats(by, game_type=game_type, **date_range)
+        for player in analyzer.players:
+            stats = analyzer.get_player_stats(player, game_type, **date_range)
+            results[('player', game_type, player)] = {key: value for key, value in stats.items()
+                                                      if key != 'match_history'}
+            results[('history', game_type, player)] = pd.DataFrame(stats['match_history'])
+            results[('champions', game_type, player)] = analyzer.get_player_champions(player, game_type, **date_range)
+            results[('weeks', game_type, player)] = analyzer.get_player_weekly_stats(player, game_type, **date_range)
+    return results
+
+
+def assert_same(result, expected, path=()):
+    if isinstance(expected, pd.DataFrame):
+        pd.testing.assert_frame_equal(result, expected, check_dtype=False, obj=str(path))
+    elif isinstance(expected, dict):
+        assert list(result) == list(expected), path
+        for key in expected:
+            assert_same(result[key], expected[key], path + (key,))
+    elif isinstance(expected, float):
+        assert result == pytest.approx(expected, nan_ok=True), path
+    else:
+        assert result == expected, path
+
+
+def add_files(data_dir: Path):
+    for path in MATCH_FILES[len(MATCH_FILES) // 2:]:
+        shutil.copy(path, data_dir)
+
+
+def modify_file(data_dir: Path):
+    # Une partie réingérée passe en fin de table : le dernier fichier garde ainsi le même rang
+    # (historique, égalités entre champions) que dans une construction complète
+    path = data_dir / MATCH_FILES[-1].name
+    game = json.loads(path.read_text(encoding='utf-8'))
+    for participant in game['participants']:
+        participant['CHAMPIONS_KILLED'] = str(int(participant['CHAMPIONS_KILLED']) + 3)
+    path.write_text(json.dumps(game), encoding='utf-8')
+    # mtime distinct même sur un système de fichiers à faible résolution
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def remove_file(data_dir: Path):
+    (data_dir / MATCH_FILES[5].name).unlink()
+
+
+@pytest.mark.parametrize("storage", ["memory", "sqlite"])
+@pytest.mark.parametrize("change", [add_files, modify_file, remove_file], ids=["add", "modify", "remove"])
+@pytest.mark.parametrize("date_range", [{}, WEEK_SPLIT], ids=["all_dates", "week_split"])
+def test_refresh_matches_fresh_build(tmp_path, storage, change, date_range):
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    initial = MATCH_FILES if change is not add_files else MATCH_FILES[:len(MATCH_FILES) // 2]
+    for path in initial:
+        shutil.copy(path, data_dir)
+    analyzer = make_analyzer(data_dir, tmp_path / "cache", storage)
+    # Rollups et tables d'agrégats construits avant le refresh, qui doit les mettre à jour
+    query_results(analyzer, date_range)
+
+    change(data_dir)
+    changes = analyzer.refresh()
+    assert any(changes.values())
+
+    fresh = make_analyzer(data_dir, tmp_path / "fresh_cache", storage)
+    assert analyzer.game_count() == fresh.game_count()
+    assert_same(query_results(analyzer, date_range), query_results(fresh, date_range))
@@ -0,0 +1,103 @@
+"""TrendEngine : extend() donne les mêmes séries qu'une reconstruction, et les fenêtres celles de pandas."""
+import numpy as np
+import pandas as pd
+import pandas.testing as pdt
+import pytest
+
+from data_processing.trends import DEFAULT_SPAN, DEFAULT_WINDOWS, METRICS, TrendEngine
+
+PLAYERS = ["Joueur A", "Joueur B"]
+
+
+def make_rows(games: int = 14, seed: int = 7) -> pd.DataFrame:
+    """Lignes au format de player_game_rows : deux joueurs, une partie par jour et par joueur."""
+    rng = np.random.default_rng(seed)
+    records = []
+    for number in range(games):
+        day = 1 + number // 3
+        for player in PLAYERS:
+            records.append({
+                'player': player,
+                'game_key': f"{day:02d}062025_{number}",
+                'date': f"{day:02d}062025",
+                'numero_game': str(number % 3 + 1),
+                'type_partie': "Scrim" if number % 4 else "Tournoi",
+                'kills': int(rng.integers(0, 12)),
+                'deaths': int(rng.integers(0, 4)),
+                'assists': int(rng.integers(0, 15)),
+                'cs': int(rng.integers(50, 350)),
+                'vision': int(rng.integers(5, 80)),
+                'duration_min': float(rng.uniform(20, 45)),
+                'kp': round(float(rng.uniform(0, 100)), 1),
+            })
+    return pd.DataFrame(records)
+
+
+def assert_same_series(engine: TrendEngine, reference: TrendEngine):
+    for player in PLAYERS:
+        for game_type in ("Global", "Scrim", "Tournoi"):
+            pdt.assert_frame_equal(engine.series(player, game_type), reference.series(player, game_type))
+
+
+def test_extend_with_latest_game_matches_rebuild():
+    rows = make_rows()
+    engine = TrendEngine(rows.iloc[:-2])
+    engine.extend(rows.iloc[-2:])
+    assert_same_series(engine, TrendEngine(rows))
+
+
+def test_extend_with_older_game_recomputes_series():
+    rows = make_rows()
+    older = rows['game_key'] == rows['game_key'].iloc[6]
+    engine = TrendEngine(rows[~older])
+    engine.extend(rows[older])
+    assert_same_series(engine, TrendEngine(rows))
+
+
+def test_extend_on_copy_leaves_original_unchanged():
+    rows = make_rows()
+    engine = TrendEngine(rows.iloc[:-2])
+    before = engine.series(PLAYERS[0])
+    clone = engine.copy()
+    clone.extend(rows.iloc[-2:])
+    pdt.assert_frame_equal(engine.series(PLAYERS[0]), before)
+    assert len(clone.series(PLAYERS[0])) == len(before) + 1
+
+
+@pytest.mark.parametrize("game_type", ["Global", "Scrim"])
+def test_windows_match_pandas_reference(game_type):
+    rows = make_rows()
+    series = TrendEngine(rows).series(PLAYERS[0], game_type)
+    history = rows[rows['player'] == PLAYERS[0]]
+    if game_type != "Global":
+        history = history[history['type_partie'] == game_type]
+    history = history.reset_index(drop=True)
+    assert series['game_key'].tolist() == history['game_key'].tolist()
+
+    def check(column, expected):
+        np.testing.assert_allclose(series[column].to_numpy(), expected.to_numpy(), rtol=1e-9)
+
+    for size in DEFAULT_WINDOWS:
+        window = history.rolling(size, min_periods=1)
+        sums = window[['kills', 'deaths', 'assists', 'cs', 'vision', 'duration_min']].sum()
+        check(f"kda_{size}", (sums['kills'] + sums['assists']) / sums['deaths'].clip(lower=1))
+        check(f"cs_per_min_{size}", sums['cs'] / sums['duration_min'])
+        check(f"kp_{size}", window['kp'].mean())
+        check(f"vision_per_min_{size}", sums['vision'] / sums['duration_min'])
+
+    means = history[['kills', 'deaths', 'assists', 'cs', 'vision', 'duration_min', 'kp']].astype('float64') \
+        .ewm(span=DEFAULT_SPAN, adjust=False).mean()
+    check("kda_ewm", (means['kills'] + means['assists']) / means['deaths'].clip(lower=1))
+    check("cs_per_min_ewm", means['cs'] / means['duration_min'])
+    check("kp_ewm", means['kp'])
+    check("vision_per_min_ewm", means['vision'] / means['duration_min'])
+
+
+def test_window_kda_divides_by_window_deaths():
+    rows = make_rows(games=5)
+    rows['kills'], rows['assists'] = 4, 6
+    rows.loc[rows['player'] == PLAYERS[0], 'deaths'] = [0, 1, 0, 1, 0]
+    series = TrendEngine(rows).series(PLAYERS[0])
+    # 5 parties, 2 morts : (20 + 30) / 2, pas / 5
+    assert series['kda_5'].iloc[-1] == pytest.approx(25.0)
+    assert list(series.columns[4:8]) == METRICS